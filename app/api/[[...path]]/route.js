@@ -1,12 +1,14 @@
-import { NextResponse } from 'next/server';
 import { assertNoMock } from '@/lib/mode';
+import { ServerTiming } from '@/lib/timing';
 
 export async function GET(req) {
-  return NextResponse.json({ 
+  const timing = new ServerTiming();
+  return timing.json({ 
     message: "API endpoints active - use dedicated routes", 
     version: "2.0",
     endpoints: [
       "/api/health/app",
+      "/api/health/metrics",
       "/api/whoami", 
       "/api/menu/scan",
       "/api/food/analyze",
@@ -18,6 +20,7 @@ export async function GET(req) {
 }
 
 export async function POST(req) {
+  const timing = new ServerTiming();
   try {
     const url = new URL(req.url);
     const pathname = url.pathname;
@@ -26,14 +29,14 @@ export async function POST(req) {
     assertNoMock("Legacy API route - use dedicated endpoints");
     
     if (pathname.includes('/menu/scan') || pathname.includes('/food/analyze')) {
-      return NextResponse.json({ 
+      return timing.json({ 
         error: "This endpoint has been moved. Use /api/menu/scan or /api/food/analyze with FormData image upload.",
         redirect: pathname.includes('/menu/scan') ? "/api/menu/scan" : "/api/food/analyze"
       }, { status: 400 });
     }
 
     if (pathname.includes('/coach/ask')) {
-      return NextResponse.json({ 
+      return timing.json({ 
         error: "This endpoint has been moved. Use /api/coach/ask with authenticated request.",
         redirect: "/api/coach/ask"
       }, { status: 400 });
@@ -41,24 +44,24 @@ export async function POST(req) {
 
     // Profile endpoints moved to separate handlers
     if (pathname.includes('/me/profile') || pathname.includes('/me/targets')) {
-      return NextResponse.json({ 
+      return timing.json({ 
         error: "Profile endpoints require authentication and have been moved to dedicated handlers"
       }, { status: 401 });
     }
 
-    return NextResponse.json({ 
+    return timing.json({ 
       error: "Endpoint not found. Use dedicated API routes listed in GET /api/"
     }, { status: 404 });
 
   } catch (error) {
     if (error.message.includes('Mock path blocked')) {
-      return NextResponse.json({ 
+      return timing.json({ 
         error: "Mock/demo data blocked in production mode - use dedicated API routes"
       }, { status: 400 });
     }
     
     console.error('Legacy API Error:', error);
-    return NextResponse.json({ 
+    return timing.json({ 
       error: "Use dedicated API endpoints"
     }, { status: 500 });
   }
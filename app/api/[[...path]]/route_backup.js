@@ -5,6 +5,7 @@ import { createWorker } from 'tesseract.js';
 import { requireUser } from '@/lib/auth';
 import { MongoClient } from 'mongodb';
 import { assertNoMock } from '@/lib/mode';
+import { DishMatcher, matchDishes, dishCatalogItem } from '@/lib/dish-matcher';
 
 // Force Node.js runtime for MongoDB operations
 export const runtime = 'nodejs';
@@ -230,25 +231,53 @@ function getRecommendations(items, profile) {
   };
 }
 
-// Extract food items from OCR text
-function extractFoodItems(ocrText) {
-  const lines = ocrText.toLowerCase().split('\n')
-    .map(line => line.trim())
-    .filter(line => line.length > 2);
-  
-  const foundItems = [];
+// Extract food items from OCR text: dishes and synonyms from the food
+// catalog (food_items + dish_synonyms) first, the sample table above while
+// the catalog is empty or unreachable
+// Compiled once; a single pass over the OCR text finds every dish
+const FOOD_MATCHER = DishMatcher.compile(
+  Object.keys(INDIAN_FOOD_DB).map(foodName => ({ food_id: foodName, term: foodName }))
+);
+
+function matchFields(match) {
+  return {
+    food_id: match.food_id,
+    matched_text: match.text,
+    position: { start: match.start, end: match.end, line: match.line },
+    price: match.price
+  };
+}
+
+async function matchCatalogDishes(ocrText) {
+  try {
+    return (await matchDishes(ocrText)).flatMap(match => {
+      const item = dishCatalogItem(match.food_id);
+      if (!item) return [];
+      return [{
+        name: item.canonical_name,
+        ...matchFields(match),
+        calories: Number(item.kcal_per_unit),
+        protein_g: Number(item.protein_g || 0),
+        fiber_g: Number(item.fiber_g || 0),
+        sodium_mg: Number(item.sodium_mg || 0),
+        category: item.category_enum
+      }];
+    });
+  } catch (error) {
+    console.warn('Food catalog unavailable for menu matching:', error.message);
+    return [];
+  }
+}
+
+async function extractFoodItems(ocrText) {
+  let foundItems = await matchCatalogDishes(ocrText);
   
-  for (const line of lines) {
-    for (const [foodName, nutritionData] of Object.entries(INDIAN_FOOD_DB)) {
-      if (line.includes(foodName.toLowerCase()) || 
-          foodName.toLowerCase().includes(line)) {
-        foundItems.push({
-          name: foodName.charAt(0).toUpperCase() + foodName.slice(1),
-          ...nutritionData
-        });
-        break;
-      }
-    }
+  if (foundItems.length === 0) {
+    foundItems = FOOD_MATCHER.scan(ocrText).map(match => ({
+      name: match.food_id.charAt(0).toUpperCase() + match.food_id.slice(1),
+      ...matchFields(match),
+      ...INDIAN_FOOD_DB[match.food_id]
+    }));
   }
   
   if (foundItems.length === 0) {
@@ -308,7 +337,7 @@ export async function POST(request) {
       const imageBuffer = Buffer.from(await imageFile.arrayBuffer());
       const ocrResult = await processMenuImage(imageBuffer, useVisionOCR);
       
-      const items = extractFoodItems(ocrResult.text);
+      const items = await extractFoodItems(ocrResult.text);
       const defaultProfile = { veg_flag: true, weight_kg: 65 };
       const recommendations = getRecommendations(items, defaultProfile);
       
@@ -1,6 +1,10 @@
-import { NextResponse, NextRequest } from 'next/server';
-import { GoogleGenerativeAI } from '@google/generative-ai';
+import { NextRequest } from 'next/server';
+import { GoogleGenerativeAI, GenerativeModel } from '@google/generative-ai';
 import { requireUser } from '@/lib/auth';
+import { geminiRequestOptions } from '@/lib/upstreams';
+import { runGemini, retryAfterSeconds } from '@/lib/gemini-scheduler';
+import { ServerTiming } from '@/lib/timing';
+import { SSE_HEADERS, sseEvent, wantsEventStream } from '@/lib/sse';
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
@@ -8,27 +12,29 @@ export const dynamic = "force-dynamic";
 const genAI = new GoogleGenerativeAI(process.env.GEMINI_API_KEY || '');
 
 export async function POST(req: NextRequest) {
+  const timing = new ServerTiming();
   try {
     // Require authentication for coach interactions
-    const user = await requireUser(req);
+    const user = await timing.time('auth', () => requireUser(req));
     
-    const { message, user_id, profile, recent_logs } = await req.json();
+    const body = await timing.time('parse', () => req.json());
+    const { message, user_id, profile, recent_logs } = body;
     
     if (!message || !message.trim()) {
-      return NextResponse.json({ 
+      return timing.json({ 
         error: "No message provided" 
       }, { status: 400 });
     }
     
     if (!process.env.GEMINI_API_KEY) {
-      return NextResponse.json({ 
+      return timing.json({ 
         error: "Gemini API key not configured" 
       }, { status: 500 });
     }
     
     console.log('Processing coach question with Gemini 2.5 Flash...');
     
-    const model = genAI.getGenerativeModel({ model: "gemini-1.5-flash" });
+    const model = genAI.getGenerativeModel({ model: "gemini-1.5-flash" }, geminiRequestOptions());
     
     // Build context from profile and recent logs
     let contextInfo = "";
@@ -56,11 +62,18 @@ Instructions:
 
 Respond as Coach C would - supportive and knowledgeable about nutrition.`;
 
-    const result = await model.generateContent(prompt);
-    const response = await result.response;
-    const reply = response.text();
+    if (wantsEventStream(req, body)) {
+      return await streamReply(model, prompt, timing, req.signal);
+    }
+
+    // Non-streaming fallback for clients that expect a single JSON body
+    const reply = await timing.time('upstream-ai', () => runGemini(model.model, async () => {
+      const result = await model.generateContent(prompt);
+      const response = await result.response;
+      return response.text();
+    }));
     
-    return NextResponse.json({
+    return timing.json({
       reply: reply,
       coach: "Coach C",
       timestamp: new Date().toISOString(),
@@ -71,14 +84,78 @@ Respond as Coach C would - supportive and knowledgeable about nutrition.`;
     console.error('Coach chat error:', error);
     
     if (error.message === 'unauthorized') {
-      return NextResponse.json({ 
+      return timing.json({ 
         error: "Authentication required" 
       }, { status: 401 });
     }
     
-    return NextResponse.json({ 
+    const retryAfter = retryAfterSeconds(error);
+    if (retryAfter !== null) {
+      return timing.json({ 
+        error: "AI service is busy, please retry shortly" 
+      }, { status: 503, headers: { "Retry-After": String(retryAfter) } });
+    }
+    
+    return timing.json({ 
       error: "Coach chat failed",
       details: (error as Error).message 
     }, { status: 500 });
   }
-}
\ No newline at end of file
+}
+
+/**
+ * Relay the generation as SSE: `token` events with each text chunk, then a
+ * final `done` event carrying the full reply, timestamp and citations (or an
+ * `error` event). Chunks are pulled from Gemini only as fast as the client
+ * reads them, and a client disconnect (a cancelled stream or an aborted
+ * request) aborts the upstream request so Gemini stops generating.
+ */
+async function streamReply(model: GenerativeModel, prompt: string, timing: ServerTiming, clientSignal: AbortSignal) {
+  const upstream = new AbortController();
+  const abort = () => upstream.abort();
+  if (clientSignal.aborted) abort();
+  else clientSignal.addEventListener('abort', abort, { once: true });
+
+  const result = await timing.time('upstream-ai', () => runGemini(model.model, () =>
+    model.generateContentStream(prompt, { signal: upstream.signal })
+  ));
+  timing.describe('upstream-ai', 'time to stream open');
+  // Settles with the aggregated reply, or rejects once aborted; only the
+  // stream is read here
+  result.response.catch(() => {});
+  const chunks = result.stream[Symbol.asyncIterator]();
+  let reply = '';
+
+  const stream = new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      try {
+        const { value, done } = await chunks.next();
+        if (done) {
+          controller.enqueue(sseEvent('done', {
+            reply,
+            coach: "Coach C",
+            timestamp: new Date().toISOString(),
+            citations: [] // Could add nutrition citations in future
+          }));
+          controller.close();
+          return;
+        }
+        const text = value.text();
+        if (text) {
+          reply += text;
+          controller.enqueue(sseEvent('token', { text }));
+        }
+      } catch (error) {
+        console.error('Coach stream error:', error);
+        controller.enqueue(sseEvent('error', { error: "Coach chat failed", details: (error as Error).message }));
+        controller.close();
+      }
+    },
+    async cancel() {
+      abort();
+      await chunks.return?.();
+    }
+  });
+
+  return timing.attach(new Response(stream, { headers: SSE_HEADERS }));
+}
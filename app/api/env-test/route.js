@@ -1,7 +1,8 @@
-import { NextResponse } from 'next/server';
+import { ServerTiming } from '@/lib/timing';
 
 export async function GET() {
-  return NextResponse.json({
+  const timing = new ServerTiming();
+  return timing.json({
     APP_MODE: process.env.APP_MODE,
     NEXT_PUBLIC_APP_MODE: process.env.NEXT_PUBLIC_APP_MODE,
     ALLOW_MOCKS: process.env.ALLOW_MOCKS,
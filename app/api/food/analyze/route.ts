@@ -1,45 +1,24 @@
-import { NextResponse } from 'next/server';
 import { GoogleGenerativeAI } from '@google/generative-ai';
 import { assertNoMock } from '@/lib/mode';
+import { geminiRequestOptions } from '@/lib/upstreams';
+import { runGemini, retryAfterSeconds } from '@/lib/gemini-scheduler';
+import { ServerTiming } from '@/lib/timing';
+import { normalizeImage } from '@/lib/image';
+import { getUserFromRequest } from '@/lib/auth';
+import { dHash } from '@/lib/phash';
+import { findNearDuplicate, rememberAnalysis } from '@/lib/photo-dedupe';
+import { sha256 } from '@/lib/scan-cache';
+import { singleFlight } from '@/lib/single-flight';
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
 
 const genAI = new GoogleGenerativeAI(process.env.GEMINI_API_KEY || '');
 
-export async function POST(req: Request) {
-  try {
-    const contentType = req.headers.get("content-type") || "";
-    if (!contentType.includes("multipart/form-data")) {
-      assertNoMock("meal photo analysis: content type must be multipart/form-data");
-      return NextResponse.json({ 
-        error: "Content-Type must be multipart/form-data" 
-      }, { status: 400 });
-    }
+// Bump whenever FOOD_PROMPT or the response shape changes
+const FOOD_PROMPT_VERSION = 'food-v1';
 
-    const form = await req.formData();
-    const file = form.get("image") as File | null;
-    
-    if (!file) {
-      assertNoMock("meal photo analysis: no image uploaded");
-      return NextResponse.json({ error: "No meal image provided" }, { status: 400 });
-    }
-    
-    if (!process.env.GEMINI_API_KEY) {
-      return NextResponse.json({ 
-        error: "Gemini API key not configured" 
-      }, { status: 500 });
-    }
-    
-    // Convert file to base64
-    const bytes = new Uint8Array(await file.arrayBuffer());
-    const base64 = Buffer.from(bytes).toString("base64");
-    
-    console.log('Processing meal photo with Gemini Vision AI...');
-    
-    const model = genAI.getGenerativeModel({ model: "gemini-1.5-flash" });
-    
-    const prompt = `You are an expert nutrition coach. Analyze this meal photo and identify the food items.
+const FOOD_PROMPT = `You are an expert nutrition coach. Analyze this meal photo and identify the food items.
 
 Look carefully at the image and identify specific dishes. If you can see Indian foods like:
 - Pani puri/Golgappa, Bhel puri, Chaat items
@@ -76,23 +55,100 @@ Return JSON format:
 
 If you're unsure about specific items, ask ONE clarifying question. Only identify what you can actually see in the image.`;
 
-    const result = await model.generateContent([
-      prompt,
-      {
-        inlineData: {
-          data: base64,
-          mimeType: file.type || "image/jpeg"
-        }
+export async function POST(req: Request) {
+  const timing = new ServerTiming();
+  const started = Date.now();
+  try {
+    const contentType = req.headers.get("content-type") || "";
+    if (!contentType.includes("multipart/form-data")) {
+      assertNoMock("meal photo analysis: content type must be multipart/form-data");
+      return timing.json({ 
+        error: "Content-Type must be multipart/form-data" 
+      }, { status: 400 });
+    }
+
+    const form = await timing.time('parse', () => req.formData());
+    const file = form.get("image") as File | null;
+    
+    if (!file) {
+      assertNoMock("meal photo analysis: no image uploaded");
+      return timing.json({ error: "No meal image provided" }, { status: 400 });
+    }
+    
+    const bytes = await timing.time('parse', async () => new Uint8Array(await file.arrayBuffer()));
+    
+    // Repeat shots of the same plate: reuse the user's recent analysis when the
+    // perceptual hash is within a few bits of one we already paid Gemini for
+    const user = await timing.time('auth', () => getUserFromRequest(req).catch(() => null));
+    const phash = user
+      ? await timing.time('parse', () => dHash(bytes).catch((error) => {
+          console.warn('Photo hash failed:', error.message);
+          return null;
+        }))
+      : null;
+    if (user && phash) {
+      const duplicate = await timing.time('db', () => findNearDuplicate(user.id, phash));
+      if (duplicate) {
+        return timing.json({
+          guess: duplicate.guess,
+          nutrition: duplicate.nutrition,
+          processing_time: `${Date.now() - started}ms`,
+          duplicate_of: { analysis_id: duplicate.id, distance: duplicate.distance },
+          cache: { status: "hit", match: "perceptual", distance: duplicate.distance }
+        }, { headers: { "X-Cache": "HIT" } });
       }
-    ]);
+    }
+    
+    if (!process.env.GEMINI_API_KEY) {
+      return timing.json({ 
+        error: "Gemini API key not configured" 
+      }, { status: 500 });
+    }
     
-    const response = await result.response;
-    const text = response.text();
+    // Identical photos already in flight (client retries, shared plates) share
+    // one Gemini call. The leader records it for dedupe; a follower records it
+    // too unless it is the same user, whose copy is already being saved.
+    const flightStarted = performance.now();
+    const { value: { text, leader }, shared } = await singleFlight(`food:${FOOD_PROMPT_VERSION}:${sha256(bytes)}`, async () => {
+      // Orient, strip EXIF, downscale and re-encode before the upload to Gemini
+      const image = await timing.time('image', () => normalizeImage(bytes, file.type || "image/jpeg"));
+      timing.describe('image', `${image.bytesIn}->${image.bytesOut} bytes`);
+      const base64 = await timing.time('parse', () => image.data.toString("base64"));
+      
+      console.log('Processing meal photo with Gemini Vision AI...');
+      
+      const model = genAI.getGenerativeModel({ model: "gemini-1.5-flash" }, geminiRequestOptions());
+      
+      const text = await timing.time('upstream-ai', () => runGemini(model.model, async () => {
+        const result = await model.generateContent([
+          FOOD_PROMPT,
+          {
+            inlineData: {
+              data: base64,
+              mimeType: image.mimeType
+            }
+          }
+        ]);
+        const response = await result.response;
+        return response.text();
+      }));
+      return { text, leader: user?.id ?? null };
+    });
+    if (shared) {
+      timing.add('upstream-ai', performance.now() - flightStarted);
+      timing.describe('upstream-ai', 'coalesced');
+    }
     
     // Parse Gemini response as JSON
     try {
-      const parsedResponse = JSON.parse(text);
-      return NextResponse.json(parsedResponse);
+      const parsedResponse = await timing.time('parse', () => JSON.parse(text));
+      if (user && phash && !(shared && leader === user.id)) {
+        await timing.time('db', () => rememberAnalysis(user.id, phash, parsedResponse));
+      }
+      return timing.json({
+        ...parsedResponse,
+        cache: { status: shared ? "coalesced" : "miss" }
+      }, { headers: { "X-Cache": shared ? "COALESCED" : "MISS" } });
     } catch (parseError) {
       console.error('Failed to parse Gemini Vision response as JSON:', parseError);
       console.log('Raw response:', text);
@@ -100,7 +156,7 @@ If you're unsure about specific items, ask ONE clarifying question. Only identif
       assertNoMock("meal photo analysis: failed to parse AI response");
       
       // Return structured fallback
-      return NextResponse.json({
+      return timing.json({
         guess: [
           {
             food_id: "unknown-meal",
@@ -128,7 +184,14 @@ If you're unsure about specific items, ask ONE clarifying question. Only identif
       throw error; // Re-throw production guard errors
     }
     
-    return NextResponse.json({ 
+    const retryAfter = retryAfterSeconds(error);
+    if (retryAfter !== null) {
+      return timing.json({ 
+        error: "AI service is busy, please retry shortly" 
+      }, { status: 503, headers: { "Retry-After": String(retryAfter) } });
+    }
+    
+    return timing.json({ 
       error: "Meal photo analysis failed",
       details: (error as Error).message 
     }, { status: 500 });
@@ -0,0 +1,30 @@
+// app/api/food/search/route.ts
+// Food autocomplete: GET ?q=panir&limit=10. Served from the in-process
+// trigram index, so after the first request no lookup touches the database.
+import { ServerTiming } from '@/lib/timing';
+import { repositories } from '@/lib/repos';
+
+export const runtime = 'nodejs';
+export const dynamic = 'force-dynamic';
+
+const MAX_LIMIT = 50;
+
+export async function GET(req: Request) {
+  const timing = new ServerTiming();
+  try {
+    const { searchParams } = new URL(req.url);
+    const query = (searchParams.get('q') || '').slice(0, 100);
+    const limit = Math.min(Math.max(1, Number(searchParams.get('limit')) || 10), MAX_LIMIT);
+    if (!query.trim()) {
+      return timing.json({ items: [] }, { status: 200 });
+    }
+
+    const items = await timing.time('db', () => repositories.foodItems.search(query, limit));
+    timing.describe('db', `${items.length} matches`);
+
+    return timing.json({ items }, { status: 200 });
+  } catch (error: any) {
+    console.error('Food search error:', error);
+    return timing.json({ error: 'Internal server error' }, { status: 500 });
+  }
+}
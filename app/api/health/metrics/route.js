@@ -0,0 +1,27 @@
+import { ServerTiming } from '@/lib/timing';
+import { menuScanCacheStats } from '@/lib/scan-cache';
+import { photoDedupeStats } from '@/lib/photo-dedupe';
+import { imagePipelineStats } from '@/lib/image';
+import { ttsCacheStats } from '@/lib/tts-cache';
+import { geminiSchedulerStats } from '@/lib/gemini-scheduler';
+import { singleFlightStats } from '@/lib/single-flight';
+import { dishMatcherStats } from '@/lib/dish-matcher';
+
+// Force Node.js runtime
+export const runtime = 'nodejs';
+export const dynamic = 'force-dynamic';
+
+// In-process counters of the caches, pipelines and schedulers, for
+// diagnostics. Kept apart from /api/health/app so the liveness probe never
+// depends on these modules loading.
+export async function GET() {
+  const timing = new ServerTiming();
+  return timing.json({
+    timestamp: new Date().toISOString(),
+    caches: { menu_scan: menuScanCacheStats(), photo_dedupe: photoDedupeStats(), tts: ttsCacheStats() },
+    image_pipeline: imagePipelineStats(),
+    gemini: geminiSchedulerStats(),
+    single_flight: singleFlightStats(),
+    dish_matcher: dishMatcherStats()
+  }, { headers: { 'Cache-Control': 'no-store' } });
+}
@@ -0,0 +1,111 @@
+// app/api/logs/batch/route.ts
+// Offline clients flush a queue of food logs in one round trip. Entries are
+// validated individually, written with one unordered insertMany, and the
+// response reports a status per entry (in request order):
+//   created   - written; `id` is the new log
+//   duplicate - (user, idempotency_key) was already logged; `id` is the original
+//   invalid   - rejected before writing; `error` says why
+//   error     - the write failed; safe to retry
+import { getUserFromRequest } from '@/lib/auth';
+import { ServerTiming } from '@/lib/timing';
+import { repositories } from '@/lib/repos';
+import type { FoodLog } from '@/lib/repos/types';
+
+export const runtime = 'nodejs';
+export const dynamic = 'force-dynamic';
+
+const MAX_ENTRIES = Number(process.env.LOGS_BATCH_MAX || 200);
+const SOURCES = ['menu', 'photo', 'manual'];
+const NUMERIC_FIELDS = ['portion_qty_numeric', 'protein_g', 'carb_g', 'fat_g', 'fiber_g', 'sodium_mg'] as const;
+
+type ItemResult = { index: number; status: string; id?: string; error?: string };
+
+export async function POST(req: Request) {
+  const timing = new ServerTiming();
+  try {
+    const user = await timing.time('auth', () => getUserFromRequest(req));
+    if (!user) {
+      return timing.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    let body: any;
+    try {
+      body = await timing.time('parse', () => req.json());
+    } catch {
+      return timing.json({ error: 'Invalid JSON' }, { status: 400 });
+    }
+
+    const entries = Array.isArray(body) ? body : body?.entries;
+    if (!Array.isArray(entries) || entries.length === 0) {
+      return timing.json({ error: 'entries must be a non-empty array' }, { status: 400 });
+    }
+    if (entries.length > MAX_ENTRIES) {
+      return timing.json({ error: `At most ${MAX_ENTRIES} entries per batch` }, { status: 413 });
+    }
+
+    const results: ItemResult[] = [];
+    const valid: { index: number; log: Omit<FoodLog, 'id' | 'created_at'> }[] = [];
+    entries.forEach((entry, index) => {
+      const parsed = toFoodLog(entry, user.id);
+      if (typeof parsed === 'string') results[index] = { index, status: 'invalid', error: parsed };
+      else valid.push({ index, log: parsed });
+    });
+
+    if (valid.length > 0) {
+      const written = await timing.time('db', () => repositories.foodLogs.createMany(valid.map(v => v.log)));
+      valid.forEach(({ index }, i) => {
+        results[index] = { index, ...written[i] };
+      });
+    }
+
+    const counts = { created: 0, duplicate: 0, invalid: 0, error: 0 };
+    results.forEach(result => { counts[result.status as keyof typeof counts]++; });
+    timing.describe('db', `${valid.length} entries`);
+
+    return timing.json({ results, counts }, { status: 200 });
+  } catch (error: any) {
+    console.error('Logs batch error:', error);
+    return timing.json({ error: 'Internal server error' }, { status: 500 });
+  }
+}
+
+/** Validate one entry; returns the log to write or an error message */
+function toFoodLog(entry: any, userId: string): Omit<FoodLog, 'id' | 'created_at'> | string {
+  if (!entry || typeof entry !== 'object') return 'entry must be an object';
+
+  const kcal = Number(entry.kcal);
+  if (!Number.isFinite(kcal) || kcal < 0) return 'kcal must be a non-negative number';
+
+  const source = entry.source_enum || 'manual';
+  if (!SOURCES.includes(source)) return `source_enum must be one of ${SOURCES.join(', ')}`;
+
+  const key = entry.idempotency_key;
+  if (key !== undefined && (typeof key !== 'string' || key.length === 0 || key.length > 200)) {
+    return 'idempotency_key must be a string of 1-200 characters';
+  }
+
+  const ts = entry.ts ? new Date(entry.ts) : undefined;
+  if (ts && Number.isNaN(ts.getTime())) return 'ts must be an ISO date';
+
+  const log: Omit<FoodLog, 'id' | 'created_at'> = {
+    user_id: userId,
+    source_enum: source,
+    kcal,
+    ...(ts && { ts }),
+    ...(key && { idempotency_key: key }),
+    ...(entry.food_id && { food_id: String(entry.food_id) }),
+    ...(entry.menu_item_id && { menu_item_id: String(entry.menu_item_id) }),
+    ...(entry.portion_units && { portion_units: String(entry.portion_units) }),
+    ...(entry.notes && { notes: String(entry.notes) }),
+    ...(Array.isArray(entry.assumptions_json) && { assumptions_json: entry.assumptions_json.map(String) }),
+  };
+
+  for (const field of NUMERIC_FIELDS) {
+    if (entry[field] === undefined || entry[field] === null) continue;
+    const value = Number(entry[field]);
+    if (!Number.isFinite(value) || value < 0) return `${field} must be a non-negative number`;
+    log[field] = value;
+  }
+
+  return log;
+}
@@ -0,0 +1,43 @@
+// app/api/logs/route.ts
+// The signed-in user's food logs, newest first, one page at a time.
+//   GET ?limit=50&after=<next>&from=<ISO>&to=<ISO>
+// Responds { logs, next }; pass `next` back as `after` until it is null.
+import { getUserFromRequest } from '@/lib/auth';
+import { ServerTiming } from '@/lib/timing';
+import { repositories } from '@/lib/repos';
+
+export const runtime = 'nodejs';
+export const dynamic = 'force-dynamic';
+
+export async function GET(req: Request) {
+  const timing = new ServerTiming();
+  try {
+    const user = await timing.time('auth', () => getUserFromRequest(req));
+    if (!user) {
+      return timing.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const { searchParams } = new URL(req.url);
+    const from = searchParams.get('from') ? new Date(searchParams.get('from')!) : undefined;
+    const to = searchParams.get('to') ? new Date(searchParams.get('to')!) : undefined;
+    if ((from && Number.isNaN(from.getTime())) || (to && Number.isNaN(to.getTime()))) {
+      return timing.json({ error: 'from and to must be ISO dates' }, { status: 400 });
+    }
+
+    const page = await timing.time('db', () => repositories.foodLogs.findByUserId(user.id, {
+      from,
+      to,
+      after: searchParams.get('after') || undefined,
+      limit: Number(searchParams.get('limit')) || undefined,
+    }));
+    timing.describe('db', `${page.logs.length} logs`);
+
+    return timing.json(page, { status: 200 });
+  } catch (error: any) {
+    if (error?.status === 400) {
+      return timing.json({ error: error.message }, { status: 400 });
+    }
+    console.error('Logs GET error:', error);
+    return timing.json({ error: 'Internal server error' }, { status: 500 });
+  }
+}
@@ -0,0 +1,129 @@
+// app/api/me/export/route.ts
+// Data export as NDJSON, one record per line, streamed straight from Mongo
+// cursors so memory stays flat however long the user's history is:
+//   {"type":"export","user_id":...,"exported_at":...,"since":null}
+//   {"type":"profile","data":{...}}
+//   {"type":"target","data":{...}}      one per day, by date
+//   {"type":"food_log","data":{...}}    newest first
+//   {"type":"end","counts":{...},"next_since":"<ISO>"}
+//
+//   GET ?since=<ISO>  incremental: only records written after `since`. Pass
+//                     the previous export's next_since to resume; it lags the
+//                     export start slightly, so a record can appear in two
+//                     consecutive exports and should be de-duplicated by id.
+//   GET ?gzip=1       download as a gzip-compressed .ndjson.gz file
+// A stream that ends without the "end" record was cut short; re-run it with
+// the same `since`.
+//
+// Profile and targets are read from the same database the /api/me/profile
+// and /api/me/targets routes write to; food logs come from the repository.
+import clientPromise from '@/lib/mongodb';
+import { getUserFromRequest } from '@/lib/auth';
+import { ServerTiming } from '@/lib/timing';
+import { repositories } from '@/lib/repos';
+
+export const runtime = 'nodejs';
+export const dynamic = 'force-dynamic';
+
+const CHUNK_BYTES = 64 * 1024;
+// Writes still in flight when the export starts land in the next one
+const RESUME_OVERLAP_MS = 60 * 1000;
+
+export async function GET(req: Request) {
+  const timing = new ServerTiming();
+  try {
+    const user = await timing.time('auth', () => getUserFromRequest(req));
+    if (!user) {
+      return timing.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const { searchParams } = new URL(req.url);
+    const since = searchParams.get('since') ? new Date(searchParams.get('since')!) : undefined;
+    if (since && Number.isNaN(since.getTime())) {
+      return timing.json({ error: 'since must be an ISO timestamp' }, { status: 400 });
+    }
+    const gzip = ['1', 'true'].includes(searchParams.get('gzip') || '');
+
+    let stream = ndjson(exportRecords(user.id, since));
+    if (gzip) stream = stream.pipeThrough(new CompressionStream('gzip'));
+
+    const filename = `fitbear-export-${new Date().toISOString().slice(0, 10)}.ndjson${gzip ? '.gz' : ''}`;
+    return timing.attach(new Response(stream, {
+      headers: {
+        'Content-Type': gzip ? 'application/gzip' : 'application/x-ndjson; charset=utf-8',
+        'Content-Disposition': `attachment; filename="${filename}"`,
+        'Cache-Control': 'no-store',
+      }
+    }));
+  } catch (error: any) {
+    console.error('Export error:', error);
+    return timing.json({ error: 'Internal server error' }, { status: 500 });
+  }
+}
+
+async function* exportRecords(userId: string, since?: Date) {
+  const exportedAt = new Date();
+  const counts = { profile: 0, target: 0, food_log: 0 };
+
+  yield { type: 'export', user_id: userId, exported_at: exportedAt.toISOString(), since: since?.toISOString() ?? null };
+
+  const db = (await clientPromise).db(process.env.MONGODB_DB || 'fitbear');
+
+  const profile = await db.collection('profiles').findOne({ user_id: userId }, { projection: { _id: 0 } });
+  if (profile && (!since || !profile.updated_at || new Date(profile.updated_at) > since)) {
+    counts.profile++;
+    yield { type: 'profile', data: profile };
+  }
+
+  const targetQuery: any = { user_id: userId };
+  if (since) targetQuery.updated_at = { $gt: since };
+  const targets = db.collection('targets').find(targetQuery, { projection: { _id: 0 } }).sort({ date: 1 });
+  try {
+    let target;
+    while ((target = await targets.next())) {
+      counts.target++;
+      yield { type: 'target', data: target };
+    }
+  } finally {
+    await targets.close();
+  }
+
+  for await (const log of repositories.foodLogs.iterateByUserId(userId, { createdSince: since })) {
+    counts.food_log++;
+    yield { type: 'food_log', data: log };
+  }
+
+  yield { type: 'end', counts, next_since: new Date(exportedAt.getTime() - RESUME_OVERLAP_MS).toISOString() };
+}
+
+/**
+ * Serialise records as NDJSON. Pull-based: the next records are read only
+ * when the client has taken the previous chunk, and a client disconnect
+ * returns the generator, closing its cursor.
+ */
+function ndjson(records: AsyncGenerator<unknown>): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  return new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      let chunk = '';
+      try {
+        while (chunk.length < CHUNK_BYTES) {
+          const { done, value } = await records.next();
+          if (done) {
+            if (chunk) controller.enqueue(encoder.encode(chunk));
+            controller.close();
+            return;
+          }
+          chunk += JSON.stringify(value) + '\n';
+        }
+        controller.enqueue(encoder.encode(chunk));
+      } catch (error) {
+        console.error('Export stream error:', error);
+        controller.error(error);
+      }
+    },
+    async cancel() {
+      await records.return(undefined);
+    }
+  }, { highWaterMark: 0 });
+}
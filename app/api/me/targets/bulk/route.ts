@@ -0,0 +1,93 @@
+// app/api/me/targets/bulk/route.ts
+// Multi-day targets for weekly planning, in two shapes:
+//   { from, to, ...fields }               the same targets on every date in range
+//   { targets: [{ date, ...fields }] }    per-date targets (last entry per date wins)
+// All dates are upserted by one unordered bulkWrite and the saved documents
+// are read back with one query, so a month costs two round trips rather
+// than sixty.
+export const runtime = 'nodejs';
+export const dynamic = 'force-dynamic';
+
+import clientPromise from '../../../../../lib/mongodb';
+import { getUserFromRequest } from '../../../../../lib/auth';
+import { ServerTiming } from '../../../../../lib/timing';
+import { targetFields, isTargetDate, dateRange } from '../../../../../lib/targets';
+
+const MAX_DATES = Number(process.env.TARGETS_BULK_MAX || 62);
+
+export async function PUT(req: Request) {
+  const timing = new ServerTiming();
+  try {
+    const user = await timing.time('auth', () => getUserFromRequest(req));
+    if (!user) {
+      return timing.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    let body: any;
+    try {
+      body = await timing.time('parse', () => req.json());
+    } catch {
+      return timing.json({ error: 'Invalid JSON' }, { status: 400 });
+    }
+
+    // date -> the targets for it
+    const byDate = new Map<string, any>();
+    if (Array.isArray(body?.targets)) {
+      const invalid = body.targets.findIndex((entry: any) => !isTargetDate(entry?.date));
+      if (invalid !== -1) {
+        return timing.json({ error: `targets[${invalid}].date must be YYYY-MM-DD` }, { status: 400 });
+      }
+      body.targets.forEach((entry: any) => byDate.set(entry.date, entry));
+    } else if (body?.from || body?.to) {
+      if (!isTargetDate(body.from) || !isTargetDate(body.to) || body.from > body.to) {
+        return timing.json({ error: 'from and to must be YYYY-MM-DD dates with from <= to' }, { status: 400 });
+      }
+      if ((Date.parse(body.to) - Date.parse(body.from)) / 86400000 >= MAX_DATES) {
+        return timing.json({ error: `At most ${MAX_DATES} dates per request` }, { status: 413 });
+      }
+      dateRange(body.from, body.to).forEach(date => byDate.set(date, body));
+    } else {
+      return timing.json({ error: 'Provide either targets[] or from and to' }, { status: 400 });
+    }
+
+    if (byDate.size === 0) {
+      return timing.json({ error: 'targets must be a non-empty array' }, { status: 400 });
+    }
+    if (byDate.size > MAX_DATES) {
+      return timing.json({ error: `At most ${MAX_DATES} dates per request` }, { status: 413 });
+    }
+
+    const now = new Date();
+    const dates: string[] = [];
+    const operations: any[] = [];
+    byDate.forEach((entry, date) => {
+      dates.push(date);
+      operations.push({
+        updateOne: {
+          filter: { user_id: user.id, date },
+          update: { $set: targetFields(entry, user.id, date, now), $setOnInsert: { created_at: now } },
+          upsert: true
+        }
+      });
+    });
+
+    const { result, saved } = await timing.time('db', async () => {
+      const targets = (await clientPromise).db(process.env.MONGODB_DB || 'fitbear').collection('targets');
+      const result = await targets.bulkWrite(operations, { ordered: false });
+      const saved = await targets
+        .find({ user_id: user.id, date: { $in: dates } }, { projection: { _id: 0 } })
+        .sort({ date: 1 })
+        .toArray();
+      return { result, saved };
+    });
+    timing.describe('db', `${dates.length} dates`);
+
+    return timing.json({
+      targets: saved,
+      counts: { upserted: result.upsertedCount, modified: result.modifiedCount, matched: result.matchedCount }
+    }, { status: 200 });
+  } catch (error: any) {
+    console.error('Targets bulk PUT error:', error);
+    return timing.json({ error: 'Internal server error' }, { status: 500 });
+  }
+}
@@ -0,0 +1,56 @@
+// app/api/me/totals/route.ts
+// Consumed calories and macros per day, read from the daily_totals rollup
+// (one document per user and day) instead of summing food_logs.
+//   GET ?date=YYYY-MM-DD          one day (default today); zeros if nothing logged
+//   GET ?from=YYYY-MM-DD&to=...   days in range that have logs, oldest first
+import { getUserFromRequest } from '@/lib/auth';
+import { ServerTiming } from '@/lib/timing';
+import { repositories } from '@/lib/repos';
+import { NUTRIENT_FIELDS, dayKey } from '@/lib/repos/mongo/daily-totals';
+
+export const runtime = 'nodejs';
+export const dynamic = 'force-dynamic';
+
+const DATE = /^\d{4}-\d{2}-\d{2}$/;
+const MAX_RANGE_DAYS = 366;
+
+export async function GET(req: Request) {
+  const timing = new ServerTiming();
+  try {
+    const user = await timing.time('auth', () => getUserFromRequest(req));
+    if (!user) {
+      return timing.json({ error: 'Unauthorized' }, { status: 401 });
+    }
+
+    const { searchParams } = new URL(req.url);
+    const from = searchParams.get('from');
+    const to = searchParams.get('to');
+
+    if (from || to) {
+      if (!DATE.test(from || '') || !DATE.test(to || '') || from! > to!) {
+        return timing.json({ error: 'from and to must be YYYY-MM-DD dates with from <= to' }, { status: 400 });
+      }
+      if ((Date.parse(to!) - Date.parse(from!)) / 86400000 >= MAX_RANGE_DAYS) {
+        return timing.json({ error: `At most ${MAX_RANGE_DAYS} days per request` }, { status: 400 });
+      }
+      const days = await timing.time('db', () => repositories.dailyTotals.findByUserIdRange(user.id, from!, to!));
+      return timing.json({ from, to, days }, { status: 200 });
+    }
+
+    const date = searchParams.get('date') || dayKey(new Date());
+    if (!DATE.test(date)) {
+      return timing.json({ error: 'date must be YYYY-MM-DD' }, { status: 400 });
+    }
+    const totals = await timing.time('db', () => repositories.dailyTotals.findByUserIdAndDate(user.id, date));
+    return timing.json(totals || emptyDay(user.id, date), { status: 200 });
+  } catch (error: any) {
+    console.error('Totals GET error:', error);
+    return timing.json({ error: 'Internal server error' }, { status: 500 });
+  }
+}
+
+function emptyDay(userId: string, date: string) {
+  const day: Record<string, any> = { user_id: userId, date, log_count: 0 };
+  NUTRIENT_FIELDS.forEach(field => { day[field] = 0; });
+  return day;
+}
@@ -1,45 +1,20 @@
-import { NextResponse } from 'next/server';
 import { GoogleGenerativeAI } from '@google/generative-ai';
 import { assertNoMock } from '@/lib/mode';
+import { geminiRequestOptions } from '@/lib/upstreams';
+import { runGemini, retryAfterSeconds } from '@/lib/gemini-scheduler';
+import { ServerTiming } from '@/lib/timing';
+import { normalizeImage } from '@/lib/image';
+import { getUserFromRequest } from '@/lib/auth';
+import { lookupMenuScan, storeMenuScan, sha256, MENU_PROMPT_VERSION } from '@/lib/scan-cache';
+import { singleFlight } from '@/lib/single-flight';
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
 
 const genAI = new GoogleGenerativeAI(process.env.GEMINI_API_KEY || '');
 
-export async function POST(req: Request) {
-  try {
-    const contentType = req.headers.get("content-type") || "";
-    if (!contentType.includes("multipart/form-data")) {
-      assertNoMock("menu scan: content type must be multipart/form-data");
-      return NextResponse.json({ 
-        error: "Content-Type must be multipart/form-data" 
-      }, { status: 400 });
-    }
-
-    const form = await req.formData();
-    const file = form.get("image") as File | null;
-    
-    if (!file) {
-      assertNoMock("menu scan: no image uploaded");
-      return NextResponse.json({ error: "No image provided" }, { status: 400 });
-    }
-    
-    if (!process.env.GEMINI_API_KEY) {
-      return NextResponse.json({ 
-        error: "Gemini API key not configured" 
-      }, { status: 500 });
-    }
-    
-    // Convert file to base64
-    const bytes = new Uint8Array(await file.arrayBuffer());
-    const base64 = Buffer.from(bytes).toString("base64");
-    
-    console.log('Processing menu image with Gemini Vision OCR...');
-    
-    const model = genAI.getGenerativeModel({ model: "gemini-1.5-flash" });
-    
-    const prompt = `You are an expert nutrition coach. Analyze this restaurant menu image and provide food recommendations.
+// Bump MENU_PROMPT_VERSION in lib/scan-cache.ts when this changes
+const MENU_PROMPT = `You are an expert nutrition coach. Analyze this restaurant menu image and provide food recommendations.
 
 Extract all food items with their prices. For each item, categorize as:
 - "recommended": High protein, balanced nutrition, fits healthy eating
@@ -62,27 +37,90 @@ Return JSON format:
 
 Be specific about actual menu items visible. Do NOT invent Indian dishes that aren't on this menu.`;
 
-    const result = await model.generateContent([
-      prompt,
-      {
-        inlineData: {
-          data: base64,
-          mimeType: file.type || "image/jpeg"
-        }
-      }
-    ]);
+export async function POST(req: Request) {
+  const timing = new ServerTiming();
+  const started = Date.now();
+  try {
+    const contentType = req.headers.get("content-type") || "";
+    if (!contentType.includes("multipart/form-data")) {
+      assertNoMock("menu scan: content type must be multipart/form-data");
+      return timing.json({ 
+        error: "Content-Type must be multipart/form-data" 
+      }, { status: 400 });
+    }
+
+    const form = await timing.time('parse', () => req.formData());
+    const file = form.get("image") as File | null;
     
-    const response = await result.response;
-    const text = response.text();
+    if (!file) {
+      assertNoMock("menu scan: no image uploaded");
+      return timing.json({ error: "No image provided" }, { status: 400 });
+    }
+    
+    // Same image + same prompt version => same answer; skip Gemini entirely
+    const bytes = await timing.time('parse', async () => new Uint8Array(await file.arrayBuffer()));
+    const contentHash = sha256(bytes);
+    const hit = await timing.time('db', () => lookupMenuScan(contentHash));
+    if (hit) {
+      return timing.json({
+        ...hit.result,
+        processing_time: `${Date.now() - started}ms`,
+        confidence: 0.9,
+        cache: { status: "hit", tier: hit.tier }
+      }, { headers: { "X-Cache": "HIT" } });
+    }
+    
+    if (!process.env.GEMINI_API_KEY) {
+      return timing.json({ 
+        error: "Gemini API key not configured" 
+      }, { status: 500 });
+    }
+    
+    // Identical uploads already in flight (a table scanning the same menu, a
+    // client retry) share one Gemini call; only the first caller stores it
+    const flightStarted = performance.now();
+    const { value: text, shared } = await singleFlight(`menu:${MENU_PROMPT_VERSION}:${contentHash}`, async () => {
+      // Orient, strip EXIF, downscale and re-encode before the upload to Gemini
+      const image = await timing.time('image', () => normalizeImage(bytes, file.type || "image/jpeg"));
+      timing.describe('image', `${image.bytesIn}->${image.bytesOut} bytes`);
+      const base64 = await timing.time('parse', () => image.data.toString("base64"));
+      
+      console.log('Processing menu image with Gemini Vision OCR...');
+      
+      const model = genAI.getGenerativeModel({ model: "gemini-1.5-flash" }, geminiRequestOptions());
+      
+      return timing.time('upstream-ai', () => runGemini(model.model, async () => {
+        const result = await model.generateContent([
+          MENU_PROMPT,
+          {
+            inlineData: {
+              data: base64,
+              mimeType: image.mimeType
+            }
+          }
+        ]);
+        const response = await result.response;
+        return response.text();
+      }));
+    });
+    if (shared) {
+      timing.add('upstream-ai', performance.now() - flightStarted);
+      timing.describe('upstream-ai', 'coalesced');
+    }
     
     // Parse Gemini response as JSON
     try {
-      const parsedResponse = JSON.parse(text);
-      return NextResponse.json({
+      const parsedResponse = await timing.time('parse', () => JSON.parse(text));
+      const user = await timing.time('auth', () => getUserFromRequest(req).catch(() => null));
+      if (!shared) {
+        await timing.time('db', () => storeMenuScan(contentHash, parsedResponse, user?.id));
+      }
+      return timing.json({
         ...parsedResponse,
         processing_time: "< 2s",
-        confidence: 0.9
-      });
+        confidence: 0.9,
+        cache: { status: shared ? "coalesced" : "miss" }
+      }, { headers: { "X-Cache": shared ? "COALESCED" : "MISS" } });
     } catch (parseError) {
       console.error('Failed to parse Gemini response as JSON:', parseError);
       console.log('Raw Gemini response:', text);
@@ -90,7 +128,7 @@ Be specific about actual menu items visible. Do NOT invent Indian dishes that ar
       assertNoMock("menu scan: failed to parse AI response");
       
       // Return structured response even if JSON parsing fails
-      return NextResponse.json({
+      return timing.json({
         ocr_method: "gemini_vision",
         text: text,
         recommendations: [
@@ -103,8 +141,9 @@ Be specific about actual menu items visible. Do NOT invent Indian dishes that ar
         ],
         processing_time: "< 2s",
         confidence: 0.5,
-        raw_ai_response: text
-      });
+        raw_ai_response: text,
+        cache: { status: "miss" }
+      }, { headers: { "X-Cache": "MISS" } });
     }
     
   } catch (error) {
@@ -114,7 +153,14 @@ Be specific about actual menu items visible. Do NOT invent Indian dishes that ar
       throw error; // Re-throw production guard errors
     }
     
-    return NextResponse.json({ 
+    const retryAfter = retryAfterSeconds(error);
+    if (retryAfter !== null) {
+      return timing.json({ 
+        error: "AI service is busy, please retry shortly" 
+      }, { status: 503, headers: { "Retry-After": String(retryAfter) } });
+    }
+    
+    return timing.json({ 
       error: "Menu scanning failed",
       details: (error as Error).message 
     }, { status: 500 });
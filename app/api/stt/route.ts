@@ -1,47 +1,157 @@
-import { NextResponse } from 'next/server';
+import { deepgramBaseUrl } from '@/lib/upstreams';
+import { ServerTiming } from '@/lib/timing';
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
 
+// Limits are enforced while the body streams through, not after buffering.
+// Clients upload while recording, so upload time tracks audio duration.
+const MAX_BYTES = Number(process.env.STT_MAX_BYTES || 10 * 1024 * 1024);
+const MAX_SECONDS = Number(process.env.STT_MAX_SECONDS || 60);
+
+type LimitState = { bytes: number; exceeded: string | null };
+
 export async function POST(req: Request) {
+  const timing = new ServerTiming();
   try {
     if (!process.env.DEEPGRAM_API_KEY) {
-      return NextResponse.json({ error: "Deepgram API key not configured" }, { status: 500 });
-    }
-    
-    const audioBuffer = await req.arrayBuffer();
-    
-    if (!audioBuffer || audioBuffer.byteLength === 0) {
-      return NextResponse.json({ error: "No audio data provided" }, { status: 400 });
-    }
-    
-    const response = await fetch('https://api.deepgram.com/v1/listen', {
-      method: 'POST',
-      headers: {
-        'Authorization': `Token ${process.env.DEEPGRAM_API_KEY}`,
-        'Content-Type': 'audio/webm'
-      },
-      body: audioBuffer
-    });
-    
+      return timing.json({ error: "Deepgram API key not configured" }, { status: 500 });
+    }
+
+    if (!req.body) {
+      return timing.json({ error: "No audio data provided" }, { status: 400 });
+    }
+
+    const contentType = audioContentType(req.headers.get('content-type'));
+    if (!contentType) {
+      return timing.json({ error: "Unsupported audio content type" }, { status: 415 });
+    }
+
+    const declared = req.headers.get('content-length');
+    if (declared === '0') {
+      return timing.json({ error: "No audio data provided" }, { status: 400 });
+    }
+    if (Number(declared || 0) > MAX_BYTES) {
+      return timing.json({ error: `Audio exceeds ${MAX_BYTES} bytes` }, { status: 413 });
+    }
+
+    // Chunked uploads carry no length: wait for the first bytes so an empty
+    // body is rejected before Deepgram is called (and billed)
+    const state: LimitState = { bytes: 0, exceeded: null };
+    const upload = limitStream(req.body, state);
+    const hasAudio = await timing.time('parse', () => upload.hasData());
+    if (state.exceeded) {
+      return timing.json({ error: state.exceeded }, { status: 413 });
+    }
+    if (!hasAudio) {
+      return timing.json({ error: "No audio data provided" }, { status: 400 });
+    }
+
+    let response: Response;
+    try {
+      response = await timing.time('upstream-ai', () => fetch(`${deepgramBaseUrl()}/v1/listen`, {
+        method: 'POST',
+        headers: {
+          'Authorization': `Token ${process.env.DEEPGRAM_API_KEY}`,
+          'Content-Type': contentType
+        },
+        body: upload.stream,
+        duplex: 'half', // required by fetch for streamed request bodies
+        signal: req.signal
+      } as RequestInit));
+    } catch (error) {
+      if (state.exceeded) {
+        return timing.json({ error: state.exceeded }, { status: 413 });
+      }
+      throw error;
+    }
+    timing.describe('upstream-ai', `${state.bytes} bytes streamed`);
+
     if (!response.ok) {
-      const errorText = await response.text();
-      return NextResponse.json({ error: `Deepgram API error: ${errorText}` }, { status: response.status });
+      const errorText = await timing.time('upstream-ai', () => response.text());
+      return timing.json({ error: `Deepgram API error: ${errorText}` }, { status: response.status });
     }
-    
-    const result = await response.json();
+
+    const result = await timing.time('upstream-ai', () => response.json());
     const transcript = result.results?.channels?.[0]?.alternatives?.[0]?.transcript || '';
-    
+
     if (!transcript) {
-      return NextResponse.json({ error: "No speech detected" }, { status: 400 });
+      return timing.json({ error: "No speech detected" }, { status: 400 });
     }
-    
-    return NextResponse.json({
+
+    return timing.json({
       text: transcript
     });
-    
+
   } catch (error) {
     console.error('STT error:', error);
-    return NextResponse.json({ error: "Speech-to-text processing failed" }, { status: 500 });
+    return timing.json({ error: "Speech-to-text processing failed" }, { status: 500 });
   }
-}
\ No newline at end of file
+}
+
+/**
+ * Forward the client's audio type (codec parameters included) to Deepgram.
+ * A missing or generic type keeps the old `audio/webm` default, which is
+ * what MediaRecorder produces in Chrome and Firefox.
+ */
+function audioContentType(header: string | null): string | null {
+  const type = (header || '').trim();
+  if (!type || type.startsWith('application/octet-stream')) return 'audio/webm';
+  return /^(audio|video)\//i.test(type) ? type : null;
+}
+
+/**
+ * Pass the request body through chunk by chunk, erroring the stream (and so
+ * the upstream request) once MAX_BYTES is exceeded or the upload has been
+ * open for MAX_SECONDS, whether or not the client is still sending.
+ * hasData() reads ahead to the first non-empty chunk, which the stream then
+ * delivers first.
+ */
+function limitStream(body: ReadableStream<Uint8Array>, state: LimitState) {
+  const reader = body.getReader();
+  const timer = setTimeout(() => {
+    state.exceeded = `Audio exceeds ${MAX_SECONDS} seconds`;
+    reader.cancel().catch(() => {}); // resolves the pending read below
+  }, MAX_SECONDS * 1000);
+  let pending: ReadableStreamReadResult<Uint8Array> | null = null;
+
+  const read = async () => {
+    const result = await reader.read();
+    if (!state.exceeded && result.value) {
+      state.bytes += result.value.byteLength;
+      if (state.bytes > MAX_BYTES) {
+        state.exceeded = `Audio exceeds ${MAX_BYTES} bytes`;
+        reader.cancel().catch(() => {});
+      }
+    }
+    if (state.exceeded || result.done) clearTimeout(timer);
+    return result;
+  };
+
+  return {
+    async hasData(): Promise<boolean> {
+      do {
+        pending = await read();
+      } while (!pending.done && !state.exceeded && !pending.value?.byteLength);
+      return !pending.done && !state.exceeded;
+    },
+
+    stream: new ReadableStream<Uint8Array>({
+      async pull(controller) {
+        const { done, value } = pending || await read();
+        pending = null;
+        if (state.exceeded) {
+          controller.error(new Error(state.exceeded));
+        } else if (done) {
+          controller.close();
+        } else {
+          controller.enqueue(value);
+        }
+      },
+      cancel(reason) {
+        clearTimeout(timer);
+        return reader.cancel(reason);
+      }
+    }, { highWaterMark: 0 })
+  };
+}
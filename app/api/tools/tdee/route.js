@@ -1,4 +1,4 @@
-import { NextResponse } from "next/server";
+import { ServerTiming } from "@/lib/timing";
 
 // Force Node.js runtime for MongoDB operations  
 export const runtime = 'nodejs';
@@ -24,8 +24,9 @@ function computeTDEE(payload) {
 }
 
 export async function POST(req) {
+  const timing = new ServerTiming();
   try {
-    const body = await req.json();
+    const body = await timing.time("parse", () => req.json());
 
     // Validate quickly and return JSON on every path
     if (
@@ -36,7 +37,7 @@ export async function POST(req) {
       !Number.isFinite(body.weight_kg) ||
       !body.activity_level
     ) {
-      return NextResponse.json(
+      return timing.json(
         { error: "Invalid payload", tdee_kcal: null },
         { 
           status: 400, 
@@ -50,7 +51,7 @@ export async function POST(req) {
 
     const tdee = computeTDEE(body);
 
-    return NextResponse.json(
+    return timing.json(
       { tdee_kcal: tdee },
       { 
         status: 200, 
@@ -62,7 +63,7 @@ export async function POST(req) {
     );
   } catch (err) {
     // Bad JSON or unexpected error — still return JSON, never empty
-    return NextResponse.json(
+    return timing.json(
       { error: "Bad request", tdee_kcal: null },
       { 
         status: 400, 
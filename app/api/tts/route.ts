@@ -1,53 +1,108 @@
-import { NextResponse } from 'next/server';
+import { deepgramBaseUrl } from '@/lib/upstreams';
+import { ServerTiming } from '@/lib/timing';
+import { cacheAudioStream, readCachedAudio, ttsCacheKey } from '@/lib/tts-cache';
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
 
+const DEFAULT_MODEL = "aura-asteria-en";
+// GET carries the text in the URL; one TTS segment is well under this
+const MAX_GET_TEXT = 1000;
+
+/**
+ * GET /api/tts?model=...&text=... is the cacheable form: the browser keeps
+ * the audio for a day and revalidates it with If-None-Match. It only serves
+ * audio already in the disk cache (404 otherwise), so a link or <audio src>
+ * elsewhere cannot spend the Deepgram quota; synthesis stays on POST.
+ */
+export async function GET(req: Request) {
+  const timing = new ServerTiming();
+  const { searchParams } = new URL(req.url);
+  const text = searchParams.get("text");
+  if (text && text.length > MAX_GET_TEXT) {
+    return timing.json({ error: `Text over ${MAX_GET_TEXT} characters; use POST` }, { status: 414 });
+  }
+  return speak(req, timing, text, searchParams.get("model") || DEFAULT_MODEL, false);
+}
+
 export async function POST(req: Request) {
+  const timing = new ServerTiming();
+  let body: any;
+  try {
+    body = await timing.time('parse', () => req.json());
+  } catch {
+    return timing.json({ error: "Invalid JSON" }, { status: 400 });
+  }
+  return speak(req, timing, body?.text, body?.model || DEFAULT_MODEL, true);
+}
+
+async function speak(req: Request, timing: ServerTiming, text: string | null, model: string, synthesize: boolean) {
   try {
-    const { text, model = "aura-asteria-en" } = await req.json();
-    
     if (!text) {
-      return new Response(JSON.stringify({ error: "No text" }), { 
-        status: 400,
-        headers: { "Content-Type": "application/json" }
+      return timing.json({ error: "No text" }, { status: 400 });
+    }
+    
+    // The key hashes model + normalised text, and the cached file is the
+    // canonical audio for it, so it doubles as a strong ETag
+    const key = ttsCacheKey(text, model);
+    const etag = `"${key}"`;
+    const cacheHeaders = { "ETag": etag, "Cache-Control": "private, max-age=86400" };
+    
+    if (req.headers.get("if-none-match") === etag) {
+      return timing.attach(new Response(null, { status: 304, headers: cacheHeaders }));
+    }
+    
+    const cached = await timing.time('db', () => readCachedAudio(key));
+    if (cached) {
+      timing.describe('db', 'tts cache hit');
+      return timing.attach(new Response(cached, {
+        headers: { ...cacheHeaders, "Content-Type": "audio/mpeg", "X-Cache": "HIT" }
+      }));
+    }
+    
+    if (!synthesize) {
+      return timing.json({ error: "Not cached; synthesise with POST" }, {
+        status: 404,
+        headers: { "Cache-Control": "no-store", "X-Cache": "MISS" }
       });
     }
     
     if (!process.env.DEEPGRAM_API_KEY) {
-      return new Response(JSON.stringify({ error: "Deepgram API key not configured" }), { 
-        status: 500,
-        headers: { "Content-Type": "application/json" }
-      });
+      return timing.json({ error: "Deepgram API key not configured" }, { status: 500 });
     }
     
-    const response = await fetch(`https://api.deepgram.com/v1/speak?model=${encodeURIComponent(model)}`, {
+    // req.signal aborts the upstream request if the client goes away first
+    const response = await timing.time('upstream-ai', () => fetch(`${deepgramBaseUrl()}/v1/speak?model=${encodeURIComponent(model)}`, {
       method: "POST",
       headers: { 
         "Content-Type": "application/json",
         "Authorization": `Token ${process.env.DEEPGRAM_API_KEY}`
       },
-      body: JSON.stringify({ text })
-    });
+      body: JSON.stringify({ text }),
+      signal: req.signal
+    }));
     
     if (!response.ok) {
-      const errorText = await response.text();
-      return new Response(JSON.stringify({ error: `Deepgram API error: ${errorText}` }), { 
-        status: response.status,
-        headers: { "Content-Type": "application/json" }
-      });
+      const errorText = await timing.time('upstream-ai', () => response.text());
+      return timing.json({ error: `Deepgram API error: ${errorText}` }, { status: response.status });
     }
     
-    const audio = await response.arrayBuffer();
-    return new Response(audio, { 
-      headers: { "Content-Type": "audio/mpeg" }
-    });
+    if (!response.body) {
+      return timing.json({ error: "Deepgram returned no audio" }, { status: 502 });
+    }
+
+    // Only time-to-first-byte is measured; the audio itself streams through
+    timing.describe('upstream-ai', 'ttfb');
+    return timing.attach(new Response(cacheAudioStream(key, response.body), { 
+      headers: {
+        ...cacheHeaders,
+        "Content-Type": response.headers.get("content-type") || "audio/mpeg",
+        "X-Cache": "MISS"
+      }
+    }));
     
   } catch (error) {
     console.error('TTS error:', error);
-    return new Response(JSON.stringify({ error: "TTS processing failed" }), { 
-      status: 500,
-      headers: { "Content-Type": "application/json" }
-    });
+    return timing.json({ error: "TTS processing failed" }, { status: 500 });
   }
-}
\ No newline at end of file
+}
@@ -1,12 +1,13 @@
-import { NextResponse } from 'next/server';
 import { cookies } from "next/headers";
 import { createServerClient } from "@supabase/ssr";
 import { APP_MODE, allowMocks } from '@/lib/mode';
+import { ServerTiming } from '@/lib/timing';
 
 export const runtime = "nodejs";
 export const dynamic = "force-dynamic";
 
 export async function GET() {
+  const timing = new ServerTiming();
   try {
     const supabase = createServerClient(
       process.env.NEXT_PUBLIC_SUPABASE_URL!,
@@ -19,16 +20,16 @@ export async function GET() {
       }
     );
     
-    const { data: { user } } = await supabase.auth.getUser();
+    const { data: { user } } = await timing.time('auth', () => supabase.auth.getUser());
     
-    return NextResponse.json({
+    return timing.json({
       user: user?.email || null,
       app_mode: APP_MODE,
       allow_mocks: allowMocks,
       authenticated: !!user
     });
   } catch (error) {
-    return NextResponse.json({
+    return timing.json({
       user: null,
       app_mode: APP_MODE,
       allow_mocks: allowMocks,
@@ -11,6 +11,7 @@ import { Alert, AlertDescription } from '../components/ui/alert';
 import { Loader2, Camera, Utensils, MessageSquare, User, Scan, Activity, Settings, AlertTriangle, Eye, EyeOff, LogOut } from 'lucide-react';
 import { useToast } from '../components/ui/use-toast';
 import { SimpleProfilePopup } from '../components/SimpleProfilePopup';
+import { CoachChat } from '../components/CoachChat';
 
 // Utility function for safe JSON parsing
 async function safeJson(response) {
@@ -455,12 +456,7 @@ export default function App() {
                 <p className="text-gray-600 mb-4">
                   Chat with Coach C for personalized nutrition advice and meal planning.
                 </p>
-                <Alert>
-                  <AlertTriangle className="h-4 w-4" />
-                  <AlertDescription>
-                    AI Coach ready. Ask questions about nutrition, meal planning, and health goals.
-                  </AlertDescription>
-                </Alert>
+                <CoachChat profile={profile} />
               </CardContent>
             </Card>
           </TabsContent>
@@ -18,6 +18,8 @@ from io import BytesIO
 import os
 import subprocess
 
+from fitbear_client import FitbearClient
+
 # Load environment variables from .env file
 def load_env():
     try:
@@ -40,6 +42,9 @@ LOCAL_URL = 'http://localhost:3000'
 # Start with local testing
 API_BASE = f"{LOCAL_URL}/api"
 
+# One pooled keep-alive session for every call so durations exclude handshakes
+client = FitbearClient(LOCAL_URL, timeout=30)
+
 print(f"🎯 FINAL VALIDATION - ALL SYSTEMS GO CHECK")
 print(f"Testing backend locally at: {API_BASE}")
 print(f"External URL: {EXTERNAL_URL}")
@@ -51,21 +56,20 @@ def test_endpoint(method, endpoint, data=None, files=None, headers=None):
     url = f"{API_BASE}{endpoint}"
     
     try:
-        start_time = time.time()
-        
         if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, timeout=30)
+            response = client.get(url, headers=headers)
         elif method.upper() == 'POST':
             if files:
-                response = requests.post(url, files=files, data=data, headers=headers, timeout=30)
+                response = client.post(url, files=files, data=data, headers=headers)
             else:
-                response = requests.post(url, json=data, headers=headers, timeout=30)
+                response = client.post(url, json=data, headers=headers)
         elif method.upper() == 'PUT':
-            response = requests.put(url, json=data, headers=headers, timeout=30)
+            response = client.put(url, json=data, headers=headers)
         else:
             return {"error": f"Unsupported method: {method}"}
         
-        duration = time.time() - start_time
+        # Total time on a pooled connection; handshakes are reported separately
+        timings = response.timings
         
         # Try to parse JSON response
         try:
@@ -75,7 +79,10 @@ def test_endpoint(method, endpoint, data=None, files=None, headers=None):
         
         return {
             "status_code": response.status_code,
-            "duration": round(duration, 2),
+            "duration": round(timings.total, 2),
+            "timings_ms": timings.as_ms(),
+            # Server-side phases (auth, db, upstream-ai, parse, serialize) from Server-Timing
+            "server_timing_ms": response.server_timing,
             "response": response_data,
             "success": 200 <= response.status_code < 300
         }
@@ -87,6 +94,14 @@ def test_endpoint(method, endpoint, data=None, files=None, headers=None):
     except Exception as e:
         return {"error": f"Request failed: {str(e)}", "success": False}
 
+def format_phases(result):
+    """One-line per-phase breakdown from a test_endpoint result's Server-Timing"""
+    phases = result.get("server_timing_ms") or {}
+    if not phases:
+        return ""
+    parts = [f"{name} {ms:.0f}ms" for name, ms in phases.items() if name != "total"]
+    return f" [{', '.join(parts)}]" if parts else ""
+
 def create_test_image():
     """Create a simple test image for upload endpoints"""
     # Create a minimal PNG image (1x1 pixel)
@@ -113,7 +128,7 @@ whoami_result = test_endpoint('GET', '/whoami')
 results["authentication"]["whoami"] = whoami_result
 
 if whoami_result.get("success"):
-    print(f"✅ Whoami: {whoami_result['status_code']} - {whoami_result['duration']}s")
+    print(f"✅ Whoami: {whoami_result['status_code']} - {whoami_result['duration']}s{format_phases(whoami_result)}")
     if "production" in str(whoami_result.get("response", {})).lower():
         print("✅ Production mode confirmed")
     else:
@@ -134,7 +149,7 @@ results["ai_integration"]["coach_chat"] = coach_result
 
 if coach_result.get("success"):
     response_text = coach_result.get("response", {}).get("response", "")
-    print(f"✅ Coach Chat: {coach_result['status_code']} - {coach_result['duration']}s")
+    print(f"✅ Coach Chat: {coach_result['status_code']} - {coach_result['duration']}s{format_phases(coach_result)}")
     print(f"✅ Response length: {len(response_text)} characters")
     if len(response_text) > 100:
         print("✅ Detailed AI response received")
@@ -152,7 +167,7 @@ try:
     results["ai_integration"]["menu_scanner"] = menu_result
     
     if menu_result.get("success"):
-        print(f"✅ Menu Scanner: {menu_result['status_code']} - {menu_result['duration']}s")
+        print(f"✅ Menu Scanner: {menu_result['status_code']} - {menu_result['duration']}s{format_phases(menu_result)}")
         response = menu_result.get("response", {})
         if "items" in response or "recommendations" in response:
             print("✅ Menu analysis response received")
@@ -173,7 +188,7 @@ health_result = test_endpoint('GET', '/health/app')
 results["core_apis"]["health_check"] = health_result
 
 if health_result.get("success"):
-    print(f"✅ Health Check: {health_result['status_code']} - {health_result['duration']}s")
+    print(f"✅ Health Check: {health_result['status_code']} - {health_result['duration']}s{format_phases(health_result)}")
     response = health_result.get("response", {})
     if "status" in response or "message" in response:
         print("✅ Health check response valid")
@@ -194,7 +209,7 @@ results["core_apis"]["tdee_calculator"] = tdee_result
 
 if tdee_result.get("success"):
     tdee_value = tdee_result.get("response", {}).get("tdee", 0)
-    print(f"✅ TDEE Calculator: {tdee_result['status_code']} - {tdee_result['duration']}s")
+    print(f"✅ TDEE Calculator: {tdee_result['status_code']} - {tdee_result['duration']}s{format_phases(tdee_result)}")
     print(f"✅ TDEE calculated: {tdee_value} kcal")
     if 2200 <= tdee_value <= 2800:
         print("✅ TDEE value in expected range")
@@ -209,7 +224,7 @@ profile_get_result = test_endpoint('GET', '/me/profile')
 results["core_apis"]["profile_get"] = profile_get_result
 
 if profile_get_result.get("success"):
-    print(f"✅ Profile GET: {profile_get_result['status_code']} - {profile_get_result['duration']}s")
+    print(f"✅ Profile GET: {profile_get_result['status_code']} - {profile_get_result['duration']}s{format_phases(profile_get_result)}")
 else:
     print(f"❌ Profile GET: {profile_get_result.get('error', 'Failed')}")
 
@@ -219,7 +234,7 @@ targets_get_result = test_endpoint('GET', '/me/targets')
 results["core_apis"]["targets_get"] = targets_get_result
 
 if targets_get_result.get("success"):
-    print(f"✅ Targets GET: {targets_get_result['status_code']} - {targets_get_result['duration']}s")
+    print(f"✅ Targets GET: {targets_get_result['status_code']} - {targets_get_result['duration']}s{format_phases(targets_get_result)}")
     targets = targets_get_result.get("response", {})
     if "tdee" in targets or "calories" in targets:
         print("✅ Targets data structure valid")
@@ -255,7 +270,7 @@ try:
     results["ai_integration"]["food_analyzer"] = food_result
     
     if food_result.get("success"):
-        print(f"✅ Food Analyzer: {food_result['status_code']} - {food_result['duration']}s")
+        print(f"✅ Food Analyzer: {food_result['status_code']} - {food_result['duration']}s{format_phases(food_result)}")
     else:
         print(f"❌ Food Analyzer: {food_result.get('error', 'Failed')}")
 except Exception as e:
@@ -303,6 +318,16 @@ elif results["summary"]["success_rate"] >= 60:
 else:
     print("\n🚨 VALIDATION FAILED - CRITICAL ISSUES DETECTED")
 
+print("\n⏱️ SERVER TIMING BREAKDOWN (ms):")
+for category, tests in results.items():
+    if category == "summary":
+        continue
+    for test_name, result in tests.items():
+        phases = result.get("server_timing_ms") if isinstance(result, dict) else None
+        if phases:
+            breakdown = ", ".join(f"{name}={ms:.1f}" for name, ms in phases.items())
+            print(f"  {test_name}: {breakdown}")
+
 print("\n🔍 DETAILED RESULTS:")
 print(json.dumps(results, indent=2))
 
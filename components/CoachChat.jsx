@@ -0,0 +1,119 @@
+import React, { useEffect, useRef, useState } from 'react';
+import { Button } from './ui/button';
+import { Input } from './ui/input';
+import { Loader2, Send } from 'lucide-react';
+import { supabaseBrowser } from '../lib/supabase-client';
+import { readEventStream, safeJson } from '../lib/http';
+
+/**
+ * Chat with Coach C. Replies are requested as Server-Sent Events and rendered
+ * token by token; servers that answer with plain JSON still work.
+ */
+export function CoachChat({ profile }) {
+  const [messages, setMessages] = useState([]);
+  const [input, setInput] = useState('');
+  const [sending, setSending] = useState(false);
+  const abortRef = useRef(null);
+  const bottomRef = useRef(null);
+
+  useEffect(() => () => abortRef.current?.abort(), []);
+
+  useEffect(() => {
+    bottomRef.current?.scrollIntoView({ behavior: 'smooth', block: 'end' });
+  }, [messages]);
+
+  // Patch the coach message being streamed (always the last one)
+  const updateReply = (patch) => {
+    setMessages((prev) => {
+      const next = [...prev];
+      const last = next[next.length - 1];
+      next[next.length - 1] = { ...last, ...(typeof patch === 'function' ? patch(last) : patch) };
+      return next;
+    });
+  };
+
+  const send = async (e) => {
+    e.preventDefault();
+    const message = input.trim();
+    if (!message || sending) return;
+
+    setInput('');
+    setSending(true);
+    setMessages((prev) => [
+      ...prev,
+      { role: 'user', text: message },
+      { role: 'coach', text: '', pending: true }
+    ]);
+
+    const controller = new AbortController();
+    abortRef.current = controller;
+
+    try {
+      const { data: { session } } = await supabaseBrowser().auth.getSession();
+      const response = await fetch('/api/coach/ask', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Accept': 'text/event-stream',
+          ...(session?.access_token ? { 'Authorization': `Bearer ${session.access_token}` } : {})
+        },
+        body: JSON.stringify({ message, profile, stream: true }),
+        signal: controller.signal
+      });
+
+      const contentType = response.headers.get('content-type') || '';
+      if (response.ok && contentType.includes('text/event-stream')) {
+        await readEventStream(response, (event, data) => {
+          if (event === 'token') {
+            updateReply((last) => ({ text: last.text + data.text }));
+          } else if (event === 'done') {
+            updateReply({ text: data.reply, timestamp: data.timestamp, citations: data.citations, pending: false });
+          } else if (event === 'error') {
+            updateReply({ error: data.error || 'Coach chat failed', pending: false });
+          }
+        });
+      } else {
+        const data = await safeJson(response);
+        updateReply({ text: data.reply, timestamp: data.timestamp, citations: data.citations, pending: false });
+      }
+    } catch (error) {
+      if (error.name !== 'AbortError') {
+        console.error('Coach chat error:', error);
+        updateReply({ error: 'Coach C is unavailable right now. Please try again.', pending: false });
+      }
+    } finally {
+      updateReply({ pending: false });
+      setSending(false);
+    }
+  };
+
+  return (
+    <div className="flex flex-col gap-4">
+      <div className="flex flex-col gap-3 max-h-96 overflow-y-auto">
+        {messages.map((m, i) => (
+          <div
+            key={i}
+            className={`rounded-lg px-3 py-2 text-sm whitespace-pre-wrap ${
+              m.role === 'user' ? 'self-end bg-blue-600 text-white' : 'self-start bg-gray-100 text-gray-900'
+            }`}
+          >
+            {m.error ? <span className="text-red-600">{m.error}</span> : m.text}
+            {m.pending && !m.text && <Loader2 className="h-4 w-4 animate-spin" />}
+          </div>
+        ))}
+        <div ref={bottomRef} />
+      </div>
+      <form onSubmit={send} className="flex gap-2">
+        <Input
+          value={input}
+          onChange={(e) => setInput(e.target.value)}
+          placeholder="Ask Coach C about meals, macros or goals..."
+          disabled={sending}
+        />
+        <Button type="submit" disabled={sending || !input.trim()}>
+          {sending ? <Loader2 className="h-4 w-4 animate-spin" /> : <Send className="h-4 w-4" />}
+        </Button>
+      </form>
+    </div>
+  );
+}
@@ -11,6 +11,7 @@ import { Separator } from '@/components/ui/separator';
 import { Download, Trash2, Shield, Flag, Globe } from 'lucide-react';
 import { usePostHog } from '@/lib/hooks/usePostHog';
 import { useToast } from '@/components/ui/use-toast';
+import { supabaseBrowser } from '../lib/supabase-client';
 
 export function SettingsPage({ profile, onUpdateProfile, onBack, mode, onModeChange }) {
   const [language, setLanguage] = useState(profile?.locale || 'en');
@@ -50,48 +51,55 @@ export function SettingsPage({ profile, onUpdateProfile, onBack, mode, onModeCha
     });
   };
 
+  const downloadFile = (blob, filename) => {
+    const url = URL.createObjectURL(blob);
+    const linkElement = document.createElement('a');
+    linkElement.setAttribute('href', url);
+    linkElement.setAttribute('download', filename);
+    linkElement.click();
+    setTimeout(() => URL.revokeObjectURL(url), 0);
+  };
+
   const handleExportData = async () => {
+    const today = new Date().toISOString().split('T')[0];
     try {
-      // Collect user data (no secrets/PII beyond what user entered)
-      const exportData = {
-        profile: {
-          name: profile?.name,
-          height_cm: profile?.height_cm,
-          weight_kg: profile?.weight_kg,
-          dietary_preferences: dietaryFlags,
-          locale: language
-        },
-        targets: await fetch('/api/me/targets').then(async r => {
-          if (!r.ok) return {};
-          const text = await r.text();
-          try { return JSON.parse(text); } catch { return {}; }
-        }).catch(() => ({})),
-        food_logs: await fetch('/api/logs').then(async r => {
-          if (!r.ok) return [];
-          const text = await r.text();
-          try { return JSON.parse(text); } catch { return []; }
-        }).catch(() => []),
-        exported_at: new Date().toISOString()
-      };
+      // Streamed by the server as NDJSON; saved as-is so long histories
+      // never have to be parsed or re-serialised in the browser
+      const { data: { session } } = await supabaseBrowser().auth.getSession();
+      const response = await fetch('/api/me/export', {
+        headers: session?.access_token ? { 'Authorization': `Bearer ${session.access_token}` } : {}
+      }).catch(() => null);
 
-      const dataStr = JSON.stringify(exportData, null, 2);
-      const dataUri = 'data:application/json;charset=utf-8,'+ encodeURIComponent(dataStr);
-      
-      const exportFileDefaultName = `fitbear-data-${new Date().toISOString().split('T')[0]}.json`;
-      
-      const linkElement = document.createElement('a');
-      linkElement.setAttribute('href', dataUri);
-      linkElement.setAttribute('download', exportFileDefaultName);
-      linkElement.click();
+      let blob;
+      if (response?.ok) {
+        blob = await response.blob();
+        downloadFile(blob, `fitbear-data-${today}.ndjson`);
+      } else {
+        // Signed out or server unavailable: still hand over what this device knows
+        const exportData = {
+          profile: {
+            name: profile?.name,
+            height_cm: profile?.height_cm,
+            weight_kg: profile?.weight_kg,
+            dietary_preferences: dietaryFlags,
+            locale: language
+          },
+          exported_at: new Date().toISOString()
+        };
+        blob = new Blob([JSON.stringify(exportData, null, 2)], { type: 'application/json' });
+        downloadFile(blob, `fitbear-data-${today}.json`);
+      }
 
       track('data_exported', { 
         export_date: new Date().toISOString(),
-        data_size: dataStr.length
+        data_size: blob.size
       });
 
       toast({
         title: "Data Exported",
-        description: "Your data has been downloaded as a JSON file",
+        description: response?.ok
+          ? "Your data has been downloaded as an NDJSON file"
+          : "Your local profile has been downloaded as a JSON file",
       });
     } catch (error) {
       toast({
@@ -4,7 +4,7 @@
 Addresses all requirements from the review request with absolute thoroughness.
 """
 
-import requests
+import asyncio
 import json
 import io
 from PIL import Image
@@ -14,10 +14,17 @@ import sys
 import time
 import subprocess
 
+from fitbear_client import FitbearClient
+from perf.load import LoadConfig, format_report, parse_mix, run_load
+
 # URLs for testing
 INTERNAL_URL = "http://localhost:3000"
 EXTERNAL_URL = "https://fitbear-revival.preview.emergentagent.com"
 
+# Pooled keep-alive clients: timings reflect the server, not TCP/TLS handshakes
+client = FitbearClient(INTERNAL_URL, timeout=30)
+external_client = FitbearClient(EXTERNAL_URL, timeout=30)
+
 print("🎯 CRITICAL COMPREHENSIVE BACKEND TESTING - ZERO TOLERANCE FOR ERRORS")
 print("="*80)
 print("MISSION: User demands 100% reliability and flawless deployment")
@@ -115,7 +122,7 @@ def test_production_readiness():
     
     # Test APP_MODE enforcement
     try:
-        response = requests.get(f"{INTERNAL_URL}/api/env-test", timeout=30)
+        response = client.env_test()
         if response.status_code == 200:
             data = response.json()
             app_mode = data.get('APP_MODE') or data.get('NEXT_PUBLIC_APP_MODE')
@@ -148,7 +155,7 @@ def test_production_readiness():
     
     # Test whoami endpoint for production mode verification
     try:
-        response = requests.get(f"{INTERNAL_URL}/api/whoami", timeout=30)
+        response = client.whoami()
         if response.status_code == 200:
             data = response.json()
             app_mode = data.get('app_mode')
@@ -183,7 +190,7 @@ def test_api_endpoints_comprehensive():
     # Test Health Check
     try:
         print("Testing Health Check (/api/health/app)...")
-        response = requests.get(f"{INTERNAL_URL}/api/health/app", timeout=30)
+        response = client.health()
         print(f"Health Check Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -212,12 +219,7 @@ def test_api_endpoints_comprehensive():
             "activity_level": "moderate"
         }
         
-        response = requests.post(
-            f"{INTERNAL_URL}/api/tools/tdee",
-            json=test_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.tdee(test_data)
         
         print(f"TDEE Status: {response.status_code}")
         
@@ -242,11 +244,7 @@ def test_api_endpoints_comprehensive():
         print("\nTesting Menu Scanner (/api/menu/scan) - FormData handling...")
         test_image = create_realistic_test_image()
         if test_image:
-            files = {
-                'image': ('indian_menu.png', test_image, 'image/png')
-            }
-            
-            response = requests.post(f"{INTERNAL_URL}/api/menu/scan", files=files, timeout=60)
+            response = client.menu_scan(test_image, 'indian_menu.png', 'image/png')
             print(f"Menu Scanner Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -280,11 +278,7 @@ def test_api_endpoints_comprehensive():
         print("\nTesting Meal Analyzer (/api/food/analyze) - FormData handling...")
         test_image = create_realistic_test_image()
         if test_image:
-            files = {
-                'image': ('meal_photo.jpg', test_image, 'image/jpeg')
-            }
-            
-            response = requests.post(f"{INTERNAL_URL}/api/food/analyze", files=files, timeout=60)
+            response = client.food_analyze(test_image, 'meal_photo.jpg', 'image/jpeg')
             print(f"Meal Analyzer Status: {response.status_code}")
             
             if response.status_code == 200:
@@ -326,12 +320,7 @@ def test_api_endpoints_comprehensive():
             }
         }
         
-        response = requests.post(
-            f"{INTERNAL_URL}/api/coach/ask",
-            json=test_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=60
-        )
+        response = client.coach_ask(test_data["message"], profile=test_data["profile"])
         
         print(f"Coach Chat Status: {response.status_code}")
         
@@ -369,12 +358,7 @@ def test_api_endpoints_comprehensive():
             "model": "aura-asteria-en"
         }
         
-        response = requests.post(
-            f"{INTERNAL_URL}/api/tts",
-            json=test_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.tts(test_data["text"], model=test_data["model"])
         
         print(f"TTS Status: {response.status_code}")
         
@@ -405,12 +389,7 @@ def test_api_endpoints_comprehensive():
         print("\nTesting STT Endpoint (/api/stt) - Deepgram integration...")
         test_audio_data = b'\x1a\x45\xdf\xa3'  # Minimal WebM header
         
-        response = requests.post(
-            f"{INTERNAL_URL}/api/stt",
-            data=test_audio_data,
-            headers={'Content-Type': 'audio/webm'},
-            timeout=30
-        )
+        response = client.stt(test_audio_data, 'audio/webm')
         
         print(f"STT Status: {response.status_code}")
         
@@ -448,7 +427,7 @@ def test_api_endpoints_comprehensive():
     # Test Whoami endpoint (production mode verification)
     try:
         print("\nTesting Whoami Endpoint (/api/whoami) - production mode verification...")
-        response = requests.get(f"{INTERNAL_URL}/api/whoami", timeout=30)
+        response = client.whoami()
         print(f"Whoami Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -491,12 +470,7 @@ def test_error_handling_edge_cases():
         print("Testing malformed requests...")
         
         # Test TDEE with invalid data
-        response = requests.post(
-            f"{INTERNAL_URL}/api/tools/tdee",
-            json={"invalid": "data"},
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.tdee({"invalid": "data"})
         
         if response.status_code == 400:
             print("✅ PASS: Malformed TDEE request properly rejected")
@@ -512,7 +486,7 @@ def test_error_handling_edge_cases():
     try:
         print("Testing empty FormData uploads...")
         
-        response = requests.post(f"{INTERNAL_URL}/api/menu/scan", timeout=30)
+        response = client.menu_scan(None, timeout=30)
         
         if response.status_code == 400:
             print("✅ PASS: Empty FormData upload properly rejected")
@@ -552,12 +526,7 @@ def test_security_authentication():
             "message": "Test message without auth"
         }
         
-        response = requests.post(
-            f"{INTERNAL_URL}/api/coach/ask",
-            json=test_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.coach_ask(test_data["message"], timeout=30)
         
         if response.status_code == 401:
             print("✅ PASS: Coach chat requires authentication")
@@ -586,12 +555,7 @@ def test_security_authentication():
             "activity_level": "malicious_input"
         }
         
-        response = requests.post(
-            f"{INTERNAL_URL}/api/tools/tdee",
-            json=malicious_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.tdee(malicious_data)
         
         if response.status_code == 400:
             print("✅ PASS: Input validation properly rejects malicious data")
@@ -617,12 +581,10 @@ def test_performance_reliability():
     try:
         print("Testing response times under 3 seconds...")
         
-        start_time = time.time()
-        response = requests.get(f"{INTERNAL_URL}/api/health/app", timeout=30)
-        end_time = time.time()
-        
-        response_time = end_time - start_time
+        response = client.health()
+        response_time = response.timings.total
         print(f"Health check response time: {response_time:.2f} seconds")
+        print(f"Phase breakdown (ms): {response.timings.as_ms()}")
         
         if response_time < 3.0:
             print("✅ PASS: Response time under 3 seconds")
@@ -634,48 +596,33 @@ def test_performance_reliability():
         print(f"❌ FAIL: Response time test error - {e}")
         results['response_time'] = False
     
-    # Test concurrent request handling
+    # Test sustained load with the open-loop load engine
     try:
-        print("Testing concurrent request handling...")
-        
-        import threading
-        import queue
-        
-        def make_request(result_queue):
-            try:
-                response = requests.get(f"{INTERNAL_URL}/api/health/app", timeout=30)
-                result_queue.put(response.status_code == 200)
-            except:
-                result_queue.put(False)
-        
-        result_queue = queue.Queue()
-        threads = []
-        
-        # Make 5 concurrent requests
-        for i in range(5):
-            thread = threading.Thread(target=make_request, args=(result_queue,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-        
-        # Check results
-        successful_requests = 0
-        while not result_queue.empty():
-            if result_queue.get():
-                successful_requests += 1
-        
-        if successful_requests >= 4:  # Allow 1 failure
-            print(f"✅ PASS: Concurrent requests handled ({successful_requests}/5 successful)")
-            results['concurrent_requests'] = True
+        print("Testing sustained load on /api/health/app (open loop, 10 rps for 5s)...")
+        
+        config = LoadConfig(
+            base_url=INTERNAL_URL,
+            rate=10,
+            duration=5,
+            concurrency=10,
+            mix=parse_mix("health=1"),
+            timeout=30
+        )
+        report = asyncio.run(run_load(config))
+        print(format_report(report))
+        
+        total = report.summary()['total']
+        error_rate = total['failed'] / total['sent'] if total['sent'] else 1.0
+        
+        if error_rate <= 0.01 and total['p99_ms'] < 3000:
+            print(f"✅ PASS: Sustained load handled ({total['ok']}/{total['sent']} ok, p99 {total['p99_ms']:.0f}ms)")
+            results['sustained_load'] = True
         else:
-            print(f"❌ FAIL: Concurrent request handling poor ({successful_requests}/5 successful)")
-            results['concurrent_requests'] = False
+            print(f"❌ FAIL: Sustained load degraded ({total['ok']}/{total['sent']} ok, p99 {total['p99_ms']:.0f}ms)")
+            results['sustained_load'] = False
     except Exception as e:
-        print(f"❌ FAIL: Concurrent request test error - {e}")
-        results['concurrent_requests'] = False
+        print(f"❌ FAIL: Sustained load test error - {e}")
+        results['sustained_load'] = False
     
     return all(results.values())
 
@@ -691,7 +638,7 @@ def test_external_infrastructure():
     try:
         print(f"Testing external URL access: {EXTERNAL_URL}")
         
-        response = requests.get(f"{EXTERNAL_URL}/api/health/app", timeout=30)
+        response = external_client.health()
         print(f"External health check status: {response.status_code}")
         
         if response.status_code == 200:
@@ -3,14 +3,18 @@
 Critical Fixes Testing - Focus on Menu Scanner and Meal Photo Analyzer
 """
 
-import requests
 import json
 import io
 from PIL import Image
 import time
 
+from fitbear_client import FitbearClient
+
 BASE_URL = "http://localhost:3000/api"
 
+# Shared keep-alive session: processing times below exclude TCP/TLS setup
+client = FitbearClient(BASE_URL, timeout=90)
+
 def create_test_image():
     """Create a simple test image"""
     try:
@@ -33,15 +37,9 @@ def test_menu_scanner_critical():
         if not test_image:
             return False
         
-        files = {'image': ('menu.png', test_image, 'image/png')}
-        
         print("Testing Menu Scanner with Gemini Vision...")
-        start_time = time.time()
-        
-        response = requests.post(f"{BASE_URL}/menu/scan", files=files, timeout=90)
-        
-        end_time = time.time()
-        processing_time = end_time - start_time
+        response = client.menu_scan(test_image, 'menu.png', 'image/png')
+        processing_time = response.timings.total
         
         print(f"Status Code: {response.status_code}")
         print(f"Processing Time: {processing_time:.2f} seconds")
@@ -83,15 +81,9 @@ def test_meal_photo_analyzer_critical():
         if not test_image:
             return False
         
-        files = {'image': ('meal.jpg', test_image, 'image/jpeg')}
-        
         print("Testing Meal Photo Analyzer...")
-        start_time = time.time()
-        
-        response = requests.post(f"{BASE_URL}/food/analyze", files=files, timeout=90)
-        
-        end_time = time.time()
-        processing_time = end_time - start_time
+        response = client.food_analyze(test_image, 'meal.jpg', 'image/jpeg')
+        processing_time = response.timings.total
         
         print(f"Status Code: {response.status_code}")
         print(f"Processing Time: {processing_time:.2f} seconds")
@@ -133,8 +125,7 @@ def test_e2e_flow():
         # Step 1: Menu Scan
         print("Step 1: Menu Scan...")
         test_image = create_test_image()
-        files = {'image': ('menu.png', test_image, 'image/png')}
-        response = requests.post(f"{BASE_URL}/menu/scan", files=files, timeout=60)
+        response = client.menu_scan(test_image, 'menu.png', 'image/png', timeout=60)
         
         if response.status_code != 200:
             print("❌ Menu scan failed")
@@ -146,8 +137,7 @@ def test_e2e_flow():
         
         # Step 2: Meal Photo Analysis
         print("Step 2: Meal Photo Analysis...")
-        files = {'image': ('meal.jpg', test_image, 'image/jpeg')}
-        response = requests.post(f"{BASE_URL}/food/analyze", files=files, timeout=60)
+        response = client.food_analyze(test_image, 'meal.jpg', 'image/jpeg', timeout=60)
         
         if response.status_code != 200:
             print("❌ Meal analysis failed")
@@ -166,12 +156,7 @@ def test_e2e_flow():
             "idempotency_key": f"e2e_test_{int(time.time())}"
         }
         
-        response = requests.post(
-            f"{BASE_URL}/logs",
-            json=log_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.create_log(log_data, timeout=30)
         
         if response.status_code != 200:
             print("❌ Food logging failed")
@@ -182,7 +167,7 @@ def test_e2e_flow():
         
         # Step 4: View History
         print("Step 4: View History...")
-        response = requests.get(f"{BASE_URL}/logs", timeout=30)
+        response = client.list_logs(timeout=30)
         
         if response.status_code != 200:
             print("❌ History retrieval failed")
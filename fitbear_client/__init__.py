@@ -0,0 +1,15 @@
+"""
+Shared pooled client used by the Fitbear AI backend test scripts.
+"""
+
+from fitbear_client.client import DEFAULT_BASE_URL, FitbearClient, build_retry
+from fitbear_client.timing import PhaseTimings, TimedHTTPAdapter, parse_server_timing
+
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "FitbearClient",
+    "PhaseTimings",
+    "TimedHTTPAdapter",
+    "build_retry",
+    "parse_server_timing",
+]
@@ -0,0 +1,211 @@
+"""
+Pooled HTTP client for the Fitbear AI API.
+
+One keep-alive session is shared by every call so that repeated requests
+reuse the same TCP/TLS connection, and each response carries a
+`.timings` PhaseTimings breakdown (connect, TLS, TTFB, body).
+"""
+
+from typing import Optional
+
+import requests
+from urllib3.util.retry import Retry
+
+from fitbear_client.timing import TimedHTTPAdapter
+
+DEFAULT_BASE_URL = "http://localhost:3000"
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def build_retry(retries: int = 2, backoff: float = 0.5) -> Retry:
+    """Retry connection errors and transient statuses on idempotent methods.
+
+    POSTs are never retried: scans, coach replies and logs are not idempotent.
+    Retry-After is honoured on 429/503.
+    """
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "OPTIONS"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+class FitbearClient:
+    """Typed calls for every /api/* route on top of one pooled session"""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        token: Optional[str] = None,
+        timeout: float = 30,
+        retries: int = 2,
+        backoff: float = 0.5,
+        pool_size: int = 10,
+    ):
+        self.base_url = base_url.rstrip("/")
+        if self.base_url.endswith("/api"):
+            self.base_url = self.base_url[: -len("/api")]
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=build_retry(retries, backoff),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- generic -----------------------------------------------------------
+
+    def url(self, path: str) -> str:
+        """Resolve an /api-relative path; absolute URLs pass through unchanged"""
+        if path.startswith(("http://", "https://")):
+            return path
+        if not path.startswith("/api"):
+            path = "/api" + ("" if not path or path.startswith("/") else "/") + path
+        return self.base_url + path
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    # -- platform ----------------------------------------------------------
+
+    def api_index(self, **kwargs) -> requests.Response:
+        """GET /api"""
+        return self.get("/api", **kwargs)
+
+    def health(self, **kwargs) -> requests.Response:
+        """GET /api/health/app"""
+        return self.get("/api/health/app", **kwargs)
+
+    def whoami(self, **kwargs) -> requests.Response:
+        """GET /api/whoami"""
+        return self.get("/api/whoami", **kwargs)
+
+    def env_test(self, **kwargs) -> requests.Response:
+        """GET /api/env-test"""
+        return self.get("/api/env-test", **kwargs)
+
+    def tdee(self, payload: dict, **kwargs) -> requests.Response:
+        """POST /api/tools/tdee with sex, age, height_cm, weight_kg, activity_level"""
+        return self.post("/api/tools/tdee", json=payload, **kwargs)
+
+    # -- profile & targets -------------------------------------------------
+
+    def get_profile(self, **kwargs) -> requests.Response:
+        """GET /api/me/profile"""
+        return self.get("/api/me/profile", **kwargs)
+
+    def put_profile(self, profile: dict, **kwargs) -> requests.Response:
+        """PUT /api/me/profile"""
+        return self.put("/api/me/profile", json=profile, **kwargs)
+
+    def get_targets(self, date: Optional[str] = None, **kwargs) -> requests.Response:
+        """GET /api/me/targets[?date=YYYY-MM-DD]"""
+        params = {"date": date} if date else None
+        return self.get("/api/me/targets", params=params, **kwargs)
+
+    def put_targets(self, targets: dict, **kwargs) -> requests.Response:
+        """PUT /api/me/targets"""
+        return self.put("/api/me/targets", json=targets, **kwargs)
+
+    def put_targets_bulk(self, payload: dict, **kwargs) -> requests.Response:
+        """PUT /api/me/targets/bulk with ``{"targets": [...]}`` or ``{"from", "to", ...}``"""
+        return self.put("/api/me/targets/bulk", json=payload, **kwargs)
+
+    # -- vision ------------------------------------------------------------
+
+    def menu_scan(
+        self,
+        image: Optional[bytes],
+        filename: str = "menu.png",
+        content_type: str = "image/png",
+        **kwargs,
+    ) -> requests.Response:
+        """POST /api/menu/scan as multipart form data (image=None sends no body)"""
+        files = {"image": (filename, image, content_type)} if image is not None else None
+        kwargs.setdefault("timeout", max(self.timeout, 60))
+        return self.post("/api/menu/scan", files=files, **kwargs)
+
+    def food_analyze(
+        self,
+        image: Optional[bytes],
+        filename: str = "meal.jpg",
+        content_type: str = "image/jpeg",
+        **kwargs,
+    ) -> requests.Response:
+        """POST /api/food/analyze as multipart form data"""
+        files = {"image": (filename, image, content_type)} if image is not None else None
+        kwargs.setdefault("timeout", max(self.timeout, 60))
+        return self.post("/api/food/analyze", files=files, **kwargs)
+
+    # -- coach & voice -----------------------------------------------------
+
+    def coach_ask(
+        self,
+        message: str,
+        profile: Optional[dict] = None,
+        recent_logs: Optional[list] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """POST /api/coach/ask"""
+        payload = {"message": message}
+        if profile is not None:
+            payload["profile"] = profile
+        if recent_logs is not None:
+            payload["recent_logs"] = recent_logs
+        kwargs.setdefault("timeout", max(self.timeout, 60))
+        return self.post("/api/coach/ask", json=payload, **kwargs)
+
+    def tts(self, text: str, model: Optional[str] = None, **kwargs) -> requests.Response:
+        """POST /api/tts; returns audio/mpeg on success"""
+        payload = {"text": text}
+        if model:
+            payload["model"] = model
+        return self.post("/api/tts", json=payload, **kwargs)
+
+    def stt(self, audio: bytes, content_type: str = "audio/webm", **kwargs) -> requests.Response:
+        """POST /api/stt with a raw audio body"""
+        headers = {"Content-Type": content_type, **kwargs.pop("headers", {})}
+        return self.post("/api/stt", data=audio, headers=headers, **kwargs)
+
+    # -- logs --------------------------------------------------------------
+
+    def create_log(self, entry: dict, **kwargs) -> requests.Response:
+        """POST /api/logs"""
+        return self.post("/api/logs", json=entry, **kwargs)
+
+    def create_logs_batch(self, entries: list, **kwargs) -> requests.Response:
+        """POST /api/logs/batch; the response has a status per entry"""
+        return self.post("/api/logs/batch", json={"entries": entries}, **kwargs)
+
+    def list_logs(self, **kwargs) -> requests.Response:
+        """GET /api/logs"""
+        return self.get("/api/logs", **kwargs)
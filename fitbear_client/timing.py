@@ -0,0 +1,134 @@
+"""
+Per-phase request timing for a pooled requests session.
+
+urllib3 connection and pool classes are subclassed so that a new connection
+records how long the TCP connect and the TLS handshake took, and every
+request records when the response headers arrived. A reused keep-alive
+connection reports zero connect/TLS time, which is the point: the numbers
+left over describe the server, not the handshake.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_current = threading.local()
+
+
+@dataclass
+class PhaseTimings:
+    """Seconds spent in each phase of one request"""
+    connect: float = 0.0
+    tls: float = 0.0
+    ttfb: float = 0.0
+    body: float = 0.0
+    total: float = 0.0
+    reused: bool = True
+
+    def as_ms(self):
+        return {
+            key: (round(value * 1000, 2) if isinstance(value, float) else value)
+            for key, value in asdict(self).items()
+        }
+
+
+def parse_server_timing(value):
+    """Parse a Server-Timing header into {metric: milliseconds}.
+
+    Metrics without a dur parameter are reported as 0.0; repeated metrics
+    are summed.
+    """
+    phases = {}
+    for metric in filter(None, (m.strip() for m in (value or "").split(","))):
+        name, *params = (p.strip() for p in metric.split(";"))
+        duration = 0.0
+        for param in params:
+            key, _, raw = param.partition("=")
+            if key.strip().lower() == "dur":
+                try:
+                    duration = float(raw.strip().strip('"'))
+                except ValueError:
+                    pass
+        phases[name] = phases.get(name, 0.0) + duration
+    return phases
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        started = time.perf_counter()
+        sock = super()._new_conn()
+        record = getattr(_current, "record", None)
+        if record is not None:
+            record["tcp_done"] = time.perf_counter()
+            record["tcp"] = record["tcp_done"] - started
+        return sock
+
+    def connect(self):
+        super().connect()
+        record = getattr(_current, "record", None)
+        if record is not None:
+            record["connected"] = time.perf_counter()
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        record = getattr(_current, "record", None)
+        if record is not None:
+            record["headers"] = time.perf_counter()
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that attaches client-side PhaseTimings to every response as
+    `.timings` and the server's own Server-Timing phases as `.server_timing`"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        record = {}
+        _current.record = record
+        started = time.perf_counter()
+        try:
+            response = super().send(request, stream=True, **kwargs)
+        finally:
+            _current.record = None
+
+        headers_at = record.get("headers", time.perf_counter())
+        timings = PhaseTimings(reused="tcp" not in record)
+        if not timings.reused:
+            timings.connect = record["tcp"]
+            timings.tls = max(0.0, record.get("connected", record["tcp_done"]) - record["tcp_done"])
+        timings.ttfb = max(0.0, headers_at - started - timings.connect - timings.tls)
+
+        if not stream:
+            body_started = time.perf_counter()
+            response.content  # read the body now so its transfer time is measured
+            timings.body = time.perf_counter() - body_started
+        timings.total = time.perf_counter() - started
+        response.timings = timings
+        response.server_timing = parse_server_timing(response.headers.get("Server-Timing"))
+        return response
@@ -1,35 +1,275 @@
 // lib/auth.ts
+// Supabase access-token verification shared by every authenticated API route.
+//
+// Tokens are verified locally whenever possible: HS256 against the project's
+// JWT secret (SUPABASE_JWT_SECRET, plus SUPABASE_JWT_SECRET_PREVIOUS while a
+// secret is being rotated) and ES256/RS256 against the project's JWKS, which
+// is cached and re-fetched when a token names a key id we have not seen.
+// Locally verified tokens must also be a signed-in user's session: audience
+// and role 'authenticated', unexpired.
+// Verified tokens are kept in a bounded LRU until they expire. Only a token
+// that cannot be checked locally (no secret configured, unknown key, JWKS
+// unreachable) costs a round trip to GET /auth/v1/user.
+import { createHmac, createPublicKey, timingSafeEqual, verify, KeyObject } from 'crypto';
 import { NextRequest } from 'next/server';
+import { supabaseAuthUrl } from './upstreams';
 
-export async function requireUser(req: NextRequest) {
-  // 1) Try bearer token
-  const auth = req.headers.get('authorization');
-  if (auth?.startsWith('Bearer ')) {
-    const token = auth.slice('Bearer '.length);
-    
-    // Check if Supabase environment variables are available
-    const supabaseUrl = process.env.SUPABASE_URL || process.env.NEXT_PUBLIC_SUPABASE_URL;
-    const supabaseAnonKey = process.env.SUPABASE_ANON_KEY || process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY;
-    
-    if (!supabaseUrl || !supabaseAnonKey) {
-      console.warn('Supabase environment variables not configured');
-      throw Object.assign(new Error('Authentication service not configured'), { status: 500 });
-    }
-    
-    // Verify token via Supabase Auth API
-    const url = `${supabaseUrl}/auth/v1/user`;
-    const res = await fetch(url, {
-      headers: { 
-        Authorization: `Bearer ${token}`, 
-        apikey: supabaseAnonKey 
+export type AuthUser = {
+  id: string;
+  email?: string;
+  phone?: string;
+  role?: string;
+  aud?: string | string[];
+  app_metadata?: Record<string, any>;
+  user_metadata?: Record<string, any>;
+};
+
+const CACHE_SIZE = Number(process.env.AUTH_CACHE_SIZE || 1000);
+const JWKS_TTL_MS = Number(process.env.AUTH_JWKS_TTL_MS || 10 * 60 * 1000);
+const JWKS_REFETCH_MS = 30 * 1000; // at most one unknown-kid refetch per 30s
+const REMOTE_CACHE_MS = 60 * 1000; // cap for tokens verified remotely without a readable exp
+const CLOCK_SKEW_S = 5;
+
+const stats = { hits: 0, local: 0, remote: 0, rejected: 0 };
+
+// -- config -------------------------------------------------------------------
+
+function supabaseConfig() {
+  return {
+    url: process.env.SUPABASE_URL || process.env.NEXT_PUBLIC_SUPABASE_URL,
+    anonKey: process.env.SUPABASE_ANON_KEY || process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY,
+    secrets: [process.env.SUPABASE_JWT_SECRET, process.env.SUPABASE_JWT_SECRET_PREVIOUS]
+      .filter((s): s is string => !!s),
+  };
+}
+
+// -- verified-token LRU -------------------------------------------------------
+
+type CacheEntry = { user: AuthUser; expiresAt: number };
+const verified = new Map<string, CacheEntry>();
+
+function cacheGet(token: string): AuthUser | null {
+  const entry = verified.get(token);
+  if (!entry) return null;
+  verified.delete(token);
+  if (entry.expiresAt <= Date.now()) return null;
+  verified.set(token, entry); // move to most-recently-used
+  return entry.user;
+}
+
+function cacheSet(token: string, user: AuthUser, expiresAt: number) {
+  verified.delete(token);
+  verified.set(token, { user, expiresAt });
+  while (verified.size > CACHE_SIZE) {
+    verified.delete(verified.keys().next().value as string);
+  }
+}
+
+// -- JWT decoding -------------------------------------------------------------
+
+type DecodedJwt = {
+  header: { alg?: string; kid?: string };
+  payload: Record<string, any>;
+  signingInput: Buffer;
+  signature: Buffer;
+};
+
+function decodeJwt(token: string): DecodedJwt | null {
+  const parts = token.split('.');
+  if (parts.length !== 3) return null;
+  try {
+    return {
+      header: JSON.parse(Buffer.from(parts[0], 'base64url').toString('utf8')),
+      payload: JSON.parse(Buffer.from(parts[1], 'base64url').toString('utf8')),
+      signingInput: Buffer.from(`${parts[0]}.${parts[1]}`),
+      signature: Buffer.from(parts[2], 'base64url'),
+    };
+  } catch {
+    return null;
+  }
+}
+
+function userFromClaims(claims: Record<string, any>): AuthUser {
+  return {
+    id: claims.sub,
+    email: claims.email,
+    phone: claims.phone,
+    role: claims.role,
+    aud: claims.aud,
+    app_metadata: claims.app_metadata,
+    user_metadata: claims.user_metadata,
+  };
+}
+
+// Supabase signs anon and service_role keys with the same secret as user
+// sessions; only a signed-in user's access token may act as that user
+const AUDIENCE = 'authenticated';
+const ROLE = 'authenticated';
+
+function claimsValid(claims: Record<string, any>): boolean {
+  const now = Date.now() / 1000;
+  if (typeof claims.sub !== 'string' || !claims.sub) return false;
+  const aud = Array.isArray(claims.aud) ? claims.aud : [claims.aud];
+  if (!aud.includes(AUDIENCE)) return false;
+  if (claims.role !== ROLE) return false;
+  if (typeof claims.exp !== 'number' || claims.exp <= now - CLOCK_SKEW_S) return false;
+  if (typeof claims.nbf === 'number' && claims.nbf > now + CLOCK_SKEW_S) return false;
+  return true;
+}
+
+// -- JWKS ---------------------------------------------------------------------
+
+let jwks: { keys: Map<string, KeyObject>; fetchedAt: number } | null = null;
+let jwksInflight: Promise<void> | null = null;
+
+function refreshJwks(projectUrl: string): Promise<void> {
+  if (!jwksInflight) {
+    jwksInflight = (async () => {
+      const res = await fetch(`${supabaseAuthUrl(projectUrl)}/.well-known/jwks.json`);
+      if (!res.ok) throw new Error(`JWKS fetch failed: ${res.status}`);
+      const body = await res.json();
+      const keys = new Map<string, KeyObject>();
+      for (const jwk of body.keys || []) {
+        if (!jwk.kid) continue;
+        try {
+          keys.set(jwk.kid, createPublicKey({ key: jwk, format: 'jwk' }));
+        } catch (error) {
+          console.warn('Skipping unusable JWKS key', jwk.kid, error);
+        }
       }
+      jwks = { keys, fetchedAt: Date.now() };
+    })().finally(() => { jwksInflight = null; });
+  }
+  return jwksInflight;
+}
+
+async function signingKey(kid: string, projectUrl: string): Promise<KeyObject | null> {
+  const age = jwks ? Date.now() - jwks.fetchedAt : Infinity;
+  const known = jwks?.keys.get(kid);
+  if (known && age < JWKS_TTL_MS) return known;
+  // Unknown kid usually means the project rotated keys; refetch, but rate-limited
+  if (!known && age < JWKS_REFETCH_MS) return null;
+  try {
+    await refreshJwks(projectUrl);
+  } catch (error) {
+    console.warn('JWKS refresh failed:', error);
+    return known || null; // keep serving the last good key set
+  }
+  return jwks?.keys.get(kid) || null;
+}
+
+// -- verification ---------------------------------------------------------------
+
+type LocalResult = { user: AuthUser; exp: number } | 'invalid' | 'unverifiable';
+
+async function verifyLocally(decoded: DecodedJwt, projectUrl?: string): Promise<LocalResult> {
+  const { header, payload, signingInput, signature } = decoded;
+  let signed: boolean;
+
+  if (header.alg === 'HS256') {
+    const { secrets } = supabaseConfig();
+    if (!secrets.length) return 'unverifiable';
+    signed = secrets.some((secret) => {
+      const expected = createHmac('sha256', secret).update(signingInput).digest();
+      return expected.length === signature.length && timingSafeEqual(expected, signature);
     });
-    if (res.ok) {
-      const user = await res.json();
-      return { user };
+  } else if ((header.alg === 'ES256' || header.alg === 'RS256') && header.kid && projectUrl) {
+    const key = await signingKey(header.kid, projectUrl);
+    if (!key) return 'unverifiable';
+    signed = header.alg === 'ES256'
+      ? verify('sha256', signingInput, { key, dsaEncoding: 'ieee-p1363' }, signature)
+      : verify('sha256', signingInput, key, signature);
+  } else {
+    return 'unverifiable';
+  }
+
+  if (!signed || !claimsValid(payload)) return 'invalid';
+  return { user: userFromClaims(payload), exp: payload.exp };
+}
+
+async function verifyRemotely(token: string, projectUrl: string, anonKey: string): Promise<AuthUser | null> {
+  const res = await fetch(`${supabaseAuthUrl(projectUrl)}/user`, {
+    headers: {
+      Authorization: `Bearer ${token}`,
+      apikey: anonKey
+    }
+  });
+  return res.ok ? await res.json() : null;
+}
+
+/** Verify a Supabase access token; resolves to the user or null */
+export async function verifyAccessToken(token: string): Promise<AuthUser | null> {
+  if (!token) return null;
+
+  const cached = cacheGet(token);
+  if (cached) {
+    stats.hits++;
+    return cached;
+  }
+
+  const { url, anonKey } = supabaseConfig();
+  const decoded = decodeJwt(token);
+
+  if (decoded) {
+    const local = await verifyLocally(decoded, url);
+    if (local === 'invalid') {
+      stats.rejected++;
+      return null;
+    }
+    if (local !== 'unverifiable') {
+      stats.local++;
+      cacheSet(token, local.user, local.exp * 1000);
+      return local.user;
+    }
+  }
+
+  if (!url || !anonKey) {
+    console.error('Supabase environment variables not configured');
+    return null;
+  }
+
+  try {
+    const user = await verifyRemotely(token, url, anonKey);
+    if (!user) {
+      stats.rejected++;
+      return null;
     }
+    stats.remote++;
+    const exp = typeof decoded?.payload.exp === 'number' ? decoded.payload.exp * 1000 : 0;
+    cacheSet(token, user, exp || Date.now() + REMOTE_CACHE_MS);
+    return user;
+  } catch (error) {
+    console.error('Token verification error:', error);
+    return null;
   }
-  
-  // 2) If you already had SSR cookie flow, keep it as a fallback (optional).
+}
+
+export function bearerToken(req: Request): string {
+  const auth = req.headers.get('authorization') || '';
+  return auth.startsWith('Bearer ') ? auth.slice('Bearer '.length) : '';
+}
+
+/** The authenticated user for a request, or null when the bearer token is missing or invalid */
+export async function getUserFromRequest(req: Request): Promise<AuthUser | null> {
+  return verifyAccessToken(bearerToken(req));
+}
+
+export async function requireUser(req: NextRequest) {
+  const { url, secrets } = supabaseConfig();
+  if (!url && !secrets.length) {
+    console.warn('Supabase environment variables not configured');
+    throw Object.assign(new Error('Authentication service not configured'), { status: 500 });
+  }
+
+  const user = await getUserFromRequest(req);
+  if (user) {
+    return { user };
+  }
+
   throw Object.assign(new Error('Unauthorized'), { status: 401 });
-}
\ No newline at end of file
+}
+
+/** Verification counters and LRU size, for diagnostics */
+export function authCacheStats() {
+  return { ...stats, cached: verified.size };
+}
@@ -0,0 +1,73 @@
+// lib/cache.ts
+// Small in-process LRU with per-entry TTL and entry/byte bounds. Map keeps
+// insertion order, so re-inserting on read makes the first key the least
+// recently used one.
+
+export type LruOptions<V> = {
+  maxEntries: number;
+  maxBytes?: number;
+  ttlMs?: number;
+  sizeOf?: (value: V) => number;
+  onEvict?: (key: string, value: V) => void; // capacity evictions only
+};
+
+type Entry<V> = { value: V; size: number; expiresAt: number };
+
+export class LruCache<V> {
+  private entries = new Map<string, Entry<V>>();
+  private bytes = 0;
+  readonly stats = { hits: 0, misses: 0, evictions: 0 };
+
+  constructor(private options: LruOptions<V>) {}
+
+  get size() {
+    return this.entries.size;
+  }
+
+  get totalBytes() {
+    return this.bytes;
+  }
+
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry || entry.expiresAt <= Date.now()) {
+      if (entry) this.remove(key, entry);
+      this.stats.misses++;
+      return undefined;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.stats.hits++;
+    return entry.value;
+  }
+
+  /** Returns false when the value alone exceeds maxBytes and was not stored */
+  set(key: string, value: V, ttlMs = this.options.ttlMs): boolean {
+    const existing = this.entries.get(key);
+    if (existing) this.remove(key, existing);
+
+    const size = this.options.sizeOf ? this.options.sizeOf(value) : 0;
+    const { maxBytes } = this.options;
+    if (maxBytes && size > maxBytes) return false; // would evict everything else
+
+    this.entries.set(key, { value, size, expiresAt: ttlMs ? Date.now() + ttlMs : Infinity });
+    this.bytes += size;
+    while (this.entries.size > this.options.maxEntries || (maxBytes && this.bytes > maxBytes)) {
+      const [oldestKey, oldest] = this.entries.entries().next().value as [string, Entry<V>];
+      this.remove(oldestKey, oldest);
+      this.stats.evictions++;
+      this.options.onEvict?.(oldestKey, oldest.value);
+    }
+    return true;
+  }
+
+  delete(key: string) {
+    const entry = this.entries.get(key);
+    if (entry) this.remove(key, entry);
+  }
+
+  private remove(key: string, entry: Entry<V>) {
+    this.entries.delete(key);
+    this.bytes -= entry.size;
+  }
+}
@@ -0,0 +1,285 @@
+// lib/dish-matcher.ts
+// Finds known dishes in OCR'd menu text. Every dish name and synonym
+// (Latin or Devanagari) is normalised with normalizeTerm and compiled into
+// one Aho-Corasick automaton, so the whole text is scanned in a single pass
+// however large the catalog is. Matches must start and end on word
+// boundaries ("rice" never matches inside "price"); where matches overlap,
+// the leftmost and then longest wins ("masala dosa" over "dosa").
+//
+// Each match carries its span in the original text and the nearest price on
+// the same line: the first one after the dish, else the last one before it.
+//
+// matchDishes() compiles the automaton from the shared food catalog once
+// per catalog change; DishMatcher.compile() serves fixed dictionaries.
+import type { FoodItem } from './repos/types';
+import { repositories } from './repos';
+import { asciiDigits, catalogFor, normalizeTerm } from './food-catalog';
+
+export type DishTerm = { food_id: string; term: string; weight?: number };
+
+export type DishMatch = {
+  food_id: string;
+  term: string;   // the dictionary term that matched
+  text: string;   // as written in the OCR text
+  start: number;  // offsets into the OCR text
+  end: number;
+  line: number;   // zero-based
+  price: number | null;
+};
+
+// Characters that can be part of a word: ASCII and Latin-1/Extended-A/B
+// letters, combining accents, Devanagari except the danda and double danda
+// (sentence punctuation), and zero-width joiners
+const WORD_CHAR = /[0-9A-Za-z\u00c0-\u024f\u0300-\u036f\u0900-\u0963\u0966-\u097f\u200c\u200d]/;
+const NUMBER = /[0-9]+(?:\.[0-9]{1,2})?/g;
+// A number followed by one of these is a quantity, not a price
+const UNIT = /^\s*(?:ml|gms?|g|kgs?|ltrs?|l|pcs?|pieces?|plates?|nos?|%|inch|")(?![a-z])/i;
+// Currency written straight before the number: "Rs250", "Rs.250", "INR250"
+const CURRENCY = /(?:^|[^A-Za-z])(?:rs|inr)\.?$/i;
+const MAX_PRICE = 100000;
+
+type Word = { start: number; end: number; at: number; length: number }; // `at`/`length` in the normalised text
+type Price = { value: number; start: number; end: number; line: number };
+
+/** Word tokens of `text` and their normalised form joined by single spaces */
+function tokenize(text: string) {
+  const words: Word[] = [];
+  // Menus repeat words (chicken, paneer, half/full), and folding is the
+  // costliest step of a scan
+  const folded = new Map<string, string>();
+  let normalized = '';
+  let start = -1;
+  for (let i = 0; i <= text.length; i++) {
+    if (i < text.length && WORD_CHAR.test(text[i])) {
+      if (start === -1) start = i;
+      continue;
+    }
+    if (start !== -1) {
+      const word = text.slice(start, i);
+      let norm = folded.get(word);
+      if (norm === undefined) {
+        norm = normalizeTerm(word);
+        folded.set(word, norm);
+      }
+      if (norm) {
+        if (normalized) normalized += ' ';
+        words.push({ start, end: i, at: normalized.length, length: norm.length });
+        normalized += norm;
+      }
+      start = -1;
+    }
+  }
+  return { words, normalized };
+}
+
+function lineStarts(text: string): number[] {
+  const starts = [0];
+  for (let i = text.indexOf('\n'); i !== -1; i = text.indexOf('\n', i + 1)) starts.push(i + 1);
+  return starts;
+}
+
+/** Index of the last element <= value in a sorted array */
+function floorIndex(sorted: number[], value: number): number {
+  let lo = 0;
+  let hi = sorted.length - 1;
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1;
+    if (sorted[mid] <= value) lo = mid;
+    else hi = mid - 1;
+  }
+  return lo;
+}
+
+function findPrices(original: string, lines: number[]): Price[] {
+  // Same length, so offsets still index the original text
+  const text = asciiDigits(original);
+  const prices: Price[] = [];
+  NUMBER.lastIndex = 0;
+  let match: RegExpExecArray | null;
+  while ((match = NUMBER.exec(text))) {
+    const start = match.index;
+    const end = start + match[0].length;
+    // Digits glued to a letter ("B12", "65A") are names or codes, not prices,
+    // unless the letters are a currency ("Rs250", "INR250"). A dot joins the
+    // number only after a digit, so "Rs.250", "₹250" and "Tikka.....250" count.
+    const before = text[start - 1] || '';
+    if (/[0-9]/.test(before) || (before === '.' && /[0-9]/.test(text[start - 2] || ''))) continue;
+    if (/[A-Za-z]/.test(before) && !CURRENCY.test(text.slice(Math.max(0, start - 5), start))) continue;
+    if (/[A-Za-z]/.test(text[end] || '') || UNIT.test(text.slice(end, end + 8))) continue;
+    const value = Number(match[0]);
+    if (value <= 0 || value >= MAX_PRICE) continue;
+    prices.push({ value, start, end, line: floorIndex(lines, start) });
+  }
+  return prices;
+}
+
+export class DishMatcher {
+  // Trie over normalised terms: goto edges, failure links, and the pattern
+  // ending at each node plus a link to the next node whose pattern is a suffix
+  private edges: Map<string, number>[] = [new Map()];
+  private fail: number[] = [0];
+  private output: number[] = [-1];
+  private outputLink: number[] = [-1];
+  private patterns: { norm: string; food_id: string; term: string; weight: number }[] = [];
+
+  static compile(terms: DishTerm[]): DishMatcher {
+    const matcher = new DishMatcher();
+    const byNorm = new Map<string, number>();
+    terms.forEach(({ food_id, term, weight = 100 }) => {
+      const norm = normalizeTerm(term);
+      if (!norm) return;
+      const existing = byNorm.get(norm);
+      if (existing === undefined) {
+        byNorm.set(norm, matcher.patterns.push({ norm, food_id, term, weight }) - 1);
+      } else if (weight > matcher.patterns[existing].weight) {
+        // The same spelling for several dishes goes to the strongest synonym
+        matcher.patterns[existing] = { norm, food_id, term, weight };
+      }
+    });
+    matcher.patterns.forEach((pattern, id) => matcher.insert(pattern.norm, id));
+    matcher.link();
+    return matcher;
+  }
+
+  get size() {
+    return this.patterns.length;
+  }
+
+  private insert(norm: string, id: number) {
+    let node = 0;
+    for (const char of norm.split('')) {
+      let next = this.edges[node].get(char);
+      if (next === undefined) {
+        next = this.edges.push(new Map()) - 1;
+        this.fail.push(0);
+        this.output.push(-1);
+        this.outputLink.push(-1);
+        this.edges[node].set(char, next);
+      }
+      node = next;
+    }
+    this.output[node] = id;
+  }
+
+  /** Breadth-first failure and output links */
+  private link() {
+    const queue: number[] = [];
+    this.edges[0].forEach(child => queue.push(child));
+    for (let head = 0; head < queue.length; head++) {
+      const node = queue[head];
+      this.edges[node].forEach((child, char) => {
+        let fallback = this.fail[node];
+        while (fallback !== 0 && !this.edges[fallback].has(char)) fallback = this.fail[fallback];
+        const target = this.edges[fallback].get(char);
+        this.fail[child] = target !== undefined && target !== child ? target : 0;
+        const suffix = this.fail[child];
+        this.outputLink[child] = this.output[suffix] !== -1 ? suffix : this.outputLink[suffix];
+        queue.push(child);
+      });
+    }
+  }
+
+  scan(text: string): DishMatch[] {
+    const { words, normalized } = tokenize(text);
+    if (!normalized || this.patterns.length === 0) return [];
+
+    // Which word starts / ends at each offset of the normalised text, or -1
+    const wordAt = new Int32Array(normalized.length + 1).fill(-1);
+    const wordEnding = new Int32Array(normalized.length + 1).fill(-1);
+    words.forEach((word, i) => {
+      wordAt[word.at] = i;
+      wordEnding[word.at + word.length] = i;
+    });
+
+    // Every boundary-aligned hit as [first word, last word, pattern]
+    const hits: [number, number, number][] = [];
+    let node = 0;
+    for (let i = 0; i < normalized.length; i++) {
+      const char = normalized[i];
+      while (node !== 0 && !this.edges[node].has(char)) node = this.fail[node];
+      node = this.edges[node].get(char) ?? 0;
+
+      const last = wordEnding[i + 1];
+      if (last === -1) continue;
+      for (let out = this.output[node] !== -1 ? node : this.outputLink[node]; out !== -1; out = this.outputLink[out]) {
+        const id = this.output[out];
+        const first = wordAt[i + 1 - this.patterns[id].norm.length];
+        if (first !== -1) hits.push([first, last, id]);
+      }
+    }
+
+    // Leftmost, then longest, without overlaps
+    hits.sort((a, b) => a[0] - b[0] || b[1] - a[1]);
+    const lines = lineStarts(text);
+    const prices = findPrices(text, lines);
+    const matches: DishMatch[] = [];
+    let nextFree = 0;
+    let firstPrice = 0; // matches arrive in text order, so prices are walked once
+    hits.forEach(([first, last, id]) => {
+      if (first < nextFree) return;
+      nextFree = last + 1;
+      const start = words[first].start;
+      const end = words[last].end;
+      const line = floorIndex(lines, start);
+      while (firstPrice < prices.length && prices[firstPrice].line < line) firstPrice++;
+      const pattern = this.patterns[id];
+      matches.push({
+        food_id: pattern.food_id,
+        term: pattern.term,
+        text: text.slice(start, end),
+        start,
+        end,
+        line,
+        price: nearestPrice(prices, firstPrice, line, start, end),
+      });
+    });
+    return matches;
+  }
+}
+
+/** Scans the prices on `line`, which begin at index `from` */
+function nearestPrice(prices: Price[], from: number, line: number, start: number, end: number): number | null {
+  let before: Price | null = null;
+  for (let i = from; i < prices.length && prices[i].line === line; i++) {
+    if (prices[i].start >= end) return prices[i].value;
+    if (prices[i].end <= start) before = prices[i];
+  }
+  return before ? before.value : null;
+}
+
+// -- shared catalog matcher -------------------------------------------------------
+
+const catalog = catalogFor(repositories.foodItems);
+let compiled: { generation: number; matcher: DishMatcher } | null = null;
+const stats = { compiles: 0, scans: 0, matches: 0 };
+
+function catalogTerms(): DishTerm[] {
+  const terms: DishTerm[] = [];
+  catalog.items.forEach(item => terms.push({ food_id: item.id, term: item.canonical_name }));
+  catalog.synonyms.forEach(synonym => {
+    terms.push({ food_id: String(synonym.food_id), term: synonym.term, weight: synonym.weight });
+  });
+  return terms;
+}
+
+/** Dishes from the food catalog found in `text`, in reading order */
+export async function matchDishes(text: string): Promise<DishMatch[]> {
+  await catalog.ready();
+  if (!compiled || compiled.generation !== catalog.generation) {
+    compiled = { generation: catalog.generation, matcher: DishMatcher.compile(catalogTerms()) };
+    stats.compiles++;
+  }
+  const matches = compiled.matcher.scan(text);
+  stats.scans++;
+  stats.matches += matches.length;
+  return matches;
+}
+
+/** The catalog entry behind a match's food_id, as of the last matchDishes() */
+export function dishCatalogItem(foodId: string): FoodItem | undefined {
+  return catalog.items.get(foodId);
+}
+
+export function dishMatcherStats() {
+  return { ...stats, patterns: compiled?.matcher.size ?? 0, catalog: catalog.stats };
+}
@@ -0,0 +1,198 @@
+// lib/food-catalog.ts
+// In-process copy of the food catalog (food_items + dish_synonyms) for the
+// search and OCR matching indexes. Loaded on first use; afterwards, at most
+// every FOOD_CATALOG_REFRESH_MS a cheap version probe runs in the background
+// and only rows written since the last load are fetched. A delete cannot be
+// expressed as a delta: when the probe's id checksum does not match the ids
+// the delta would leave us with, the whole catalog is reloaded instead.
+//
+// Also home to the term normalisation both indexes share, so a menu line,
+// a search query and a synonym all fold to the same spelling.
+import type { FoodItem, DishSynonym, CatalogVersion, CatalogChanges } from './repos/types';
+
+const REFRESH_MS = Number(process.env.FOOD_CATALOG_REFRESH_MS || 60000);
+
+export interface CatalogSource {
+  catalogVersion(): Promise<CatalogVersion>;
+  findCatalogChanges(since?: Date): Promise<CatalogChanges>;
+}
+
+/** `full` means the catalog was reloaded from scratch and `changes` is all of it */
+export type CatalogListener = (changes: CatalogChanges, full: boolean) => void;
+
+// -- normalisation --------------------------------------------------------------
+
+// Hinglish is written however it sounds, so fold the usual variations:
+// long vowels (paneer/panir, aloo/alu), aspirates (chhole/chole, dhal/dal,
+// gobhi/gobi), doubled letters (tikka/tika) and a few interchangeable
+// consonants (sabzi/sabji, idly/idli).
+function foldLatin(word: string): string {
+  return word
+    .replace(/ee/g, 'i')
+    .replace(/oo/g, 'u')
+    .replace(/chh/g, 'ch')
+    .replace(/ph/g, 'f')
+    .replace(/([kgjtdb])h/g, '$1')
+    .replace(/z/g, 'j')
+    .replace(/w/g, 'v')
+    .replace(/q/g, 'k')
+    .replace(/ck/g, 'k')
+    .replace(/y$/, 'i')
+    .replace(/(.)\1+/g, '$1');
+}
+
+/** Devanagari digits (U+0966-U+096F) as ASCII ones, one for one */
+export function asciiDigits(text: string): string {
+  return text.replace(/[\u0966-\u096f]/g, digit => String(digit.charCodeAt(0) - 0x0966));
+}
+
+/**
+ * Canonical spelling of a dish name or query: lower case, accents, nukta and
+ * joiners dropped, Devanagari digits made ASCII, punctuation (danda included)
+ * collapsed to single spaces, and Latin words folded as above. Devanagari is
+ * otherwise kept as written.
+ */
+export function normalizeTerm(text: string): string {
+  return asciiDigits(text)
+    .normalize('NFKD')
+    .toLowerCase()
+    .replace(/[\u0300-\u036f\u093c\u200c\u200d]/g, '')
+    .replace(/[^a-z0-9\u0900-\u0963\u0970-\u097f]+/g, ' ')
+    .trim()
+    .split(' ')
+    .map(word => (/^[a-z]/.test(word) ? foldLatin(word) : word))
+    .join(' ');
+}
+
+// -- catalog ----------------------------------------------------------------------
+
+function sameVersion(a: CatalogVersion, b: CatalogVersion) {
+  return a.items === b.items && a.synonyms === b.synonyms && a.checksum === b.checksum &&
+    (a.changed_at?.getTime() ?? null) === (b.changed_at?.getTime() ?? null);
+}
+
+export function synonymKey(synonym: DishSynonym): string {
+  return synonym.id || `${synonym.food_id}\n${synonym.term}`;
+}
+
+/** FNV-1a, 32-bit */
+function hashId(id: string): number {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < id.length; i++) {
+    hash ^= id.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+/**
+ * Order-independent checksum of the catalog's item and synonym ids: count,
+ * sum and xor of their hashes, so a delete still shows when an insert has
+ * kept the count level.
+ */
+export function catalogChecksum(itemIds: string[], synonymIds: string[]): string {
+  const part = (ids: string[]) => {
+    let sum = 0;
+    let xor = 0;
+    ids.forEach(id => {
+      const hash = hashId(id);
+      sum = (sum + hash) >>> 0;
+      xor = (xor ^ hash) >>> 0;
+    });
+    return `${ids.length}.${sum.toString(16)}.${xor.toString(16)}`;
+  };
+  return `${part(itemIds)}:${part(synonymIds)}`;
+}
+
+export class FoodCatalog {
+  readonly items = new Map<string, FoodItem>();
+  readonly synonyms = new Map<string, DishSynonym>();
+  /** Bumped on every change, so dependants can tell when to rebuild */
+  generation = 0;
+  readonly stats = { full_loads: 0, incremental_loads: 0, refresh_errors: 0 };
+
+  private version: CatalogVersion | null = null;
+  private checkedAt = 0;
+  private loading: Promise<void> | null = null;
+  private listeners: CatalogListener[] = [];
+
+  constructor(private source: CatalogSource) {}
+
+  onChange(listener: CatalogListener) {
+    this.listeners.push(listener);
+  }
+
+  /**
+   * Resolves once the catalog has been loaded. Later calls return at once
+   * and, when the last check is older than the refresh interval, start one
+   * in the background.
+   */
+  async ready(): Promise<void> {
+    if (!this.version) return this.refresh();
+    if (Date.now() - this.checkedAt > REFRESH_MS) {
+      this.refresh().catch(error => console.warn('Food catalog refresh failed:', error.message));
+    }
+  }
+
+  refresh(): Promise<void> {
+    if (!this.loading) {
+      this.loading = this.load().finally(() => { this.loading = null; });
+    }
+    return this.loading;
+  }
+
+  private async load() {
+    this.checkedAt = Date.now();
+    try {
+      const version = await this.source.catalogVersion();
+      const previous = this.version;
+      if (previous && sameVersion(previous, version)) return;
+
+      let full = !previous || !previous.changed_at;
+      // $gte on the old watermark: rows sharing its timestamp are re-applied, not missed
+      let changes = await this.source.findCatalogChanges(full ? undefined : previous!.changed_at!);
+      if (!full && this.checksumAfter(changes) !== version.checksum) {
+        // Something was deleted (or written with an old timestamp)
+        full = true;
+        changes = await this.source.findCatalogChanges();
+      }
+
+      if (full) {
+        this.items.clear();
+        this.synonyms.clear();
+      }
+      changes.items.forEach(item => this.items.set(item.id, item));
+      changes.synonyms.forEach(synonym => this.synonyms.set(synonymKey(synonym), synonym));
+
+      this.version = version;
+      this.generation++;
+      if (full) this.stats.full_loads++;
+      else this.stats.incremental_loads++;
+      this.listeners.forEach(listener => listener(changes, full));
+    } catch (error) {
+      this.stats.refresh_errors++;
+      throw error;
+    }
+  }
+
+  /** Checksum of the ids the catalog would hold once `changes` is applied */
+  private checksumAfter(changes: CatalogChanges): string {
+    const items = new Set(Array.from(this.items.keys()));
+    const synonyms = new Set(Array.from(this.synonyms.keys()));
+    changes.items.forEach(item => items.add(item.id));
+    changes.synonyms.forEach(synonym => synonyms.add(synonymKey(synonym)));
+    return catalogChecksum(Array.from(items), Array.from(synonyms));
+  }
+}
+
+const catalogs = new WeakMap<CatalogSource, FoodCatalog>();
+
+/** The one FoodCatalog for `source`, shared by every index built over it */
+export function catalogFor(source: CatalogSource): FoodCatalog {
+  let catalog = catalogs.get(source);
+  if (!catalog) {
+    catalog = new FoodCatalog(source);
+    catalogs.set(source, catalog);
+  }
+  return catalog;
+}
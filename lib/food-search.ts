@@ -0,0 +1,193 @@
+// lib/food-search.ts
+// Trigram index over dish names and synonyms for food search and
+// autocomplete. Terms are normalised with normalizeTerm, so Hinglish
+// spellings meet in the middle before any fuzzy matching happens.
+//
+// A query's trigrams select candidates from the postings lists; the best
+// candidates are then ranked: exact match, then prefix (what autocomplete
+// wants), then by edit distance, preferring the start of the name to a later
+// word, with the synonym weight breaking ties. Everything is in memory, so a
+// lookup touches no database.
+import type { CatalogChanges } from './repos/types';
+import { FoodCatalog, normalizeTerm, synonymKey } from './food-catalog';
+
+// Candidates kept after trigram counting, before the edit-distance pass
+const MAX_CANDIDATES = 64;
+
+type IndexedTerm = {
+  key: string;
+  food_id: string;
+  term: string;
+  norm: string;
+  weight: number;
+  live: boolean;
+};
+
+export type FoodMatch = { food_id: string; term: string; score: number };
+
+/** pg_trgm-style trigrams: each word padded with two leading spaces and one trailing */
+function trigrams(norm: string, open = false): string[] {
+  const grams = new Set<string>();
+  const words = norm.split(' ').filter(Boolean);
+  words.forEach((word, i) => {
+    // The last word of a query may still be being typed
+    const padded = `  ${word}${open && i === words.length - 1 ? '' : ' '}`;
+    for (let j = 0; j + 3 <= padded.length; j++) grams.add(padded.slice(j, j + 3));
+  });
+  return Array.from(grams);
+}
+
+function editDistance(a: string, b: string): number {
+  let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+  for (let i = 1; i <= a.length; i++) {
+    const current = [i];
+    for (let j = 1; j <= b.length; j++) {
+      current[j] = Math.min(
+        previous[j] + 1,
+        current[j - 1] + 1,
+        previous[j - 1] + (a[i - 1] === b[j - 1] ? 0 : 1)
+      );
+    }
+    previous = current;
+  }
+  return previous[b.length];
+}
+
+function maxEdits(query: string) {
+  return query.length <= 4 ? 1 : query.length <= 8 ? 2 : 3;
+}
+
+/**
+ * Lower is better; null when the term is too far from the query. The query
+ * is compared from the start of every word, so "biryani" finds "Chicken
+ * Biryani", with a small penalty for not matching at the start.
+ */
+function rank(query: string, norm: string): number | null {
+  if (norm === query) return 0;
+
+  const starts = [0];
+  for (let i = norm.indexOf(' '); i !== -1; i = norm.indexOf(' ', i + 1)) starts.push(i + 1);
+
+  let best: number | null = null;
+  starts.forEach(start => {
+    const tail = norm.slice(start);
+    const offset = start === 0 ? 0 : 0.5;
+    let score: number | null = null;
+    if (tail.startsWith(query)) {
+      score = 1 + offset + (tail.length - query.length) / 1000;
+    } else {
+      const distance = Math.min(
+        editDistance(query, tail),
+        // A misspelt prefix, e.g. "panir tik" for "paneer tikka"
+        editDistance(query, tail.slice(0, query.length)) + 0.5
+      );
+      if (distance <= maxEdits(query)) score = 2 + offset + distance;
+    }
+    if (score !== null && (best === null || score < best)) best = score;
+  });
+  return best;
+}
+
+export class FoodSearchIndex {
+  private terms: IndexedTerm[] = [];
+  private postings = new Map<string, number[]>();
+  private byKey = new Map<string, number>();
+  private dead = 0;
+
+  constructor(private catalog: FoodCatalog) {
+    catalog.onChange((changes, full) => this.apply(changes, full));
+  }
+
+  get size() {
+    return this.terms.length - this.dead;
+  }
+
+  /** Best matching foods for `query`, one entry per food, best first */
+  async search(query: string, limit = 20): Promise<FoodMatch[]> {
+    await this.catalog.ready();
+    return this.lookup(query, limit);
+  }
+
+  lookup(query: string, limit = 20): FoodMatch[] {
+    const norm = normalizeTerm(query);
+    if (!norm) return [];
+
+    const grams = trigrams(norm, true);
+    const shared = new Map<number, number>();
+    grams.forEach(gram => {
+      this.postings.get(gram)?.forEach(id => shared.set(id, (shared.get(id) || 0) + 1));
+    });
+
+    // Terms sharing under half the query's trigrams are too far to rank well
+    const minShared = Math.max(1, Math.floor(grams.length / 2));
+    const candidates: [number, number][] = [];
+    shared.forEach((count, id) => {
+      if (count >= minShared && this.terms[id].live) candidates.push([id, count]);
+    });
+    candidates.sort((a, b) => b[1] - a[1]);
+
+    const best = new Map<string, FoodMatch & { weight: number }>();
+    candidates.slice(0, MAX_CANDIDATES).forEach(([id]) => {
+      const term = this.terms[id];
+      const score = rank(norm, term.norm);
+      if (score === null) return;
+      const current = best.get(term.food_id);
+      if (!current || score < current.score || (score === current.score && term.weight > current.weight)) {
+        best.set(term.food_id, { food_id: term.food_id, term: term.term, score, weight: term.weight });
+      }
+    });
+
+    return Array.from(best.values())
+      .sort((a, b) => a.score - b.score || b.weight - a.weight || a.term.length - b.term.length)
+      .slice(0, limit)
+      .map(({ food_id, term, score }) => ({ food_id, term, score }));
+  }
+
+  private apply(changes: CatalogChanges, full: boolean) {
+    if (full) this.clear();
+    changes.items.forEach(item => this.put(`item:${item.id}`, item.id, item.canonical_name, 100));
+    changes.synonyms.forEach(synonym => {
+      this.put(`syn:${synonymKey(synonym)}`, String(synonym.food_id), synonym.term, synonym.weight ?? 100);
+    });
+    // Replaced terms leave dead postings behind; rebuild once they dominate
+    if (this.dead > this.terms.length / 2) this.compact();
+  }
+
+  private put(key: string, food_id: string, term: string, weight: number) {
+    const norm = normalizeTerm(term);
+    const existing = this.byKey.get(key);
+    if (existing !== undefined) {
+      const current = this.terms[existing];
+      if (current.norm === norm && current.food_id === food_id) {
+        current.term = term;
+        current.weight = weight;
+        return;
+      }
+      current.live = false;
+      this.dead++;
+      this.byKey.delete(key);
+    }
+    if (!norm) return;
+
+    const id = this.terms.push({ key, food_id, term, norm, weight, live: true }) - 1;
+    this.byKey.set(key, id);
+    trigrams(norm).forEach(gram => {
+      const list = this.postings.get(gram);
+      if (list) list.push(id);
+      else this.postings.set(gram, [id]);
+    });
+  }
+
+  private clear() {
+    this.terms = [];
+    this.postings = new Map();
+    this.byKey = new Map();
+    this.dead = 0;
+  }
+
+  private compact() {
+    const live = this.terms.filter(term => term.live);
+    this.clear();
+    live.forEach(term => this.put(term.key, term.food_id, term.term, term.weight));
+  }
+}
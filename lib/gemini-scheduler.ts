@@ -0,0 +1,232 @@
+// lib/gemini-scheduler.ts
+// Shared admission control for every Gemini call made by the API routes.
+//
+// Each model gets a concurrency limit (GEMINI_CONCURRENCY, or a per-model
+// value from GEMINI_MODEL_LIMITS='{"gemini-1.5-flash":8}') that adapts
+// AIMD-style: halved on a 429, raised by one after `limit` successes, never
+// above the configured value. Calls over the limit wait in a bounded FIFO
+// (GEMINI_MAX_QUEUE) until their deadline (GEMINI_DEADLINE_MS). A call is
+// shed up front when the queue is full or the expected wait (queue position
+// x average service time) would already overrun its deadline, rather than
+// timing out later. 429/5xx responses are retried with full-jitter
+// exponential backoff, waiting at least as long as Gemini's RetryInfo asks,
+// within the same deadline.
+//
+// Streaming calls hold their slot until the stream opens; Gemini throttles
+// on request rate, which is decided when the request is accepted.
+
+const DEFAULT_LIMIT = Number(process.env.GEMINI_CONCURRENCY || 4);
+const MODEL_LIMITS: Record<string, number> = parseLimits(process.env.GEMINI_MODEL_LIMITS);
+const MAX_QUEUE = Number(process.env.GEMINI_MAX_QUEUE || 32);
+const DEADLINE_MS = Number(process.env.GEMINI_DEADLINE_MS || 20000);
+const MAX_RETRIES = Number(process.env.GEMINI_MAX_RETRIES || 2);
+const BACKOFF_BASE_MS = 500;
+const BACKOFF_MAX_MS = 8000;
+
+const RETRYABLE = new Set([429, 500, 502, 503, 504]);
+
+type Waiter = {
+  grant: () => void;
+  reject: (error: Error) => void;
+  enqueuedAt: number;
+  timer: ReturnType<typeof setTimeout>;
+};
+
+type ModelState = {
+  maxLimit: number;
+  limit: number;
+  active: number;
+  queue: Waiter[];
+  successes: number; // since the limit last changed
+  serviceMs: number | null; // EWMA of call duration
+  stats: {
+    calls: number;
+    retries: number;
+    throttled: number;
+    shed: number;
+    timeouts: number;
+    waited: number;
+    wait_ms_total: number;
+    wait_ms_max: number;
+  };
+};
+
+export type GeminiCallOptions = { deadlineMs?: number };
+
+const models = new Map<string, ModelState>();
+
+function parseLimits(value?: string): Record<string, number> {
+  if (!value) return {};
+  try {
+    return JSON.parse(value);
+  } catch {
+    console.warn('Ignoring invalid GEMINI_MODEL_LIMITS');
+    return {};
+  }
+}
+
+function stateFor(model: string): ModelState {
+  const name = model.replace(/^models\//, '');
+  let state = models.get(name);
+  if (!state) {
+    const limit = MODEL_LIMITS[name] || DEFAULT_LIMIT;
+    state = {
+      maxLimit: limit, limit, active: 0, queue: [], successes: 0, serviceMs: null,
+      stats: { calls: 0, retries: 0, throttled: 0, shed: 0, timeouts: 0, waited: 0, wait_ms_total: 0, wait_ms_max: 0 },
+    };
+    models.set(name, state);
+  }
+  return state;
+}
+
+function busy(message: string, retryAfterMs: number) {
+  return Object.assign(new Error(message), { status: 503, retryAfterMs });
+}
+
+function sleep(ms: number) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+// -- admission ------------------------------------------------------------------
+
+function recordWait(state: ModelState, ms: number) {
+  state.stats.waited++;
+  state.stats.wait_ms_total += ms;
+  state.stats.wait_ms_max = Math.max(state.stats.wait_ms_max, ms);
+}
+
+function acquire(state: ModelState, deadline: number): Promise<void> {
+  if (state.active < state.limit && state.queue.length === 0) {
+    state.active++;
+    return Promise.resolve();
+  }
+
+  const expectedWait = (state.serviceMs ?? 0) * Math.ceil((state.queue.length + 1) / state.limit);
+  if (state.queue.length >= MAX_QUEUE || Date.now() + expectedWait > deadline) {
+    state.stats.shed++;
+    return Promise.reject(busy('Gemini queue is full', expectedWait || BACKOFF_BASE_MS));
+  }
+
+  return new Promise<void>((resolve, reject) => {
+    const waiter: Waiter = {
+      enqueuedAt: Date.now(),
+      grant: () => {
+        clearTimeout(waiter.timer);
+        recordWait(state, Date.now() - waiter.enqueuedAt);
+        resolve();
+      },
+      reject,
+      timer: setTimeout(() => {
+        state.queue.splice(state.queue.indexOf(waiter), 1);
+        state.stats.timeouts++;
+        reject(busy('Gemini queue deadline exceeded', state.serviceMs ?? BACKOFF_BASE_MS));
+      }, Math.max(0, deadline - Date.now())),
+    };
+    state.queue.push(waiter);
+  });
+}
+
+function release(state: ModelState) {
+  state.active--;
+  while (state.active < state.limit && state.queue.length) {
+    state.active++;
+    state.queue.shift()!.grant();
+  }
+}
+
+// -- adaptation -----------------------------------------------------------------
+
+function onSuccess(state: ModelState, ms: number) {
+  state.serviceMs = state.serviceMs === null ? ms : state.serviceMs * 0.8 + ms * 0.2;
+  if (++state.successes >= state.limit && state.limit < state.maxLimit) {
+    state.limit++;
+    state.successes = 0;
+  }
+}
+
+function onThrottled(state: ModelState) {
+  state.stats.throttled++;
+  state.limit = Math.max(1, Math.floor(state.limit / 2));
+  state.successes = 0;
+}
+
+/** HTTP status of a @google/generative-ai error, if it carries one */
+function statusOf(error: any): number | undefined {
+  if (typeof error?.status === 'number') return error.status;
+  const match = /\[(\d{3})[ \]]/.exec(error?.message || '');
+  return match ? Number(match[1]) : undefined;
+}
+
+/** Server-requested delay from a google.rpc.RetryInfo detail, e.g. "27s" */
+function retryInfoMs(error: any): number | undefined {
+  const info = (error?.errorDetails || []).find((d: any) => String(d?.['@type']).endsWith('RetryInfo'));
+  const seconds = parseFloat(info?.retryDelay);
+  return Number.isFinite(seconds) ? seconds * 1000 : undefined;
+}
+
+// -- public API -----------------------------------------------------------------
+
+/**
+ * Run one Gemini request under the model's concurrency limit, retrying
+ * throttled and transient failures. Rejects with a 503-status error when
+ * the call is shed or its deadline passes.
+ */
+export async function runGemini<T>(model: string, call: () => Promise<T>, { deadlineMs = DEADLINE_MS }: GeminiCallOptions = {}): Promise<T> {
+  const state = stateFor(model);
+  const deadline = Date.now() + deadlineMs;
+
+  for (let attempt = 0; ; attempt++) {
+    await acquire(state, deadline);
+    const started = Date.now();
+    let error: any;
+    try {
+      state.stats.calls++;
+      const result = await call();
+      onSuccess(state, Date.now() - started);
+      return result;
+    } catch (caught) {
+      error = caught;
+    } finally {
+      release(state);
+    }
+
+    const status = statusOf(error);
+    if (status === 429) onThrottled(state);
+    if (!status || !RETRYABLE.has(status)) throw error;
+
+    const serverDelay = retryInfoMs(error);
+    const delay = Math.max(serverDelay ?? 0, Math.random() * Math.min(BACKOFF_MAX_MS, BACKOFF_BASE_MS * 2 ** attempt));
+    if (attempt >= MAX_RETRIES || Date.now() + delay > deadline) {
+      throw Object.assign(error, { status, retryAfterMs: serverDelay ?? delay });
+    }
+    state.stats.retries++;
+    await sleep(delay);
+  }
+}
+
+/**
+ * Seconds a client should wait before retrying when `error` means Gemini is
+ * overloaded or throttling us (for a Retry-After header), otherwise null.
+ */
+export function retryAfterSeconds(error: unknown): number | null {
+  const status = (error as any)?.status;
+  if (status !== 429 && status !== 503) return null;
+  return Math.max(1, Math.ceil(((error as any).retryAfterMs || 1000) / 1000));
+}
+
+export function geminiSchedulerStats() {
+  const stats: Record<string, any> = {};
+  models.forEach((state, name) => {
+    stats[name] = {
+      limit: state.limit,
+      max_limit: state.maxLimit,
+      active: state.active,
+      queue_depth: state.queue.length,
+      max_queue: MAX_QUEUE,
+      avg_service_ms: state.serviceMs === null ? null : Math.round(state.serviceMs),
+      ...state.stats,
+      wait_ms_avg: state.stats.waited ? Math.round(state.stats.wait_ms_total / state.stats.waited) : 0,
+    };
+  });
+  return stats;
+}
@@ -1,8 +1,101 @@
 'use client'
 
 import { useState, useEffect, useRef } from 'react';
+import { speakDeepgram, stopSpeaking as stopDeepgram } from '../voice';
 
-// Deepgram STT Hook
+// MediaRecorder timeslice; also the most audio left to upload after stop
+const STT_TIMESLICE_MS = 250;
+
+// Chrome-style feature test: streaming request bodies need `duplex`
+function supportsRequestStreams() {
+  try {
+    let duplexAccessed = false;
+    const hasContentType = new Request('/', {
+      body: new ReadableStream(),
+      method: 'POST',
+      get duplex() {
+        duplexAccessed = true;
+        return 'half';
+      }
+    }).headers.has('Content-Type');
+    return duplexAccessed && !hasContentType;
+  } catch {
+    return false;
+  }
+}
+
+async function postAudio(body, contentType, streaming) {
+  const response = await fetch('/api/stt', {
+    method: 'POST',
+    headers: { 'Content-Type': contentType },
+    body,
+    ...(streaming ? { duplex: 'half' } : {})
+  });
+  const result = await response.json().catch(() => ({}));
+  if (!response.ok) {
+    throw new Error(result.error || `STT failed: ${response.status}`);
+  }
+  return result.text || '';
+}
+
+/**
+ * Upload recorder chunks to /api/stt while recording is still going on, so
+ * only the last timeslice is left to send when the user stops. Chunks are
+ * also kept so the clip can be re-sent in one piece where the browser or
+ * an HTTP/1.1 connection refuses streaming uploads.
+ */
+function createUpload(contentType) {
+  const chunks = [];
+  let controller = null;
+  let streamed = null;
+  let queue = Promise.resolve(); // keeps chunks in recorder order
+
+  if (supportsRequestStreams()) {
+    const body = new ReadableStream({ start(c) { controller = c; } });
+    streamed = postAudio(body, contentType, true);
+    streamed.catch(() => { controller = null; });
+  }
+
+  return {
+    push(blob) {
+      chunks.push(blob);
+      queue = queue.then(async () => {
+        if (!controller) return;
+        try {
+          controller.enqueue(new Uint8Array(await blob.arrayBuffer()));
+        } catch {
+          controller = null; // upload already failed; finish() falls back
+        }
+      });
+    },
+    async finish() {
+      await queue;
+      try {
+        controller?.close();
+      } catch {
+        // already errored
+      }
+      if (streamed) {
+        try {
+          return await streamed;
+        } catch (error) {
+          if (!(error instanceof TypeError)) throw error; // HTTP error from the route
+        }
+      }
+      return postAudio(new Blob(chunks, { type: contentType }), contentType, false);
+    },
+    abort() {
+      try {
+        controller?.error(new DOMException('Recording cancelled', 'AbortError'));
+      } catch {
+        // already closed
+      }
+      controller = null;
+    }
+  };
+}
+
+// Deepgram STT Hook (via /api/stt)
 export function useStt() {
   const [isListening, setIsListening] = useState(false);
   const [transcript, setTranscript] = useState('');
@@ -10,57 +103,51 @@ export function useStt() {
   const [error, setError] = useState(null);
   
   const mediaRecorderRef = useRef(null);
-  const socketRef = useRef(null);
+  const uploadRef = useRef(null);
+
+  useEffect(() => () => {
+    const recorder = mediaRecorderRef.current;
+    if (recorder) {
+      recorder.onstop = null;
+      uploadRef.current?.abort();
+      if (recorder.state !== 'inactive') recorder.stop();
+      recorder.stream.getTracks().forEach(track => track.stop());
+    }
+  }, []);
   
   const startListening = async () => {
     try {
-      // Get audio stream
+      setError(null);
       const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
       
-      // Create WebSocket connection to Deepgram
-      const socket = new WebSocket('wss://api.deepgram.com/v1/listen', [
-        'token',
-        process.env.NEXT_PUBLIC_DEEPGRAM_API_KEY || ''
-      ]);
-      
-      socket.onopen = () => {
-        console.log('Deepgram WebSocket connected');
-        setIsListening(true);
-      };
+      const mimeType = MediaRecorder.isTypeSupported('audio/webm;codecs=opus') ? 'audio/webm;codecs=opus' : '';
+      const mediaRecorder = new MediaRecorder(stream, mimeType ? { mimeType } : undefined);
+      const upload = createUpload(mediaRecorder.mimeType || 'audio/webm');
+      uploadRef.current = upload;
       
-      socket.onmessage = (event) => {
-        const data = JSON.parse(event.data);
-        if (data.channel?.alternatives?.[0]) {
-          const transcript = data.channel.alternatives[0].transcript;
-          if (data.is_final) {
-            setTranscript(prev => prev + transcript + ' ');
-            setInterimTranscript('');
-          } else {
-            setInterimTranscript(transcript);
-          }
+      mediaRecorder.ondataavailable = (event) => {
+        if (event.data.size > 0) {
+          upload.push(event.data);
         }
       };
       
-      socket.onerror = (error) => {
-        console.error('Deepgram WebSocket error:', error);
-        setError('Speech recognition failed');
-        fallbackToWebSpeech();
-      };
-      
-      // Set up MediaRecorder to send audio to Deepgram
-      const mediaRecorder = new MediaRecorder(stream, {
-        mimeType: 'audio/webm;codecs=opus'
-      });
-      
-      mediaRecorder.ondataavailable = (event) => {
-        if (socket.readyState === WebSocket.OPEN) {
-          socket.send(event.data);
+      mediaRecorder.onstop = async () => {
+        stream.getTracks().forEach(track => track.stop());
+        setIsListening(false);
+        try {
+          const text = await upload.finish();
+          if (text) {
+            setTranscript(prev => prev + text + ' ');
+          }
+        } catch (error) {
+          console.error('Deepgram STT error:', error);
+          setError(error.message || 'Speech recognition failed');
         }
       };
       
-      mediaRecorder.start(100); // Send data every 100ms
+      mediaRecorder.start(STT_TIMESLICE_MS);
       mediaRecorderRef.current = mediaRecorder;
-      socketRef.current = socket;
+      setIsListening(true);
       
     } catch (error) {
       console.error('STT error:', error);
@@ -70,12 +157,9 @@ export function useStt() {
   };
   
   const stopListening = () => {
-    if (mediaRecorderRef.current) {
+    if (mediaRecorderRef.current && mediaRecorderRef.current.state !== 'inactive') {
       mediaRecorderRef.current.stop();
     }
-    if (socketRef.current) {
-      socketRef.current.close();
-    }
     setIsListening(false);
   };
   
@@ -154,34 +238,16 @@ export function useTts() {
     setIsSpeaking(true);
     
     try {
-      // Try Deepgram TTS first (fix endpoint path)
-      const response = await fetch('/api/tts', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ text, model: 'aura-2-hermes-en' })
+      // Deepgram TTS streams, so playback starts with the first audio bytes
+      await speakDeepgram(text, 'aura-2-hermes-en', {
+        onEnded: () => setIsSpeaking(false)
       });
-      
-      if (response.ok) {
-        const audioBlob = await response.blob();
-        const audioUrl = URL.createObjectURL(audioBlob);
-        const audio = new Audio(audioUrl);
-        
-        audio.onended = () => {
-          setIsSpeaking(false);
-          URL.revokeObjectURL(audioUrl);
-        };
-        
-        audio.onerror = () => {
-          console.error('Audio playback failed, falling back to Web Speech');
-          fallbackToWebSpeech(text);
-        };
-        
-        await audio.play();
-      } else {
-        throw new Error('Deepgram TTS failed');
-      }
     } catch (error) {
-      console.error('TTS error:', error);
+      if (error.name === 'AbortError') {
+        // stopSpeaking() or a newer speak() cancelled this one
+        return;
+      }
+      console.error('TTS error, falling back to Web Speech:', error);
       fallbackToWebSpeech(text);
     }
   };
@@ -212,6 +278,7 @@ export function useTts() {
   };
   
   const stopSpeaking = () => {
+    stopDeepgram();
     speechSynthesis.cancel();
     setIsSpeaking(false);
   };
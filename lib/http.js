@@ -20,4 +20,45 @@ export async function safeJson(res) {
   } catch {
     throw new Error(`Invalid JSON: ${text.slice(0, 200)}`);
   }
-}
\ No newline at end of file
+}
+
+/**
+ * Read a text/event-stream response, calling onEvent(event, data) for every
+ * frame as it arrives. `data` is JSON-decoded when possible.
+ * @param {Response} res - Fetch response with a streaming body
+ * @param {(event: string, data: any) => void} onEvent
+ */
+export async function readEventStream(res, onEvent) {
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  const dispatch = (frame) => {
+    let event = "message";
+    const data = [];
+    for (const line of frame.split("\n")) {
+      if (line.startsWith("event:")) event = line.slice(6).trim();
+      else if (line.startsWith("data:")) data.push(line.slice(5).replace(/^ /, ""));
+    }
+    if (!data.length) return;
+    let payload = data.join("\n");
+    try {
+      payload = JSON.parse(payload);
+    } catch {
+      // not JSON; pass the raw text through
+    }
+    onEvent(event, payload);
+  };
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, "\n");
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      dispatch(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+    }
+  }
+  if (buffer.trim()) dispatch(buffer);
+}
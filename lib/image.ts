@@ -0,0 +1,109 @@
+// lib/image.ts
+// Normalises uploads before they are base64-encoded for Gemini: auto-orient,
+// strip EXIF/ICC metadata, downscale to IMAGE_MAX_EDGE and re-encode as JPEG
+// at IMAGE_QUALITY (PNG, WebP and HEIC in, JPEG out).
+//
+// sharp already runs on the libuv thread pool, so the event loop is never
+// blocked; the bounded pool here caps how many images are decoded at once
+// (IMAGE_WORKERS) so a burst of 12 MP uploads cannot exhaust memory, and
+// pins each job to one libvips thread so the pool size is the CPU bound.
+import os from 'os';
+import sharp from 'sharp';
+
+const MAX_EDGE = Number(process.env.IMAGE_MAX_EDGE || 1600);
+const QUALITY = Number(process.env.IMAGE_QUALITY || 82);
+const WORKERS = Number(process.env.IMAGE_WORKERS || Math.max(1, Math.min(4, os.cpus().length)));
+const MAX_QUEUE = Number(process.env.IMAGE_MAX_QUEUE || 64);
+
+sharp.concurrency(1);
+
+export type NormalizedImage = {
+  data: Buffer;
+  mimeType: string;
+  bytesIn: number;
+  bytesOut: number;
+  width?: number;
+  height?: number;
+  ms: number;
+  normalized: boolean; // false when the original had to be passed through
+};
+
+// -- bounded pool ---------------------------------------------------------------
+
+let active = 0;
+const waiting: Array<() => void> = [];
+
+async function withWorker<T>(job: () => Promise<T>): Promise<T> {
+  if (active >= WORKERS) {
+    if (waiting.length >= MAX_QUEUE) {
+      throw Object.assign(new Error('Image processing queue full'), { status: 503 });
+    }
+    // The finishing job hands its slot straight to us; `active` stays put
+    await new Promise<void>((resolve) => waiting.push(resolve));
+  } else {
+    active++;
+  }
+  try {
+    return await job();
+  } finally {
+    const next = waiting.shift();
+    if (next) next();
+    else active--;
+  }
+}
+
+// -- normalization ----------------------------------------------------------------
+
+const stats = { images: 0, passthrough: 0, bytes_in: 0, bytes_out: 0, ms: 0 };
+
+export async function normalizeImage(
+  input: Uint8Array,
+  mimeType = 'image/jpeg',
+  { maxEdge = MAX_EDGE, quality = QUALITY } = {}
+): Promise<NormalizedImage> {
+  const started = performance.now();
+  let result: NormalizedImage;
+
+  try {
+    const { data, info } = await withWorker(() =>
+      sharp(input, { failOn: 'none' })
+        .rotate() // apply EXIF orientation; metadata is dropped on output
+        .resize({ width: maxEdge, height: maxEdge, fit: 'inside', withoutEnlargement: true })
+        .flatten({ background: '#ffffff' }) // PNG/WebP alpha has no JPEG equivalent
+        .jpeg({ quality, mozjpeg: true })
+        .toBuffer({ resolveWithObject: true })
+    );
+    result = {
+      data, mimeType: 'image/jpeg', bytesIn: input.byteLength, bytesOut: data.byteLength,
+      width: info.width, height: info.height, ms: 0, normalized: true,
+    };
+  } catch (error) {
+    if ((error as any).status === 503) throw error;
+    // Undecodable here (e.g. HEIC without libheif); let Gemini try the original
+    console.warn('Image normalization failed, sending original:', (error as Error).message);
+    const data = Buffer.from(input);
+    result = {
+      data, mimeType, bytesIn: input.byteLength, bytesOut: data.byteLength, ms: 0, normalized: false,
+    };
+    stats.passthrough++;
+  }
+
+  result.ms = performance.now() - started;
+  stats.images++;
+  stats.bytes_in += result.bytesIn;
+  stats.bytes_out += result.bytesOut;
+  stats.ms += result.ms;
+  return result;
+}
+
+export function imagePipelineStats() {
+  return {
+    ...stats,
+    ms: Math.round(stats.ms),
+    active,
+    queued: waiting.length,
+    workers: WORKERS,
+    max_edge: MAX_EDGE,
+    quality: QUALITY,
+  };
+}
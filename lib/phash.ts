@@ -0,0 +1,48 @@
+// lib/phash.ts
+// Perceptual difference hash (dHash). The image is auto-oriented, reduced to
+// 9x8 greyscale (transparency flattened onto white) and each bit records whether a pixel is brighter than its
+// right-hand neighbour. Re-encodes, resizes and small framing or lighting
+// changes flip only a few of the 64 bits, so near-duplicates are found by
+// Hamming distance rather than equality.
+import sharp from 'sharp';
+
+const WIDTH = 9;
+const HEIGHT = 8;
+
+/** 64-bit dHash as 16 hex chars */
+export async function dHash(image: Uint8Array | Buffer): Promise<string> {
+  const pixels = await sharp(image, { failOn: 'none' })
+    .rotate()
+    // Without this a PNG keeps its alpha channel and the raw buffer holds
+    // two bytes per pixel
+    .flatten({ background: '#ffffff' })
+    .greyscale()
+    .resize(WIDTH, HEIGHT, { fit: 'fill', kernel: 'lanczos3' })
+    .raw()
+    .toBuffer();
+
+  // 64 comparison bits, packed four at a time into hex digits
+  let hex = '';
+  let nibble = 0;
+  let bit = 0;
+  for (let y = 0; y < HEIGHT; y++) {
+    for (let x = 0; x < WIDTH - 1; x++) {
+      nibble = (nibble << 1) | (pixels[y * WIDTH + x] > pixels[y * WIDTH + x + 1] ? 1 : 0);
+      if (++bit % 4 === 0) {
+        hex += nibble.toString(16);
+        nibble = 0;
+      }
+    }
+  }
+  return hex;
+}
+
+const NIBBLE_BITS = [0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4];
+
+export function hammingDistance(a: string, b: string): number {
+  let bits = 0;
+  for (let i = 0; i < a.length; i++) {
+    bits += NIBBLE_BITS[parseInt(a[i], 16) ^ parseInt(b[i], 16)];
+  }
+  return bits;
+}
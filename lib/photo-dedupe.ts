@@ -0,0 +1,110 @@
+// lib/photo-dedupe.ts
+// Per-user near-duplicate detection for /api/food/analyze.
+//
+// Each user's recent meal-photo hashes (lib/phash.ts) are kept in memory,
+// loaded lazily from photo_analyses on first use. A new photo within
+// PHOTO_DEDUPE_MAX_DISTANCE bits of one analysed in the last
+// PHOTO_DEDUPE_WINDOW_MS reuses that analysis (detections_json/macros_json)
+// instead of calling Gemini again.
+import { LruCache } from './cache';
+import { hammingDistance } from './phash';
+import { repositories } from './repos';
+
+const MAX_DISTANCE = Number(process.env.PHOTO_DEDUPE_MAX_DISTANCE || 6);
+const WINDOW_MS = Number(process.env.PHOTO_DEDUPE_WINDOW_MS || 6 * 60 * 60 * 1000);
+const PER_USER = 20;
+
+type RecentPhoto = {
+  id?: string;
+  phash: string;
+  ts: number;
+  detections: any[];
+  macros: any;
+};
+
+export type NearDuplicate = { id?: string; distance: number; guess: any[]; nutrition: any };
+
+const recent = new LruCache<RecentPhoto[]>({
+  maxEntries: Number(process.env.PHOTO_DEDUPE_MAX_USERS || 2000),
+  ttlMs: WINDOW_MS,
+});
+
+const counters = { hits: 0, misses: 0, db_errors: 0 };
+
+async function recentFor(userId: string): Promise<RecentPhoto[]> {
+  const cached = recent.get(userId);
+  if (cached) return cached;
+
+  let photos: RecentPhoto[] = [];
+  try {
+    const rows = await repositories.photoAnalyses.findRecentHashed(
+      userId, new Date(Date.now() - WINDOW_MS), PER_USER
+    );
+    photos = rows.map((row) => ({
+      id: row.id,
+      phash: row.phash!,
+      ts: new Date(row.ts!).getTime(),
+      detections: row.detections_json || [],
+      macros: row.macros_json || {},
+    }));
+  } catch (error) {
+    counters.db_errors++;
+    console.warn('Photo dedupe index load failed:', (error as Error).message);
+  }
+  recent.set(userId, photos);
+  return photos;
+}
+
+export async function findNearDuplicate(userId: string, phash: string): Promise<NearDuplicate | null> {
+  const cutoff = Date.now() - WINDOW_MS;
+  let best: { photo: RecentPhoto; distance: number } | null = null;
+  for (const photo of await recentFor(userId)) {
+    if (photo.ts < cutoff) continue;
+    const distance = hammingDistance(phash, photo.phash);
+    if (distance <= MAX_DISTANCE && (!best || distance < best.distance)) {
+      best = { photo, distance };
+    }
+  }
+
+  if (!best) {
+    counters.misses++;
+    return null;
+  }
+  counters.hits++;
+  return { id: best.photo.id, distance: best.distance, guess: best.photo.detections, nutrition: best.photo.macros };
+}
+
+/** Persist an analysis with its hash and add it to the user's in-memory index */
+export async function rememberAnalysis(userId: string, phash: string, analysis: any) {
+  const existing = await recentFor(userId);
+  const guess = Array.isArray(analysis.guess) ? analysis.guess : [];
+  const photo: RecentPhoto = { phash, ts: Date.now(), detections: guess, macros: analysis.nutrition || {} };
+
+  try {
+    const saved = await repositories.photoAnalyses.create({
+      user_id: userId,
+      detections_json: guess,
+      macros_json: photo.macros,
+      portion_hint: guess[0]?.portion_hints,
+      confidence: guess.length ? Math.max(...guess.map((g: any) => Number(g.confidence) || 0)) : undefined,
+      phash,
+    });
+    photo.id = saved.id;
+  } catch (error) {
+    counters.db_errors++;
+    console.warn('Photo analysis write failed:', (error as Error).message);
+  }
+
+  const photos = [photo, ...existing].slice(0, PER_USER);
+  recent.set(userId, photos);
+}
+
+export function photoDedupeStats() {
+  const lookups = counters.hits + counters.misses;
+  return {
+    ...counters,
+    hit_rate: lookups ? Number((counters.hits / lookups).toFixed(3)) : 0,
+    users_indexed: recent.size,
+    max_distance: MAX_DISTANCE,
+  };
+}
@@ -8,7 +8,8 @@ import {
   IFoodLogsRepository, 
   IOcrScansRepository,
   IPhotoAnalysesRepository,
-  IFoodItemsRepository 
+  IFoodItemsRepository,
+  IDailyTotalsRepository
 } from './types';
 
 // Import implementations
@@ -18,6 +19,7 @@ import { MongoFoodLogsRepository } from './mongo/food-logs';
 import { MongoOcrScansRepository } from './mongo/ocr-scans';
 import { MongoPhotoAnalysesRepository } from './mongo/photo-analyses';
 import { MongoFoodItemsRepository } from './mongo/food-items';
+import { MongoDailyTotalsRepository } from './mongo/daily-totals';
 
 // Supabase stubs (TODO: implement for M1)
 import { SupabaseProfileRepository } from './supabase/profiles';
@@ -26,6 +28,7 @@ import { SupabaseFoodLogsRepository } from './supabase/food-logs';
 import { SupabaseOcrScansRepository } from './supabase/ocr-scans';
 import { SupabasePhotoAnalysesRepository } from './supabase/photo-analyses';
 import { SupabaseFoodItemsRepository } from './supabase/food-items';
+import { SupabaseDailyTotalsRepository } from './supabase/daily-totals';
 
 const DB_PROVIDER = process.env.DB_PROVIDER || 'mongo';
 
@@ -39,6 +42,7 @@ function createRepositories() {
       ocrScans: new SupabaseOcrScansRepository(),
       photoAnalyses: new SupabasePhotoAnalysesRepository(),
       foodItems: new SupabaseFoodItemsRepository(),
+      dailyTotals: new SupabaseDailyTotalsRepository(),
     };
   }
   
@@ -50,6 +54,7 @@ function createRepositories() {
     ocrScans: new MongoOcrScansRepository(),
     photoAnalyses: new MongoPhotoAnalysesRepository(),
     foodItems: new MongoFoodItemsRepository(),
+    dailyTotals: new MongoDailyTotalsRepository(),
   };
 }
 
@@ -63,4 +68,5 @@ export type Repositories = {
   ocrScans: IOcrScansRepository;
   photoAnalyses: IPhotoAnalysesRepository;
   foodItems: IFoodItemsRepository;
+  dailyTotals: IDailyTotalsRepository;
 };
\ No newline at end of file
@@ -0,0 +1,91 @@
+/**
+ * MongoDB Daily Totals Repository Implementation
+ *
+ * One document per (user_id, date) holding the sums of that day's food_logs.
+ * MongoFoodLogsRepository keeps it current with atomic $inc on every create
+ * and delete; scripts/rebuild-daily-totals.js recomputes it from food_logs
+ * for backfill and drift repair.
+ */
+
+import { AnyBulkWriteOperation } from 'mongodb';
+import { IDailyTotalsRepository, DailyTotals, FoodLog } from '../types';
+import { getDatabase } from './connection';
+
+export const NUTRIENT_FIELDS = ['kcal', 'protein_g', 'carb_g', 'fat_g', 'fiber_g', 'sodium_mg'] as const;
+
+// Must match the timezone the rebuild script buckets by
+const TZ = process.env.DAILY_TOTALS_TZ || 'UTC';
+const dayFormat = new Intl.DateTimeFormat('en-CA', { timeZone: TZ, year: 'numeric', month: '2-digit', day: '2-digit' });
+
+/** Calendar day a log counts towards, as YYYY-MM-DD in DAILY_TOTALS_TZ */
+export function dayKey(ts: Date): string {
+  return dayFormat.format(ts);
+}
+
+type LogAmounts = Pick<FoodLog, 'user_id' | 'ts' | (typeof NUTRIENT_FIELDS)[number]>;
+
+export class MongoDailyTotalsRepository implements IDailyTotalsRepository {
+  private async getCollection() {
+    const db = await getDatabase();
+    return db.collection('daily_totals');
+  }
+
+  async findByUserIdAndDate(userId: string, date: string): Promise<DailyTotals | null> {
+    const collection = await this.getCollection();
+    const totals = await collection.findOne({ user_id: userId, date }, { projection: { _id: 0, rebuilt_at: 0 } });
+    return totals as DailyTotals | null;
+  }
+
+  async findByUserIdRange(userId: string, from: string, to: string): Promise<DailyTotals[]> {
+    const collection = await this.getCollection();
+    const totals = await collection
+      .find({ user_id: userId, date: { $gte: from, $lte: to } }, { projection: { _id: 0, rebuilt_at: 0 } })
+      .sort({ date: 1 })
+      .toArray();
+    return totals as unknown as DailyTotals[];
+  }
+
+  /**
+   * Add (sign 1) or subtract (sign -1) logs from their days' totals. Logs on
+   * the same day fold into one $inc and all days go out in one bulkWrite.
+   * Subtractions never create a day, so deleting a log that predates the
+   * rollups cannot leave negative totals behind.
+   */
+  async apply(logs: LogAmounts[], sign: 1 | -1): Promise<void> {
+    const days = new Map<string, { user_id: string; date: string; inc: Record<string, number> }>();
+    for (const log of logs) {
+      const date = dayKey(log.ts ? new Date(log.ts) : new Date());
+      const key = `${log.user_id}\n${date}`;
+      let day = days.get(key);
+      if (!day) {
+        day = { user_id: log.user_id, date, inc: { log_count: 0 } };
+        NUTRIENT_FIELDS.forEach(field => { day!.inc[field] = 0; });
+        days.set(key, day);
+      }
+      day.inc.log_count += sign;
+      NUTRIENT_FIELDS.forEach(field => { day!.inc[field] += sign * (Number(log[field]) || 0); });
+    }
+    if (days.size === 0) return;
+
+    const now = new Date();
+    const operations: AnyBulkWriteOperation[] = [];
+    days.forEach(({ user_id, date, inc }) => {
+      operations.push({
+        updateOne: {
+          filter: { user_id, date },
+          update: { $inc: inc, $set: { updated_at: now } },
+          upsert: sign > 0
+        }
+      });
+    });
+
+    const collection = await this.getCollection();
+    await collection.bulkWrite(operations, { ordered: false });
+  }
+
+  async deleteByUserId(userId: string): Promise<boolean> {
+    const collection = await this.getCollection();
+    const result = await collection.deleteMany({ user_id: userId });
+    return result.deletedCount > 0;
+  }
+}
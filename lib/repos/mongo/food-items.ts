@@ -2,15 +2,25 @@
  * MongoDB Food Items Repository Implementation
  */
 
-import { IFoodItemsRepository, FoodItem } from '../types';
+import { IFoodItemsRepository, FoodItem, DishSynonym, CatalogVersion, CatalogChanges } from '../types';
 import { getDatabase } from './connection';
+import { catalogFor, catalogChecksum } from '../../food-catalog';
+import { FoodSearchIndex } from '../../food-search';
 
 export class MongoFoodItemsRepository implements IFoodItemsRepository {
+  // Built lazily on the first search and kept current from the catalog
+  private searchIndex = new FoodSearchIndex(catalogFor(this));
+
   private async getCollection() {
     const db = await getDatabase();
     return db.collection('food_items');
   }
 
+  private async getSynonymsCollection() {
+    const db = await getDatabase();
+    return db.collection('dish_synonyms');
+  }
+
   async findByName(name: string): Promise<FoodItem | null> {
     const collection = await this.getCollection();
     const item = await collection.findOne({ canonical_name: name });
@@ -21,23 +31,17 @@ export class MongoFoodItemsRepository implements IFoodItemsRepository {
     } : null;
   }
 
+  /**
+   * Fuzzy search over canonical names and dish synonyms, served from the
+   * in-process trigram index rather than a collection scan.
+   */
   async search(query: string, limit: number = 20): Promise<FoodItem[]> {
-    const collection = await this.getCollection();
+    const matches = await this.searchIndex.search(query, limit);
+    const catalog = catalogFor(this);
     
-    const items = await collection
-      .find({
-        $or: [
-          { canonical_name: { $regex: query, $options: 'i' } },
-          { $text: { $search: query } }
-        ]
-      })
-      .limit(limit)
-      .toArray();
-    
-    return items.map(item => ({
-      ...item,
-      id: item._id?.toString()
-    }));
+    return matches
+      .map(match => catalog.items.get(match.food_id))
+      .filter((item): item is FoodItem => item !== undefined);
   }
 
   async findAll(limit: number = 100): Promise<FoodItem[]> {
@@ -53,4 +57,55 @@ export class MongoFoodItemsRepository implements IFoodItemsRepository {
       id: item._id?.toString()
     }));
   }
-}
\ No newline at end of file
+
+  async catalogVersion(): Promise<CatalogVersion> {
+    const items = await this.getCollection();
+    const synonyms = await this.getSynonymsCollection();
+    
+    // Ids and timestamps only: small next to the documents, and the id set
+    // is what shows a delete that an insert has hidden from the counts
+    const [itemDocs, synonymDocs] = await Promise.all([
+      items.find({}, { projection: { updated_at: 1 } }).toArray(),
+      synonyms.find({}, { projection: { updated_at: 1, created_at: 1 } }).toArray()
+    ]);
+    
+    let changedAt = 0;
+    const ids = (docs: any[]) => docs.map(doc => {
+      const time = doc.updated_at || doc.created_at;
+      if (time) changedAt = Math.max(changedAt, new Date(time).getTime());
+      return doc._id.toString();
+    });
+    const itemIds = ids(itemDocs);
+    const synonymIds = ids(synonymDocs);
+    
+    return {
+      items: itemIds.length,
+      synonyms: synonymIds.length,
+      changed_at: changedAt ? new Date(changedAt) : null,
+      checksum: catalogChecksum(itemIds, synonymIds)
+    };
+  }
+
+  async findCatalogChanges(since?: Date): Promise<CatalogChanges> {
+    const items = await this.getCollection();
+    const synonyms = await this.getSynonymsCollection();
+    
+    const [itemDocs, synonymDocs] = await Promise.all([
+      items.find(since ? { updated_at: { $gte: since } } : {}).toArray(),
+      // Synonyms edited in place carry updated_at; older rows only created_at
+      synonyms.find(since ? { $or: [{ updated_at: { $gte: since } }, { created_at: { $gte: since } }] } : {}).toArray()
+    ]);
+    
+    return {
+      items: itemDocs.map(item => ({
+        ...item,
+        id: item._id.toString()
+      })) as unknown as FoodItem[],
+      synonyms: synonymDocs.map(synonym => ({
+        ...synonym,
+        id: synonym._id.toString(),
+        food_id: String(synonym.food_id)
+      })) as unknown as DishSynonym[]
+    };
+  }
+}
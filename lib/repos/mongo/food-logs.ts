@@ -2,15 +2,78 @@
  * MongoDB Food Logs Repository Implementation
  */
 
-import { IFoodLogsRepository, FoodLog } from '../types';
+import { MongoBulkWriteError, ObjectId } from 'mongodb';
+import { IFoodLogsRepository, FoodLog, FoodLogPage, FoodLogPageOptions, FoodLogIterateOptions, BatchItemResult } from '../types';
 import { getDatabase } from './connection';
+import { MongoDailyTotalsRepository } from './daily-totals';
+
+const DUPLICATE_KEY = 11000;
+
+const PAGE_DEFAULT = 50;
+const PAGE_MAX = 200;
+
+// Fields the log list renders; assumptions, notes etc. are fetched per log
+const LIST_PROJECTION = {
+  ts: 1, source_enum: 1, food_id: 1, menu_item_id: 1, portion_units: 1, portion_qty_numeric: 1,
+  kcal: 1, protein_g: 1, carb_g: 1, fat_g: 1, fiber_g: 1, sodium_mg: 1
+};
+
+function toFoodLog({ _id, ...log }: any): FoodLog {
+  return { ...log, id: _id.toString() };
+}
+
+// Cursors are the (ts, _id) of the last log on a page
+function encodeCursor(log: any): string {
+  return Buffer.from(`${new Date(log.ts).getTime()}:${log._id.toString()}`).toString('base64url');
+}
+
+function decodeCursor(cursor: string): { ts: Date; id: ObjectId } {
+  const [ms, id] = Buffer.from(cursor, 'base64url').toString().split(':');
+  const ts = new Date(Number(ms));
+  if (!ms || Number.isNaN(ts.getTime()) || !ObjectId.isValid(id || '')) {
+    throw Object.assign(new Error('Invalid cursor'), { status: 400 });
+  }
+  return { ts, id: new ObjectId(id) };
+}
+
+function pageQuery(userId: string, from?: Date, to?: Date, after?: string) {
+  const query: any = { user_id: userId };
+  
+  if (from || to) {
+    query.ts = {};
+    if (from) query.ts.$gte = from;
+    if (to) query.ts.$lte = to;
+  }
+  
+  if (after) {
+    const { ts, id } = decodeCursor(after);
+    query.$or = [{ ts: { $lt: ts } }, { ts, _id: { $lt: id } }];
+  }
+  
+  return query;
+}
 
 export class MongoFoodLogsRepository implements IFoodLogsRepository {
+  private totals = new MongoDailyTotalsRepository();
+
   private async getCollection() {
     const db = await getDatabase();
     return db.collection('food_logs');
   }
 
+  /**
+   * Keep daily_totals in step with a write that already succeeded. A failure
+   * here must not fail (and so invite a retry of) the log write itself; the
+   * drift is repaired by scripts/rebuild-daily-totals.js.
+   */
+  private async updateTotals(logs: any[], sign: 1 | -1) {
+    try {
+      await this.totals.apply(logs, sign);
+    } catch (error) {
+      console.warn('Daily totals update failed:', (error as Error).message);
+    }
+  }
+
   async create(log: Omit<FoodLog, 'id' | 'created_at'>): Promise<FoodLog> {
     const collection = await this.getCollection();
     
@@ -20,39 +83,137 @@ export class MongoFoodLogsRepository implements IFoodLogsRepository {
       created_at: new Date()
     };
 
-    const result = await collection.insertOne(logWithTimestamps);
-    
-    return {
-      ...logWithTimestamps,
-      id: result.insertedId.toString()
-    };
+    try {
+      const result = await collection.insertOne(logWithTimestamps);
+      await this.updateTotals([logWithTimestamps], 1);
+      
+      return {
+        ...logWithTimestamps,
+        id: result.insertedId.toString()
+      };
+    } catch (error: any) {
+      // Retried request: (user_id, idempotency_key) is unique, return the original
+      if (error?.code === DUPLICATE_KEY && log.idempotency_key) {
+        const existing = await collection.findOne({ user_id: log.user_id, idempotency_key: log.idempotency_key });
+        if (existing) return { ...existing, id: existing._id.toString() } as FoodLog;
+      }
+      throw error;
+    }
   }
 
-  async findByUserId(userId: string, from?: Date, to?: Date): Promise<FoodLog[]> {
+  /**
+   * One unordered insertMany for the whole batch. Items whose
+   * (user_id, idempotency_key) already exists fail on the unique index and
+   * are reported as duplicates with the existing log's id; the rest of the
+   * batch is still written.
+   */
+  async createMany(logs: Omit<FoodLog, 'id' | 'created_at'>[]): Promise<BatchItemResult[]> {
+    if (logs.length === 0) return [];
     const collection = await this.getCollection();
     
-    const query: any = { user_id: userId };
+    const now = new Date();
+    const docs: any[] = logs.map(log => ({ ...log, ts: log.ts || now, created_at: now }));
+    const results: BatchItemResult[] = docs.map(() => ({ status: 'created' }));
+    
+    try {
+      await collection.insertMany(docs, { ordered: false });
+    } catch (error) {
+      if (!(error instanceof MongoBulkWriteError)) throw error;
+      const writeErrors = Array.isArray(error.writeErrors) ? error.writeErrors : [error.writeErrors];
+      for (const writeError of writeErrors) {
+        results[writeError.index] = writeError.code === DUPLICATE_KEY
+          ? { status: 'duplicate' }
+          : { status: 'error', error: writeError.errmsg };
+      }
+    }
+    
+    // insertMany assigns _id client-side, so created docs already carry theirs
+    results.forEach((result, i) => {
+      if (result.status === 'created') result.id = docs[i]._id.toString();
+    });
+    await this.updateTotals(docs.filter((_, i) => results[i].status === 'created'), 1);
     
-    if (from || to) {
-      query.ts = {};
-      if (from) query.ts.$gte = from;
-      if (to) query.ts.$lte = to;
+    const duplicates = docs.filter((_, i) => results[i].status === 'duplicate');
+    if (duplicates.length > 0) {
+      const existing = await collection
+        .find(
+          { $or: duplicates.map(doc => ({ user_id: doc.user_id, idempotency_key: doc.idempotency_key })) },
+          { projection: { user_id: 1, idempotency_key: 1 } }
+        )
+        .toArray();
+      const ids = new Map(existing.map(doc => [`${doc.user_id}\n${doc.idempotency_key}`, doc._id.toString()]));
+      results.forEach((result, i) => {
+        if (result.status === 'duplicate') result.id = ids.get(`${docs[i].user_id}\n${docs[i].idempotency_key}`);
+      });
     }
     
+    return results;
+  }
+
+  /**
+   * One page of a user's logs, newest first, ordered by (ts, _id) so pages
+   * stay stable while new logs arrive. Only the fields the log list shows
+   * are returned.
+   */
+  async findByUserId(userId: string, { from, to, after, limit }: FoodLogPageOptions = {}): Promise<FoodLogPage> {
+    const collection = await this.getCollection();
+    const pageSize = Math.min(Math.max(1, Math.floor(limit || PAGE_DEFAULT)), PAGE_MAX);
+    
+    // One extra document tells us whether there is a next page
     const logs = await collection
-      .find(query)
-      .sort({ ts: -1 })
+      .find(pageQuery(userId, from, to, after), { projection: LIST_PROJECTION })
+      .sort({ ts: -1, _id: -1 })
+      .limit(pageSize + 1)
       .toArray();
     
-    return logs.map(log => ({
-      ...log,
-      id: log._id?.toString()
-    }));
+    const more = logs.length > pageSize;
+    if (more) logs.pop();
+    
+    return {
+      logs: logs.map(toFoodLog),
+      next: more ? encodeCursor(logs[logs.length - 1]) : null
+    };
+  }
+
+  /**
+   * Every matching log, newest first, streamed from a single cursor for
+   * internal consumers (exports, rebuilds) that must not hold a whole
+   * history in memory. Yields complete documents.
+   */
+  async *iterateByUserId(userId: string, { from, to, after, createdSince }: FoodLogIterateOptions = {}): AsyncIterable<FoodLog> {
+    const collection = await this.getCollection();
+    const query = pageQuery(userId, from, to, after);
+    if (createdSince) query.created_at = { $gt: createdSince };
+    
+    const cursor = collection
+      .find(query)
+      .sort({ ts: -1, _id: -1 })
+      .batchSize(PAGE_MAX);
+    
+    try {
+      let log;
+      while ((log = await cursor.next())) {
+        yield toFoodLog(log);
+      }
+    } finally {
+      await cursor.close();
+    }
+  }
+
+  async delete(userId: string, id: string): Promise<boolean> {
+    if (!ObjectId.isValid(id)) return false;
+    const collection = await this.getCollection();
+    const deleted = await collection.findOneAndDelete({ _id: new ObjectId(id), user_id: userId });
+    if (!deleted) return false;
+    
+    await this.updateTotals([deleted], -1);
+    return true;
   }
 
   async deleteByUserId(userId: string): Promise<boolean> {
     const collection = await this.getCollection();
     const result = await collection.deleteMany({ user_id: userId });
+    await this.totals.deleteByUserId(userId);
     return result.deletedCount > 0;
   }
 }
\ No newline at end of file
@@ -47,4 +47,39 @@ export class MongoOcrScansRepository implements IOcrScansRepository {
     const result = await collection.deleteMany({ user_id: userId });
     return result.deletedCount > 0;
   }
+
+  async findCached(contentHash: string, promptVersion: string, since: Date): Promise<OcrScan | null> {
+    const collection = await this.getCollection();
+    
+    const scan = await collection.findOne(
+      { content_hash: contentHash, prompt_version: promptVersion, ts: { $gte: since } },
+      { sort: { ts: -1 }, projection: { ocr_text: 1, parsed_json: 1, ts: 1 } }
+    );
+    
+    return scan ? { ...scan, id: scan._id?.toString() } as OcrScan : null;
+  }
+
+  /**
+   * Drop the cache keys from expired rows and from everything beyond the
+   * newest maxEntries. The scans themselves stay in the user's history.
+   */
+  async evictCached(maxEntries: number, olderThan: Date): Promise<number> {
+    const collection = await this.getCollection();
+    
+    const overflow = await collection
+      .find({ content_hash: { $exists: true }, ts: { $gte: olderThan } })
+      .sort({ ts: -1 })
+      .skip(maxEntries)
+      .project({ _id: 1 })
+      .toArray();
+    
+    const result = await collection.updateMany(
+      {
+        content_hash: { $exists: true },
+        $or: [{ ts: { $lt: olderThan } }, { _id: { $in: overflow.map(doc => doc._id) } }]
+      },
+      { $unset: { content_hash: '', prompt_version: '' } }
+    );
+    return result.modifiedCount;
+  }
 }
\ No newline at end of file
@@ -42,6 +42,24 @@ export class MongoPhotoAnalysesRepository implements IPhotoAnalysesRepository {
     }));
   }
 
+  async findRecentHashed(userId: string, since: Date, limit: number): Promise<PhotoAnalysis[]> {
+    const collection = await this.getCollection();
+    
+    const analyses = await collection
+      .find(
+        { user_id: userId, phash: { $exists: true }, ts: { $gte: since } },
+        { projection: { phash: 1, detections_json: 1, macros_json: 1, ts: 1 } }
+      )
+      .sort({ ts: -1 })
+      .limit(limit)
+      .toArray();
+    
+    return analyses.map(analysis => ({
+      ...analysis,
+      id: analysis._id?.toString()
+    })) as PhotoAnalysis[];
+  }
+
   async deleteByUserId(userId: string): Promise<boolean> {
     const collection = await this.getCollection();
     const result = await collection.deleteMany({ user_id: userId });
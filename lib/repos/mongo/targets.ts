@@ -71,14 +71,15 @@ export class MongoTargetsRepository implements ITargetsRepository {
       { returnDocument: 'after', upsert: true }
     );
 
-    if (!result.value) {
+    // Driver v6 resolves to the document itself
+    if (!result) {
       throw new Error('Failed to upsert target');
     }
 
     return {
-      ...result.value,
-      id: result.value._id?.toString()
-    };
+      ...result,
+      id: result._id?.toString()
+    } as DailyTarget;
   }
 
   async deleteByUserId(userId: string): Promise<boolean> {
@@ -0,0 +1,18 @@
+/**
+ * Supabase Daily Totals Repository Implementation (Stub for M1)
+ * TODO: Implement for M1 migration
+ */
+
+import { IDailyTotalsRepository, DailyTotals } from '../types';
+
+export class SupabaseDailyTotalsRepository implements IDailyTotalsRepository {
+  async findByUserIdAndDate(userId: string, date: string): Promise<DailyTotals | null> {
+    // TODO: Implement Supabase daily totals lookup for M1
+    throw new Error('Supabase daily totals repository not implemented yet - planned for M1');
+  }
+
+  async findByUserIdRange(userId: string, from: string, to: string): Promise<DailyTotals[]> {
+    // TODO: Implement Supabase daily totals range lookup for M1
+    throw new Error('Supabase daily totals repository not implemented yet - planned for M1');
+  }
+}
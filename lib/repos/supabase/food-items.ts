@@ -3,7 +3,7 @@
  * TODO: Implement for M1 migration
  */
 
-import { IFoodItemsRepository, FoodItem } from '../types';
+import { IFoodItemsRepository, FoodItem, CatalogVersion, CatalogChanges } from '../types';
 
 export class SupabaseFoodItemsRepository implements IFoodItemsRepository {
   async findByName(name: string): Promise<FoodItem | null> {
@@ -20,4 +20,14 @@ export class SupabaseFoodItemsRepository implements IFoodItemsRepository {
     // TODO: Implement Supabase food items findAll for M1
     throw new Error('Supabase food items repository not implemented yet - planned for M1');
   }
-}
\ No newline at end of file
+
+  async catalogVersion(): Promise<CatalogVersion> {
+    // TODO: Implement Supabase catalog version probe (counts, max timestamps, id checksum) for M1
+    throw new Error('Supabase food items repository not implemented yet - planned for M1');
+  }
+
+  async findCatalogChanges(since?: Date): Promise<CatalogChanges> {
+    // TODO: Implement Supabase catalog delta load for M1
+    throw new Error('Supabase food items repository not implemented yet - planned for M1');
+  }
+}
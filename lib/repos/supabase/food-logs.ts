@@ -3,7 +3,7 @@
  * TODO: Implement for M1 migration
  */
 
-import { IFoodLogsRepository, FoodLog } from '../types';
+import { IFoodLogsRepository, FoodLog, FoodLogPage, FoodLogPageOptions, FoodLogIterateOptions, BatchItemResult } from '../types';
 
 export class SupabaseFoodLogsRepository implements IFoodLogsRepository {
   async create(log: Omit<FoodLog, 'id' | 'created_at'>): Promise<FoodLog> {
@@ -11,8 +11,23 @@ export class SupabaseFoodLogsRepository implements IFoodLogsRepository {
     throw new Error('Supabase food logs repository not implemented yet - planned for M1');
   }
 
-  async findByUserId(userId: string, from?: Date, to?: Date): Promise<FoodLog[]> {
-    // TODO: Implement Supabase food logs lookup for M1
+  async createMany(logs: Omit<FoodLog, 'id' | 'created_at'>[]): Promise<BatchItemResult[]> {
+    // TODO: Implement Supabase batch insert (ON CONFLICT DO NOTHING) for M1
+    throw new Error('Supabase food logs repository not implemented yet - planned for M1');
+  }
+
+  async findByUserId(userId: string, options?: FoodLogPageOptions): Promise<FoodLogPage> {
+    // TODO: Implement Supabase keyset pagination (ORDER BY ts DESC, id DESC) for M1
+    throw new Error('Supabase food logs repository not implemented yet - planned for M1');
+  }
+
+  async *iterateByUserId(userId: string, options?: FoodLogIterateOptions): AsyncIterable<FoodLog> {
+    // TODO: Implement Supabase food logs iteration for M1
+    throw new Error('Supabase food logs repository not implemented yet - planned for M1');
+  }
+
+  async delete(userId: string, id: string): Promise<boolean> {
+    // TODO: Implement Supabase food log deletion for M1
     throw new Error('Supabase food logs repository not implemented yet - planned for M1');
   }
 
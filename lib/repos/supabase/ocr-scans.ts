@@ -20,4 +20,14 @@ export class SupabaseOcrScansRepository implements IOcrScansRepository {
     // TODO: Implement Supabase OCR scans deletion for M1
     throw new Error('Supabase OCR scans repository not implemented yet - planned for M1');
   }
+
+  async findCached(contentHash: string, promptVersion: string, since: Date): Promise<OcrScan | null> {
+    // TODO: Implement Supabase OCR scan cache lookup for M1
+    throw new Error('Supabase OCR scans repository not implemented yet - planned for M1');
+  }
+
+  async evictCached(maxEntries: number, olderThan: Date): Promise<number> {
+    // TODO: Implement Supabase OCR scan cache eviction for M1
+    throw new Error('Supabase OCR scans repository not implemented yet - planned for M1');
+  }
 }
\ No newline at end of file
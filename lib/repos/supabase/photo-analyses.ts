@@ -16,6 +16,11 @@ export class SupabasePhotoAnalysesRepository implements IPhotoAnalysesRepository
     throw new Error('Supabase photo analyses repository not implemented yet - planned for M1');
   }
 
+  async findRecentHashed(userId: string, since: Date, limit: number): Promise<PhotoAnalysis[]> {
+    // TODO: Implement Supabase recent photo hash lookup for M1
+    throw new Error('Supabase photo analyses repository not implemented yet - planned for M1');
+  }
+
   async deleteByUserId(userId: string): Promise<boolean> {
     // TODO: Implement Supabase photo analyses deletion for M1
     throw new Error('Supabase photo analyses repository not implemented yet - planned for M1');
@@ -70,6 +70,33 @@ export interface FoodItem {
   updated_at?: Date;
 }
 
+export interface DishSynonym {
+  id?: string;
+  food_id: string;
+  term: string;
+  lang_enum?: string;
+  script_enum?: string;
+  weight?: number; // 1-100, how strongly the term implies the dish
+  created_at?: Date;
+  updated_at?: Date;
+}
+
+// Cheap fingerprint of the food catalog (food_items + dish_synonyms); when it
+// changes, in-process indexes fetch what changed since `changed_at`. The
+// checksum covers every item and synonym id, so a delete is noticed even
+// when an insert keeps the counts level.
+export interface CatalogVersion {
+  items: number;
+  synonyms: number;
+  changed_at: Date | null;
+  checksum: string;
+}
+
+export interface CatalogChanges {
+  items: FoodItem[];
+  synonyms: DishSynonym[];
+}
+
 export interface FoodLog {
   id?: string;
   user_id: string;
@@ -87,9 +114,48 @@ export interface FoodLog {
   sodium_mg?: number;
   notes?: string;
   assumptions_json?: string[];
+  idempotency_key?: string; // unique per user when present
   created_at?: Date;
 }
 
+// Keyset pagination over a user's food logs, newest first. `after` is the
+// opaque `next` cursor of the previous page.
+export interface FoodLogPageOptions {
+  from?: Date;
+  to?: Date;
+  after?: string;
+  limit?: number;
+}
+
+export interface FoodLogIterateOptions extends Omit<FoodLogPageOptions, 'limit'> {
+  createdSince?: Date; // only logs written after this (incremental exports)
+}
+
+export interface FoodLogPage {
+  logs: FoodLog[];
+  next: string | null; // null on the last page
+}
+
+// Per-user, per-day sums of food_logs, maintained on every log write
+export interface DailyTotals {
+  user_id: string;
+  date: string; // YYYY-MM-DD in DAILY_TOTALS_TZ
+  kcal: number;
+  protein_g: number;
+  carb_g: number;
+  fat_g: number;
+  fiber_g: number;
+  sodium_mg: number;
+  log_count: number;
+  updated_at?: Date;
+}
+
+export interface BatchItemResult {
+  status: 'created' | 'duplicate' | 'error';
+  id?: string; // the new log, or the existing one for a duplicate
+  error?: string;
+}
+
 export interface OcrScan {
   id?: string;
   user_id: string;
@@ -100,6 +166,8 @@ export interface OcrScan {
   parsed_json?: any;
   results_json?: any;
   source_confidence?: number;
+  content_hash?: string; // SHA-256 of the image bytes, set when the result is cacheable
+  prompt_version?: string;
   created_at?: Date;
 }
 
@@ -113,6 +181,7 @@ export interface PhotoAnalysis {
   portion_hint?: string;
   confidence?: number;
   macros_json?: any;
+  phash?: string; // 64-bit dHash of the photo as 16 hex chars
   created_at?: Date;
 }
 
@@ -134,19 +203,30 @@ export interface ITargetsRepository {
 
 export interface IFoodLogsRepository {
   create(log: Omit<FoodLog, 'id' | 'created_at'>): Promise<FoodLog>;
-  findByUserId(userId: string, from?: Date, to?: Date): Promise<FoodLog[]>;
+  createMany(logs: Omit<FoodLog, 'id' | 'created_at'>[]): Promise<BatchItemResult[]>;
+  findByUserId(userId: string, options?: FoodLogPageOptions): Promise<FoodLogPage>;
+  iterateByUserId(userId: string, options?: FoodLogIterateOptions): AsyncIterable<FoodLog>;
+  delete(userId: string, id: string): Promise<boolean>;
   deleteByUserId(userId: string): Promise<boolean>;
 }
 
+export interface IDailyTotalsRepository {
+  findByUserIdAndDate(userId: string, date: string): Promise<DailyTotals | null>;
+  findByUserIdRange(userId: string, from: string, to: string): Promise<DailyTotals[]>;
+}
+
 export interface IOcrScansRepository {
   create(scan: Omit<OcrScan, 'id' | 'created_at'>): Promise<OcrScan>;
   findByUserId(userId: string): Promise<OcrScan[]>;
   deleteByUserId(userId: string): Promise<boolean>;
+  findCached(contentHash: string, promptVersion: string, since: Date): Promise<OcrScan | null>;
+  evictCached(maxEntries: number, olderThan: Date): Promise<number>;
 }
 
 export interface IPhotoAnalysesRepository {
   create(analysis: Omit<PhotoAnalysis, 'id' | 'created_at'>): Promise<PhotoAnalysis>;
   findByUserId(userId: string): Promise<PhotoAnalysis[]>;
+  findRecentHashed(userId: string, since: Date, limit: number): Promise<PhotoAnalysis[]>;
   deleteByUserId(userId: string): Promise<boolean>;
 }
 
@@ -154,4 +234,6 @@ export interface IFoodItemsRepository {
   findByName(name: string): Promise<FoodItem | null>;
   search(query: string, limit?: number): Promise<FoodItem[]>;
   findAll(limit?: number): Promise<FoodItem[]>;
+  catalogVersion(): Promise<CatalogVersion>;
+  findCatalogChanges(since?: Date): Promise<CatalogChanges>;
 }
\ No newline at end of file
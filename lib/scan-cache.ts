@@ -0,0 +1,104 @@
+// lib/scan-cache.ts
+// Content-addressed cache for /api/menu/scan results.
+//
+// Key: SHA-256 of the uploaded image bytes + MENU_PROMPT_VERSION, so changing
+// the prompt invalidates every entry at once. Two tiers: an in-process LRU
+// (bounded by entries and bytes) in front of the ocr_scans collection, where
+// rows carrying a content_hash double as persistent cache entries (written
+// only for signed-in users, since every row needs a user_id). Both
+// tiers honour MENU_CACHE_TTL_MS; the persistent tier is trimmed to
+// MENU_CACHE_MAX_ROWS every EVICT_EVERY persisted writes.
+import { createHash } from 'crypto';
+import { LruCache } from './cache';
+import { repositories } from './repos';
+
+// Bump whenever the menu prompt or response shape changes
+export const MENU_PROMPT_VERSION = 'menu-v1';
+
+const TTL_MS = Number(process.env.MENU_CACHE_TTL_MS || 24 * 60 * 60 * 1000);
+const MAX_ROWS = Number(process.env.MENU_CACHE_MAX_ROWS || 5000);
+const EVICT_EVERY = 100;
+
+export type CacheTier = 'memory' | 'db';
+export type MenuScanHit = { result: any; tier: CacheTier };
+
+const memory = new LruCache<any>({
+  maxEntries: Number(process.env.MENU_CACHE_MAX_ENTRIES || 500),
+  maxBytes: Number(process.env.MENU_CACHE_MAX_BYTES || 16 * 1024 * 1024),
+  ttlMs: TTL_MS,
+  sizeOf: (result) => JSON.stringify(result).length,
+});
+
+const counters = { memory_hits: 0, db_hits: 0, misses: 0, writes: 0, db_writes: 0, db_errors: 0 };
+
+export function sha256(bytes: Uint8Array): string {
+  return createHash('sha256').update(bytes).digest('hex');
+}
+
+function memoryKey(contentHash: string) {
+  return `${MENU_PROMPT_VERSION}:${contentHash}`;
+}
+
+export async function lookupMenuScan(contentHash: string): Promise<MenuScanHit | null> {
+  const cached = memory.get(memoryKey(contentHash));
+  if (cached) {
+    counters.memory_hits++;
+    return { result: cached, tier: 'memory' };
+  }
+
+  try {
+    const since = new Date(Date.now() - TTL_MS);
+    const scan = await repositories.ocrScans.findCached(contentHash, MENU_PROMPT_VERSION, since);
+    if (scan?.parsed_json) {
+      // Promote, but only for what is left of the row's TTL
+      const remaining = TTL_MS - (Date.now() - new Date(scan.ts!).getTime());
+      memory.set(memoryKey(contentHash), scan.parsed_json, Math.max(remaining, 1));
+      counters.db_hits++;
+      return { result: scan.parsed_json, tier: 'db' };
+    }
+  } catch (error) {
+    // The persistent tier is an optimisation; a broken DB must not fail scans
+    counters.db_errors++;
+    console.warn('Menu scan cache lookup failed:', (error as Error).message);
+  }
+
+  counters.misses++;
+  return null;
+}
+
+export async function storeMenuScan(contentHash: string, result: any, userId?: string | null) {
+  memory.set(memoryKey(contentHash), result);
+  counters.writes++;
+
+  // ocr_scans rows belong to a user; anonymous scans stay in memory only
+  if (!userId) return;
+
+  try {
+    await repositories.ocrScans.create({
+      user_id: userId,
+      ocr_text: typeof result.text === 'string' ? result.text : undefined,
+      parsed_json: result,
+      source_confidence: typeof result.confidence === 'number' ? result.confidence : undefined,
+      content_hash: contentHash,
+      prompt_version: MENU_PROMPT_VERSION,
+    });
+    if (++counters.db_writes % EVICT_EVERY === 0) {
+      await repositories.ocrScans.evictCached(MAX_ROWS, new Date(Date.now() - TTL_MS));
+    }
+  } catch (error) {
+    counters.db_errors++;
+    console.warn('Menu scan cache write failed:', (error as Error).message);
+  }
+}
+
+export function menuScanCacheStats() {
+  const hits = counters.memory_hits + counters.db_hits;
+  const lookups = hits + counters.misses;
+  return {
+    ...counters,
+    hit_rate: lookups ? Number((hits / lookups).toFixed(3)) : 0,
+    memory_entries: memory.size,
+    memory_bytes: memory.totalBytes,
+    prompt_version: MENU_PROMPT_VERSION,
+  };
+}
@@ -0,0 +1,37 @@
+// lib/single-flight.ts
+// Coalesces identical in-flight work: while a call for `key` is running,
+// further callers await the same promise instead of starting their own.
+// The entry is dropped as soon as the call settles, so a failure reaches
+// every caller that joined it but is never served to later ones; caching
+// successful results is left to the caller (lib/scan-cache.ts etc.).
+//
+// Joined callers share one result object and must not mutate it.
+
+const inflight = new Map<string, Promise<unknown>>();
+const stats = { leaders: 0, followers: 0, failures: 0 };
+
+export type Flight<T> = { value: T; shared: boolean };
+
+export async function singleFlight<T>(key: string, fn: () => Promise<T>): Promise<Flight<T>> {
+  const pending = inflight.get(key) as Promise<T> | undefined;
+  if (pending) {
+    stats.followers++;
+    return { value: await pending, shared: true };
+  }
+
+  stats.leaders++;
+  // fn starts on the next microtask, after the entry exists, so even a
+  // synchronous throw is cleaned up by finally()
+  const call = Promise.resolve().then(fn).finally(() => inflight.delete(key));
+  inflight.set(key, call);
+  try {
+    return { value: await call, shared: false };
+  } catch (error) {
+    stats.failures++;
+    throw error;
+  }
+}
+
+export function singleFlightStats() {
+  return { ...stats, inflight: inflight.size };
+}
@@ -0,0 +1,21 @@
+// lib/sse.ts
+// Server-Sent Events framing for streaming API responses.
+
+export const SSE_HEADERS = {
+  'Content-Type': 'text/event-stream; charset=utf-8',
+  'Cache-Control': 'no-cache, no-transform',
+  'Connection': 'keep-alive',
+  'X-Accel-Buffering': 'no', // stop nginx-style proxies from buffering the stream
+};
+
+const encoder = new TextEncoder();
+
+/** Encode one `event:` / `data:` frame; data is sent as a single JSON line */
+export function sseEvent(event: string, data: unknown): Uint8Array {
+  return encoder.encode(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+}
+
+/** True when the client asked for an event stream rather than one JSON body */
+export function wantsEventStream(req: Request, body?: { stream?: boolean }): boolean {
+  return body?.stream === true || (req.headers.get('accept') || '').includes('text/event-stream');
+}
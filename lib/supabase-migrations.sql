@@ -309,4 +309,86 @@ CREATE TRIGGER update_profiles_updated_at BEFORE UPDATE ON profiles
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 CREATE TRIGGER update_food_items_updated_at BEFORE UPDATE ON food_items
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Migration 007: Menu scan result cache
+-- Scans with a content_hash double as a content-addressed cache for /api/menu/scan
+ALTER TABLE ocr_scans ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE ocr_scans ADD COLUMN IF NOT EXISTS prompt_version TEXT;
+CREATE INDEX IF NOT EXISTS idx_ocr_scans_content_hash
+    ON ocr_scans(content_hash, prompt_version, ts DESC) WHERE content_hash IS NOT NULL;
+
+-- Migration 008: Perceptual hashes for meal photo near-duplicate detection
+ALTER TABLE photo_analyses ADD COLUMN IF NOT EXISTS phash TEXT;
+
+-- Migration 009: Enforce food log idempotency keys
+-- Batch ingestion (/api/logs/batch) relies on duplicates failing the insert
+DROP INDEX IF EXISTS idx_food_logs_idempotency;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_food_logs_user_idempotency
+    ON food_logs(user_id, idempotency_key) WHERE idempotency_key IS NOT NULL;
+
+-- Migration 010: Per-day nutrition rollups of food_logs
+-- Kept current by a trigger so dashboards read one row per day instead of
+-- summing logs. Days are bucketed in UTC; to backfill or repair, truncate
+-- daily_totals and re-run the INSERT ... SELECT below.
+CREATE TABLE IF NOT EXISTS daily_totals (
+    user_id UUID NOT NULL REFERENCES profiles(user_id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    kcal NUMERIC(10,2) NOT NULL DEFAULT 0,
+    protein_g NUMERIC(10,2) NOT NULL DEFAULT 0,
+    carb_g NUMERIC(10,2) NOT NULL DEFAULT 0,
+    fat_g NUMERIC(10,2) NOT NULL DEFAULT 0,
+    fiber_g NUMERIC(10,2) NOT NULL DEFAULT 0,
+    sodium_mg NUMERIC(12,2) NOT NULL DEFAULT 0,
+    log_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, date)
+);
+
+ALTER TABLE daily_totals ENABLE ROW LEVEL SECURITY;
+CREATE POLICY "Users can view own daily totals" ON daily_totals FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION apply_food_log_to_daily_totals()
+RETURNS TRIGGER AS $$
+DECLARE
+    log food_logs;
+    sign INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        log := NEW; sign := 1;
+    ELSE
+        log := OLD; sign := -1;
+    END IF;
+
+    INSERT INTO daily_totals AS t (user_id, date, kcal, protein_g, carb_g, fat_g, fiber_g, sodium_mg, log_count)
+    VALUES (log.user_id, (log.ts AT TIME ZONE 'UTC')::date,
+            sign * log.kcal, sign * COALESCE(log.protein_g, 0), sign * COALESCE(log.carb_g, 0),
+            sign * COALESCE(log.fat_g, 0), sign * COALESCE(log.fiber_g, 0), sign * COALESCE(log.sodium_mg, 0), sign)
+    ON CONFLICT (user_id, date) DO UPDATE SET
+        kcal = t.kcal + EXCLUDED.kcal,
+        protein_g = t.protein_g + EXCLUDED.protein_g,
+        carb_g = t.carb_g + EXCLUDED.carb_g,
+        fat_g = t.fat_g + EXCLUDED.fat_g,
+        fiber_g = t.fiber_g + EXCLUDED.fiber_g,
+        sodium_mg = t.sodium_mg + EXCLUDED.sodium_mg,
+        log_count = t.log_count + EXCLUDED.log_count,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE TRIGGER food_logs_daily_totals AFTER INSERT OR DELETE ON food_logs
+    FOR EACH ROW EXECUTE FUNCTION apply_food_log_to_daily_totals();
+
+INSERT INTO daily_totals (user_id, date, kcal, protein_g, carb_g, fat_g, fiber_g, sodium_mg, log_count)
+SELECT user_id, (ts AT TIME ZONE 'UTC')::date, SUM(kcal), SUM(COALESCE(protein_g, 0)), SUM(COALESCE(carb_g, 0)),
+       SUM(COALESCE(fat_g, 0)), SUM(COALESCE(fiber_g, 0)), SUM(COALESCE(sodium_mg, 0)), COUNT(*)
+FROM food_logs
+GROUP BY user_id, (ts AT TIME ZONE 'UTC')::date
+ON CONFLICT DO NOTHING;
+
+-- Migration 011: Track in-place edits of dish synonyms
+-- The in-process food catalog refreshes rows changed since its last load
+ALTER TABLE dish_synonyms ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+CREATE TRIGGER update_dish_synonyms_updated_at BEFORE UPDATE ON dish_synonyms
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,34 @@
+// lib/targets.ts
+// Shared by the single-date and bulk /api/me/targets writes so both store
+// exactly the same document shape.
+
+export const TARGET_FIELDS = [
+  'tdee_kcal', 'kcal_budget', 'protein_g', 'carb_g', 'fat_g', 'fiber_g', 'water_ml', 'steps_target'
+] as const;
+
+const DATE = /^\d{4}-\d{2}-\d{2}$/;
+
+/** A real YYYY-MM-DD calendar date; Date.parse rolls 2024-02-30 over to March, so round-trip it */
+export function isTargetDate(value: unknown): value is string {
+  if (typeof value !== 'string' || !DATE.test(value)) return false;
+  const time = Date.parse(value);
+  return !Number.isNaN(time) && new Date(time).toISOString().slice(0, 10) === value;
+}
+
+/** The $set for one date's targets; missing or zero fields are stored as null */
+export function targetFields(body: any, userId: string, date: string, now: Date) {
+  const fields: Record<string, any> = { date, user_id: userId, updated_at: now };
+  TARGET_FIELDS.forEach(field => {
+    fields[field] = body?.[field] ? Number(body[field]) : null;
+  });
+  return fields;
+}
+
+/** Every date from `from` to `to` inclusive, as YYYY-MM-DD */
+export function dateRange(from: string, to: string): string[] {
+  const dates: string[] = [];
+  for (let day = Date.parse(from); day <= Date.parse(to); day += 86400000) {
+    dates.push(new Date(day).toISOString().slice(0, 10));
+  }
+  return dates;
+}
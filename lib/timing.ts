@@ -0,0 +1,64 @@
+// lib/timing.ts
+// Per-request phase timings reported to the client as a Server-Timing header,
+// e.g. `auth;dur=41.2, db;dur=3.8, serialize;dur=0.2, total;dur=46.0`.
+// The phases are fixed so the test harness and browser devtools can compare
+// the same names across every route under app/api.
+import { NextResponse } from 'next/server';
+
+export type Phase = 'auth' | 'db' | 'image' | 'upstream-ai' | 'parse' | 'serialize';
+
+const PHASES: Phase[] = ['auth', 'db', 'image', 'upstream-ai', 'parse', 'serialize'];
+
+export class ServerTiming {
+  private started = performance.now();
+  private totals = new Map<Phase, number>();
+  private descriptions = new Map<Phase, string>();
+
+  /** Add `ms` to a phase; a phase entered several times is summed */
+  add(phase: Phase, ms: number) {
+    this.totals.set(phase, (this.totals.get(phase) || 0) + ms);
+  }
+
+  /** Attach a short description to a phase, e.g. byte counts */
+  describe(phase: Phase, desc: string) {
+    this.descriptions.set(phase, desc.replace(/["\\]/g, ''));
+  }
+
+  /** Run `fn` and charge its duration to `phase`, whether it resolves or throws */
+  async time<T>(phase: Phase, fn: () => T | Promise<T>): Promise<T> {
+    const started = performance.now();
+    try {
+      return await fn();
+    } finally {
+      this.add(phase, performance.now() - started);
+    }
+  }
+
+  header(): string {
+    const metrics = PHASES
+      .filter((phase) => this.totals.has(phase))
+      .map((phase) => {
+        const desc = this.descriptions.get(phase);
+        return `${phase};dur=${this.totals.get(phase)!.toFixed(1)}${desc ? `;desc="${desc}"` : ''}`;
+      });
+    metrics.push(`total;dur=${(performance.now() - this.started).toFixed(1)}`);
+    return metrics.join(', ');
+  }
+
+  /** Set the Server-Timing header on a response built elsewhere */
+  attach<R extends Response>(response: R): R {
+    response.headers.set('Server-Timing', this.header());
+    return response;
+  }
+
+  /** Drop-in for NextResponse.json() that times serialization and sets the header */
+  json(body: unknown, init: ResponseInit = {}): NextResponse {
+    const started = performance.now();
+    const text = JSON.stringify(body);
+    this.add('serialize', performance.now() - started);
+
+    const headers = new Headers(init.headers);
+    if (!headers.has('Content-Type')) headers.set('Content-Type', 'application/json');
+    return this.attach(new NextResponse(text, { ...init, headers }));
+  }
+}
@@ -0,0 +1,173 @@
+// lib/tts-cache.ts
+// Disk cache for /api/tts audio. Coach C repeats a lot of fixed text (the
+// medical disclaimer, greetings, common tips), so synthesised MP3s are kept
+// under TTS_CACHE_DIR as <key>.mp3, keyed by SHA-256 of the voice model and
+// the normalised text.
+//
+// The in-memory index (an LruCache of file sizes) is rebuilt from the
+// directory on first use, oldest mtime first, and bounds the directory to
+// TTS_CACHE_MAX_BYTES by unlinking least recently used files. Hits touch the
+// file's mtime so recency survives restarts.
+import { createHash, randomUUID } from 'crypto';
+import { promises as fs } from 'fs';
+import os from 'os';
+import path from 'path';
+import { LruCache } from './cache';
+
+const DIR = process.env.TTS_CACHE_DIR || path.join(os.tmpdir(), 'fitbear-tts-cache');
+const MAX_BYTES = Number(process.env.TTS_CACHE_MAX_BYTES ?? 256 * 1024 * 1024);
+
+const counters = { hits: 0, misses: 0, writes: 0, write_errors: 0, bytes_saved: 0 };
+
+const index = new LruCache<number>({
+  maxEntries: Number.MAX_SAFE_INTEGER,
+  maxBytes: MAX_BYTES,
+  sizeOf: (bytes) => bytes,
+  onEvict: (key) => {
+    fs.unlink(fileFor(key)).catch(() => {});
+  },
+});
+
+let loaded: Promise<void> | null = null;
+
+function fileFor(key: string) {
+  return path.join(DIR, `${key}.mp3`);
+}
+
+function loadIndex(): Promise<void> {
+  if (!loaded) {
+    loaded = (async () => {
+      await fs.mkdir(DIR, { recursive: true });
+      const files = (await fs.readdir(DIR)).filter((name) => name.endsWith('.mp3'));
+      const entries = await Promise.all(files.map(async (name) => {
+        const stat = await fs.stat(path.join(DIR, name)).catch(() => null);
+        return stat ? { key: name.slice(0, -4), size: stat.size, mtime: stat.mtimeMs } : null;
+      }));
+      entries
+        .filter((entry): entry is { key: string; size: number; mtime: number } => entry !== null)
+        .sort((a, b) => a.mtime - b.mtime)
+        .forEach((entry) => index.set(entry.key, entry.size));
+    })().catch((error) => {
+      console.warn('TTS cache unavailable:', error.message);
+    });
+  }
+  return loaded;
+}
+
+export function ttsCacheEnabled() {
+  return MAX_BYTES > 0;
+}
+
+/** Cache key for a (text, model) pair; also the response's strong ETag */
+export function ttsCacheKey(text: string, model: string): string {
+  const normalized = text.normalize('NFC').replace(/\s+/g, ' ').trim();
+  return createHash('sha256').update(`${model}\n${normalized}`).digest('hex');
+}
+
+/** Cached audio for `key`, or null on a miss */
+export async function readCachedAudio(key: string): Promise<Buffer | null> {
+  if (ttsCacheEnabled()) {
+    await loadIndex();
+    if (index.get(key) !== undefined) {
+      try {
+        const audio = await fs.readFile(fileFor(key));
+        const now = new Date();
+        fs.utimes(fileFor(key), now, now).catch(() => {});
+        counters.hits++;
+        counters.bytes_saved += audio.byteLength;
+        return audio;
+      } catch {
+        index.delete(key); // removed behind our back
+      }
+    }
+  }
+  counters.misses++;
+  return null;
+}
+
+/**
+ * Relay an upstream audio body to the client while writing it to the cache.
+ * Pull-based, so a chunk is read only when the client wants it, and the
+ * file write is awaited before the next read. A client cancel cancels the
+ * upstream read and discards the partial file; only complete bodies are
+ * indexed.
+ */
+export function cacheAudioStream(key: string, body: ReadableStream<Uint8Array>): ReadableStream<Uint8Array> {
+  const reader = body.getReader();
+  const tmp = path.join(DIR, `${key}.${randomUUID()}.tmp`);
+  let file: fs.FileHandle | null = null;
+  let size = 0;
+  let caching = ttsCacheEnabled();
+
+  const discard = async () => {
+    caching = false;
+    await file?.close().catch(() => {});
+    file = null;
+    await fs.unlink(tmp).catch(() => {});
+  };
+
+  const write = async (chunk: Uint8Array) => {
+    if (!caching) return;
+    try {
+      if (!file) {
+        await loadIndex();
+        file = await fs.open(tmp, 'wx');
+      }
+      await file.write(chunk);
+      size += chunk.byteLength;
+    } catch (error) {
+      counters.write_errors++;
+      console.warn('TTS cache write failed:', (error as Error).message);
+      await discard();
+    }
+  };
+
+  const commit = async () => {
+    if (!caching || !file) return;
+    try {
+      await file.close();
+      file = null;
+      await fs.rename(tmp, fileFor(key));
+      if (index.set(key, size)) counters.writes++;
+      else await fs.unlink(fileFor(key)); // larger than the whole cache
+    } catch (error) {
+      counters.write_errors++;
+      console.warn('TTS cache write failed:', (error as Error).message);
+      await discard();
+    }
+  };
+
+  return new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      try {
+        const { done, value } = await reader.read();
+        if (done) {
+          await commit();
+          controller.close();
+          return;
+        }
+        await write(value);
+        controller.enqueue(value);
+      } catch (error) {
+        await discard();
+        controller.error(error);
+      }
+    },
+    async cancel(reason) {
+      await discard();
+      return reader.cancel(reason);
+    }
+  }, { highWaterMark: 0 });
+}
+
+export function ttsCacheStats() {
+  const lookups = counters.hits + counters.misses;
+  return {
+    ...counters,
+    hit_rate: lookups ? Number((counters.hits / lookups).toFixed(3)) : 0,
+    entries: index.size,
+    bytes: index.totalBytes,
+    max_bytes: MAX_BYTES,
+    evictions: index.stats.evictions,
+  };
+}
@@ -0,0 +1,25 @@
+// lib/upstreams.ts
+// Base URLs of the external services the API routes call. Each one can be
+// overridden from the environment, e.g. to point at the local stand-in
+// server (`python -m perf.standin`) for offline, deterministic load tests.
+import type { RequestOptions } from '@google/generative-ai';
+
+function trimSlash(url: string) {
+  return url.replace(/\/+$/, '');
+}
+
+/** Request options for genAI.getGenerativeModel(); honours GEMINI_BASE_URL */
+export function geminiRequestOptions(): RequestOptions {
+  const baseUrl = process.env.GEMINI_BASE_URL;
+  return baseUrl ? { baseUrl: trimSlash(baseUrl) } : {};
+}
+
+/** Deepgram REST base, e.g. `${deepgramBaseUrl()}/v1/speak` */
+export function deepgramBaseUrl(): string {
+  return trimSlash(process.env.DEEPGRAM_BASE_URL || 'https://api.deepgram.com');
+}
+
+/** Supabase Auth base, e.g. `${supabaseAuthUrl(projectUrl)}/user` */
+export function supabaseAuthUrl(projectUrl: string): string {
+  return `${trimSlash(process.env.SUPABASE_AUTH_URL || projectUrl)}/auth/v1`;
+}
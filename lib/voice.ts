@@ -2,11 +2,216 @@
 
 let currentAudio: HTMLAudioElement | null = null;
 let currentUrl: string | null = null;
+let currentRequest: AbortController | null = null;
+
+// Sentences fetched ahead of the one being heard
+const TTS_PREFETCH = 2;
+const MAX_SEGMENT_CHARS = 240;
+const MIN_SEGMENT_CHARS = 40;
+
+// A sentence runs up to terminal punctuation (incl. the Devanagari danda)
+// plus any closing quotes/brackets, ignoring decimal points; a trailing
+// fragment counts as one too.
+const SENTENCE = /(?:[^.!?\u2026\u0964]|\.(?=\d))+(?:[.!?\u2026\u0964]+["'\u201d\u2019)\]]*|$)/g;
+
+type SpeakOptions = { onEnded?: () => void; prefetch?: number };
+
+function canStreamMp3(): boolean {
+  return typeof MediaSource !== 'undefined' && MediaSource.isTypeSupported('audio/mpeg');
+}
+
+/**
+ * Split text into TTS segments. The first sentence goes out on its own so
+ * it can be synthesised quickly; later short sentences are folded into the
+ * one before them, and run-ons are cut at a comma or space.
+ */
+export function splitSentences(text: string, maxChars = MAX_SEGMENT_CHARS): string[] {
+  const sentences = text.replace(/\s+/g, ' ').trim().match(SENTENCE) || [];
+  const segments: string[] = [];
+
+  for (const raw of sentences) {
+    let sentence = raw.trim();
+    while (sentence.length > maxChars) {
+      let cut = sentence.lastIndexOf(', ', maxChars);
+      if (cut < maxChars / 2) cut = sentence.lastIndexOf(' ', maxChars);
+      // Keep the comma with the first half; with no separator, cut hard
+      const end = cut > 0 ? cut + 1 : maxChars;
+      segments.push(sentence.slice(0, end).trim());
+      sentence = sentence.slice(end).trim();
+    }
+    if (!sentence) continue;
+
+    const last = segments.length - 1;
+    if (last > 0 && segments[last].length < MIN_SEGMENT_CHARS && segments[last].length + sentence.length < maxChars) {
+      segments[last] += ' ' + sentence;
+    } else {
+      segments.push(sentence);
+    }
+  }
+  return segments;
+}
+
+/**
+ * Segments fetched from /api/tts at most `prefetch` ahead of the one being
+ * heard. Every request shares one AbortSignal, so stopSpeaking() cancels
+ * the whole pipeline.
+ */
+class SpeechQueue {
+  private responses: Array<Promise<Response>> = [];
+  private playing = 0;
+  private wake: (() => void) | null = null;
+
+  constructor(
+    private segments: string[],
+    private model: string,
+    private prefetch: number,
+    readonly signal: AbortSignal
+  ) {
+    signal.addEventListener('abort', () => this.wake?.());
+    this.fill();
+  }
+
+  get length() {
+    return this.segments.length;
+  }
+
+  /** Report the segment now being heard; opens the prefetch window further */
+  setPlaying(index: number) {
+    if (index <= this.playing) return;
+    this.playing = index;
+    this.fill();
+    this.wake?.();
+  }
+
+  /** Response for segment `index`, waiting until it falls inside the window */
+  async segment(index: number): Promise<Response> {
+    while (index > this.playing + this.prefetch) {
+      if (this.signal.aborted) throw new DOMException('Speech cancelled', 'AbortError');
+      await new Promise<void>((resolve) => { this.wake = resolve; });
+    }
+    return this.request(index);
+  }
+
+  private fill() {
+    const end = Math.min(this.segments.length, this.playing + this.prefetch + 1);
+    for (let i = this.playing; i < end; i++) this.request(i);
+  }
+
+  private request(index: number): Promise<Response> {
+    if (!this.responses[index]) {
+      // GET first, so repeated phrases come straight from the browser's HTTP
+      // cache; GET only serves cached audio, so a miss is synthesised by POST
+      const text = this.segments[index];
+      const params = new URLSearchParams({ model: this.model, text });
+      const response = fetch(`/api/tts?${params}`, { signal: this.signal }).then(async (response) => {
+        if (response.status === 404) {
+          response.body?.cancel().catch(() => {});
+          response = await fetch('/api/tts', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ text, model: this.model }),
+            signal: this.signal
+          });
+        }
+        if (!response.ok) {
+          const error = await response.json().catch(() => ({}));
+          throw new Error(`TTS failed: ${error.error || response.status}`);
+        }
+        return response;
+      });
+      response.catch(() => {}); // prefetched; the error surfaces when awaited
+      this.responses[index] = response;
+    }
+    return this.responses[index];
+  }
+}
+
+/**
+ * Append every segment to one MediaSource SourceBuffer in `sequence` mode,
+ * so each starts exactly where the previous ended and playback is gapless.
+ * Chunks are appended as they arrive; the next read waits for the append.
+ */
+function streamSegments(queue: SpeechQueue, audio: HTMLAudioElement): string {
+  const mediaSource = new MediaSource();
+
+  mediaSource.addEventListener('sourceopen', async () => {
+    const sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+    sourceBuffer.mode = 'sequence';
+    const appended = () => new Promise((resolve) => sourceBuffer.addEventListener('updateend', resolve, { once: true }));
+    const ends: number[] = []; // buffered end time of each appended segment
+
+    audio.ontimeupdate = () => {
+      let playing = 0;
+      while (playing < ends.length && ends[playing] <= audio.currentTime) playing++;
+      queue.setPlaying(playing);
+    };
+
+    try {
+      for (let i = 0; i < queue.length; i++) {
+        const response = await queue.segment(i);
+        const reader = response.body!.getReader();
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          sourceBuffer.appendBuffer(value);
+          await appended();
+        }
+        const { buffered } = sourceBuffer;
+        ends.push(buffered.length ? buffered.end(buffered.length - 1) : 0);
+      }
+    } catch (error) {
+      // Play what is already buffered; the audio then ends normally
+      if (!queue.signal.aborted) console.error('TTS stream error:', error);
+    }
+    if (mediaSource.readyState === 'open') mediaSource.endOfStream();
+  }, { once: true });
+
+  return URL.createObjectURL(mediaSource);
+}
 
 /**
- * Speak text using Deepgram TTS
+ * Fallback without MediaSource: play each segment's blob in turn on the same
+ * element. Resolves once the first segment is playing.
  */
-export async function speakDeepgram(text: string, model = 'aura-asteria-en'): Promise<void> {
+async function playSegmentsInTurn(queue: SpeechQueue, audio: HTMLAudioElement, finish: () => void): Promise<void> {
+  let index = 0;
+
+  const playSegment = async (i: number) => {
+    queue.setPlaying(i);
+    const blob = await (await queue.segment(i)).blob();
+    if (currentAudio !== audio) return;
+    if (currentUrl) URL.revokeObjectURL(currentUrl);
+    currentUrl = URL.createObjectURL(blob);
+    audio.src = currentUrl;
+    await audio.play();
+  };
+
+  audio.onended = () => {
+    if (currentAudio !== audio) return;
+    if (++index >= queue.length) {
+      finish();
+      return;
+    }
+    playSegment(index).catch((error) => {
+      if (error.name === 'AbortError') return;
+      console.error('TTS segment error:', error);
+      finish();
+    });
+  };
+
+  await playSegment(0);
+}
+
+/**
+ * Speak text using Deepgram TTS, one sentence per request. The first
+ * sentence is requested immediately and the next `prefetch` while it
+ * plays, so the first audio arrives after one short synthesis.
+ */
+export async function speakDeepgram(
+  text: string,
+  model = 'aura-asteria-en',
+  { onEnded, prefetch = TTS_PREFETCH }: SpeakOptions = {}
+): Promise<void> {
   try {
     // Stop any previous audio
     stopSpeaking();
@@ -17,44 +222,64 @@ export async function speakDeepgram(text: string, model = 'aura-asteria-en'): Pr
     
     console.log('Requesting Deepgram TTS for:', text.substring(0, 50) + '...');
     
-    const response = await fetch('/api/tts', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ text: text.trim(), model })
-    });
-    
-    if (!response.ok) {
-      const error = await response.json();
-      throw new Error(`TTS failed: ${error.error}`);
+    const segments = splitSentences(text);
+    if (segments.length === 0) {
+      // Punctuation only: nothing to say
+      onEnded?.();
+      return;
     }
     
-    const audioBlob = await response.blob();
-    currentUrl = URL.createObjectURL(audioBlob);
-    currentAudio = new Audio(currentUrl);
+    const request = new AbortController();
+    currentRequest = request;
+    const queue = new SpeechQueue(segments, model, prefetch, request.signal);
     
-    // Auto-cleanup when audio ends
-    currentAudio.onended = () => stopSpeaking();
+    // Surface a failing first request (e.g. missing API key) to the caller
+    await queue.segment(0);
+    
+    const audio = new Audio();
+    currentAudio = audio;
+    const finish = () => {
+      if (currentAudio !== audio) return;
+      stopSpeaking();
+      onEnded?.();
+    };
     
     // Handle audio errors
-    currentAudio.onerror = () => {
+    audio.onerror = () => {
+      if (currentAudio !== audio) return;
       console.error('Audio playback error');
-      stopSpeaking();
+      finish();
     };
     
-    await currentAudio.play();
+    if (canStreamMp3()) {
+      currentUrl = streamSegments(queue, audio);
+      audio.src = currentUrl;
+      audio.onended = finish;
+      await audio.play();
+    } else {
+      await playSegmentsInTurn(queue, audio, finish);
+    }
     console.log('Deepgram TTS playback started');
     
   } catch (error) {
-    console.error('Deepgram TTS error:', error);
-    stopSpeaking();
+    // An abort means stopSpeaking() already ran, possibly for newer audio
+    if ((error as Error).name !== 'AbortError') {
+      console.error('Deepgram TTS error:', error);
+      stopSpeaking();
+    }
     throw error;
   }
 }
 
 /**
- * Stop current TTS playback
+ * Stop current TTS playback and cancel any download still in flight
  */
 export function stopSpeaking(): void {
+  if (currentRequest) {
+    currentRequest.abort();
+    currentRequest = null;
+  }
+  
   if (currentAudio) {
     currentAudio.pause();
     currentAudio.currentTime = 0;
@@ -129,7 +354,7 @@ export async function pushToTalk(maxDuration = 5000): Promise<{ text: string }>
       method: 'POST',
       body: audioBlob,
       headers: {
-        'Content-Type': 'audio/webm'
+        'Content-Type': audioBlob.type || 'audio/webm'
       }
     });
     
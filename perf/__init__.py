@@ -0,0 +1,6 @@
+"""
+Fitbear AI performance tooling.
+
+Stdlib-only helpers used by the backend test scripts to put real load on the
+Next.js API routes and report latency distributions instead of single timings.
+"""
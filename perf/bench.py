@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Per-route benchmark suite with persisted baselines and regression gating.
+
+Each scenario drives one API route at a fixed open-loop rate (see perf.load)
+and records p50/p95/p99 latency, throughput and error rate. Results are
+written as versioned JSON baselines (perf/baselines/NNNN.json) and every run
+is compared against the latest one; the run fails when p95 latency or
+throughput regresses past the configured tolerance.
+
+Usage:
+    python -m perf.bench --base-url http://localhost:3000 --token $FITBEAR_TOKEN
+    python -m perf.bench --only profile_get,profile_put --tolerance 0.15 --save
+"""
+
+import argparse
+import asyncio
+import base64
+import datetime
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from perf.load import ENDPOINTS, TDEE_PAYLOAD, Endpoint, LoadConfig, run_load
+from perf.transport import encode_multipart
+
+SCHEMA_VERSION = 1
+DEFAULT_BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# 1x1 PNG, same fixture backend_test.py uploads
+TINY_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+PROFILE_PAYLOAD = {
+    "name": "Bench User",
+    "height_cm": 175,
+    "weight_kg": 70,
+    "activity_level": "moderate",
+    "veg_flag": True,
+}
+
+TARGETS_PAYLOAD = {"kcal_budget": 2000, "protein_g": 120, "carb_g": 220, "fat_g": 60}
+
+
+def _upload(name, path, filename):
+    body, content_type = encode_multipart("image", filename, TINY_PNG, "image/png")
+    return Endpoint(name, "POST", path, data=body, content_type=content_type)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A fixed workload for one route"""
+    name: str
+    endpoint: Endpoint
+    rate: float
+    duration: float
+    concurrency: int
+    upstream: bool = False  # depends on Gemini/Deepgram (use perf.standin offline)
+
+
+SCENARIOS = [
+    Scenario("health", ENDPOINTS["health"], rate=20, duration=10, concurrency=10),
+    Scenario("tdee", ENDPOINTS["tdee"], rate=50, duration=10, concurrency=10),
+    Scenario("whoami", ENDPOINTS["whoami"], rate=20, duration=10, concurrency=10),
+    Scenario("profile_get", ENDPOINTS["profile"], rate=20, duration=10, concurrency=10),
+    Scenario("profile_put", Endpoint("profile_put", "PUT", "/api/me/profile", body=PROFILE_PAYLOAD, auth=True),
+             rate=10, duration=10, concurrency=5),
+    Scenario("targets_get", ENDPOINTS["targets"], rate=20, duration=10, concurrency=10),
+    Scenario("targets_put", Endpoint("targets_put", "PUT", "/api/me/targets", body=TARGETS_PAYLOAD, auth=True),
+             rate=10, duration=10, concurrency=5),
+    Scenario("menu_scan", _upload("menu_scan", "/api/menu/scan", "menu.png"),
+             rate=2, duration=15, concurrency=4, upstream=True),
+    Scenario("food_analyze", _upload("food_analyze", "/api/food/analyze", "meal.png"),
+             rate=2, duration=15, concurrency=4, upstream=True),
+    Scenario("coach_ask", Endpoint("coach_ask", "POST", "/api/coach/ask",
+                                   body={"message": "What should I eat for dinner?"}, auth=True),
+             rate=2, duration=15, concurrency=4, upstream=True),
+    Scenario("tts", Endpoint("tts", "POST", "/api/tts", body={"text": "Your protein target is 120 grams."}),
+             rate=2, duration=15, concurrency=4, upstream=True),
+    Scenario("stt", Endpoint("stt", "POST", "/api/stt", data=b"\x1a\x45\xdf\xa3", content_type="audio/webm"),
+             rate=2, duration=15, concurrency=4, upstream=True),
+]
+
+
+def select_scenarios(only=None, skip_upstream=False):
+    chosen = [s for s in SCENARIOS if not (skip_upstream and s.upstream)]
+    if only:
+        names = {n.strip() for n in only.split(",") if n.strip()}
+        unknown = names - {s.name for s in SCENARIOS}
+        if unknown:
+            raise ValueError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+        chosen = [s for s in chosen if s.name in names]
+    return chosen
+
+
+async def run_scenario(scenario, base_url, token=None, scale=1.0):
+    config = LoadConfig(
+        base_url=base_url,
+        rate=scenario.rate,
+        duration=scenario.duration * scale,
+        concurrency=scenario.concurrency,
+        mix={scenario.name: 1.0},
+        token=token,
+        seed=0,
+        endpoints={scenario.name: scenario.endpoint},
+    )
+    report = await run_load(config)
+    s = report.summary()["total"]
+    return {
+        "rate": scenario.rate,
+        "duration_s": round(report.elapsed, 2),
+        "sent": s["sent"],
+        "ok": s["ok"],
+        "error_rate": round(s["failed"] / s["sent"], 4) if s["sent"] else 0.0,
+        "p50_ms": s["p50_ms"],
+        "p95_ms": s["p95_ms"],
+        "p99_ms": s["p99_ms"],
+        "throughput_rps": s["throughput_rps"],
+        "errors": s["errors"],
+    }
+
+
+# -- baselines ---------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def list_baselines(directory):
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(p for p in directory.glob("[0-9][0-9][0-9][0-9].json"))
+
+
+def load_baseline(directory, version=None):
+    """Load a baseline by version number, or the latest one when version is None"""
+    paths = list_baselines(directory)
+    if version is not None:
+        paths = [p for p in paths if int(p.stem) == int(version)]
+    if not paths:
+        return None
+    with open(paths[-1]) as f:
+        baseline = json.load(f)
+    if baseline.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{paths[-1]} has schema {baseline.get('schema')}, expected {SCHEMA_VERSION}")
+    return baseline
+
+
+def save_baseline(directory, results, base_url):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = list_baselines(directory)
+    version = int(existing[-1].stem) + 1 if existing else 1
+    baseline = {
+        "schema": SCHEMA_VERSION,
+        "version": version,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "base_url": base_url,
+        "scenarios": results,
+    }
+    path = directory / f"{version:04d}.json"
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+# -- comparison --------------------------------------------------------------
+
+def compare(previous, current, latency_tolerance=0.10, throughput_tolerance=0.10,
+            min_delta_ms=5.0, error_tolerance=0.01):
+    """Compare scenario results against a baseline.
+
+    Returns one row per current scenario with the relative changes and a
+    list of regression reasons (empty when the scenario is within tolerance).
+    Latency changes smaller than min_delta_ms are treated as noise.
+    """
+    rows = []
+    for name, new in current.items():
+        old = (previous or {}).get(name)
+        row = {"scenario": name, "old": old, "new": new, "p95_change": None,
+               "throughput_change": None, "regressions": []}
+        if old:
+            if old["p95_ms"] > 0:
+                row["p95_change"] = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"]
+                if (row["p95_change"] > latency_tolerance
+                        and new["p95_ms"] - old["p95_ms"] >= min_delta_ms):
+                    row["regressions"].append(f"p95 +{row['p95_change']:.0%}")
+            if old["throughput_rps"] > 0:
+                row["throughput_change"] = (new["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"]
+                if row["throughput_change"] < -throughput_tolerance:
+                    row["regressions"].append(f"throughput {row['throughput_change']:.0%}")
+            if new["error_rate"] > old["error_rate"] + error_tolerance:
+                row["regressions"].append(f"errors {old['error_rate']:.1%}→{new['error_rate']:.1%}")
+        rows.append(row)
+    return rows
+
+
+def format_diff(rows, baseline_version=None):
+    """Render the comparison as a diff table"""
+    ref = f"baseline v{baseline_version}" if baseline_version else "no baseline"
+    header = (f"{'scenario':<13} {'p95 old':>9} {'p95 new':>9} {'Δp95':>7} "
+              f"{'rps old':>8} {'rps new':>8} {'Δrps':>7} {'err':>6}  status")
+    lines = [f"Benchmark vs {ref}", header, "-" * len(header)]
+
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else "-"
+
+    for row in rows:
+        old, new = row["old"] or {}, row["new"]
+        status = "❌ " + ", ".join(row["regressions"]) if row["regressions"] else ("✅" if old else "🆕")
+        lines.append(
+            f"{row['scenario']:<13} {fmt(old.get('p95_ms'), '9.1f'):>9} {new['p95_ms']:>9.1f} "
+            f"{fmt(row['p95_change'], '+7.0%'):>7} {fmt(old.get('throughput_rps'), '8.1f'):>8} "
+            f"{new['throughput_rps']:>8.1f} {fmt(row['throughput_change'], '+7.0%'):>7} "
+            f"{new['error_rate']:>6.1%}  {status}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fitbear AI per-route benchmark with regression gating")
+    parser.add_argument("--base-url", default=os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000"))
+    parser.add_argument("--token", default=os.getenv("FITBEAR_TOKEN"), help="Supabase access token for auth routes")
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--skip-upstream", action="store_true", help="skip Gemini/Deepgram-backed scenarios")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every scenario duration")
+    parser.add_argument("--baseline-dir", default=str(DEFAULT_BASELINE_DIR))
+    parser.add_argument("--compare-to", type=int, help="baseline version to compare against (default: latest)")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed relative p95 increase")
+    parser.add_argument("--throughput-tolerance", type=float, default=0.10, help="allowed relative throughput drop")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore p95 increases smaller than this")
+    parser.add_argument("--save", action="store_true", help="write a new baseline when the run passes")
+    parser.add_argument("--force-save", action="store_true", help="write a new baseline even on regression")
+    args = parser.parse_args(argv)
+
+    scenarios = select_scenarios(args.only, args.skip_upstream)
+    results = {}
+    for scenario in scenarios:
+        print(f"⏱️  {scenario.name}: {scenario.rate} rps x {scenario.duration * args.scale:.0f}s "
+              f"({scenario.endpoint.method} {scenario.endpoint.path})")
+        results[scenario.name] = asyncio.run(run_scenario(scenario, args.base_url, args.token, args.scale))
+
+    baseline = load_baseline(args.baseline_dir, args.compare_to)
+    rows = compare(
+        baseline["scenarios"] if baseline else None, results,
+        latency_tolerance=args.tolerance,
+        throughput_tolerance=args.throughput_tolerance,
+        min_delta_ms=args.min_delta_ms,
+    )
+    print()
+    print(format_diff(rows, baseline["version"] if baseline else None))
+
+    regressed = [row["scenario"] for row in rows if row["regressions"]]
+    if args.force_save or (args.save and not regressed):
+        path = save_baseline(args.baseline_dir, results, args.base_url)
+        print(f"\n💾 Saved baseline {path}")
+
+    if regressed:
+        print(f"\n🚨 REGRESSION in {len(regressed)} scenario(s): {', '.join(regressed)}")
+        return 1
+    print("\n✅ No regressions beyond tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Synthetic image corpus for the upload routes (/api/menu/scan, /api/food/analyze).
+
+Images are seeded smooth colour fields with per-pixel grain, so they compress
+roughly like phone photos, and each one is resized until its encoded size
+lands within a few percent of the requested byte size. Every size is
+generated as JPEG, PNG and WebP at a rotating aspect ratio; a manifest.json
+next to the files records format, dimensions and byte size.
+
+Needs Pillow (pip install Pillow).
+
+Usage:
+    python -m perf.images --out perf/corpus
+    python -m perf.images --out /tmp/corpus --sizes 50k,1m,12m --formats jpeg,webp
+"""
+
+import argparse
+import io
+import json
+import math
+import random
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional, only the corpus generator needs it
+    Image = None
+
+FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg", ".jpg", {"quality": 90}),
+    "png": ("PNG", "image/png", ".png", {"compress_level": 6}),
+    "webp": ("WEBP", "image/webp", ".webp", {"quality": 85}),
+}
+
+DEFAULT_SIZES = "50k,250k,1m,4m,12m"
+ASPECTS = [(4, 3), (3, 4), (16, 9), (1, 1)]
+MAX_EDGE = 16000  # WebP tops out at 16383 px
+TOLERANCE = 0.05
+
+
+@dataclass
+class CorpusImage:
+    path: str
+    format: str
+    content_type: str
+    width: int
+    height: int
+    bytes: int
+    target_bytes: int
+
+
+def parse_size(spec):
+    """Parse "50k", "1.5m" or "2048" into a byte count"""
+    spec = spec.strip().lower().rstrip("b")
+    scale = {"k": 1024, "m": 1024 * 1024}.get(spec[-1:], 1)
+    if scale > 1:
+        spec = spec[:-1]
+    return int(float(spec) * scale)
+
+
+def _require_pillow():
+    if Image is None:
+        raise RuntimeError("perf.images needs Pillow: pip install Pillow")
+
+
+def render(width, height, seed=0):
+    """A photo-like RGB image: upscaled colour noise plus per-pixel grain"""
+    _require_pillow()
+    rng = random.Random(seed)
+    small = (max(2, width // 16), max(2, height // 16))
+    base = Image.frombytes("RGB", small, rng.randbytes(small[0] * small[1] * 3))
+    base = base.resize((width, height), Image.BILINEAR)
+    grain = Image.frombytes("L", (width, height), rng.randbytes(width * height)).convert("RGB")
+    return Image.blend(base, grain, 0.2)
+
+
+def encode(image, fmt):
+    pil_format, _, _, options = FORMATS[fmt]
+    buf = io.BytesIO()
+    image.save(buf, pil_format, **options)
+    return buf.getvalue()
+
+
+def make_image(target_bytes, fmt, aspect=(4, 3), seed=0, attempts=6):
+    """Encode an image whose size is within TOLERANCE of target_bytes.
+
+    Returns (data, width, height). Encoded size scales roughly with pixel
+    count, so each attempt rescales the pixel count by target/actual.
+    """
+    aw, ah = aspect
+    pixels = target_bytes / 1.5
+    best = None
+    for _ in range(attempts):
+        unit = math.sqrt(pixels / (aw * ah))
+        width = max(16, min(MAX_EDGE, round(unit * aw)))
+        height = max(16, min(MAX_EDGE, round(unit * ah)))
+        data = encode(render(width, height, seed), fmt)
+        error = abs(len(data) - target_bytes) / target_bytes
+        if best is None or error < best[0]:
+            best = (error, data, width, height)
+        if error <= TOLERANCE or max(width, height) == MAX_EDGE:
+            break
+        pixels = width * height * target_bytes / len(data)
+    return best[1], best[2], best[3]
+
+
+def generate_corpus(out_dir, sizes=DEFAULT_SIZES, formats=tuple(FORMATS), seed=0, log=print):
+    """Write the corpus and its manifest; returns the list of CorpusImage"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    targets = [parse_size(s) for s in sizes.split(",")] if isinstance(sizes, str) else list(sizes)
+    images = []
+    for i, target in enumerate(sorted(targets)):
+        aspect = ASPECTS[i % len(ASPECTS)]
+        for fmt in formats:
+            data, width, height = make_image(target, fmt, aspect, seed=seed + i)
+            path = out_dir / f"{fmt}_{target // 1024}k_{width}x{height}{FORMATS[fmt][2]}"
+            path.write_bytes(data)
+            image = CorpusImage(path.name, fmt, FORMATS[fmt][1], width, height, len(data), target)
+            images.append(image)
+            log(f"  {path.name:<34} {len(data) / 1024:>9.0f} KB")
+    with open(out_dir / "manifest.json", "w") as f:
+        json.dump([asdict(image) for image in images], f, indent=2)
+    return images
+
+
+def load_corpus(out_dir):
+    """Read a corpus manifest written by generate_corpus"""
+    with open(Path(out_dir) / "manifest.json") as f:
+        return [CorpusImage(**entry) for entry in json.load(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic JPEG/PNG/WebP upload corpus")
+    parser.add_argument("--out", default="perf/corpus")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated target sizes, e.g. 50k,1m,12m")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    print(f"🖼️  Generating corpus in {args.out}")
+    images = generate_corpus(args.out, args.sizes, formats, args.seed)
+    print(f"✅ {len(images)} images written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the Fitbear AI API.
+
+Requests are released on a fixed arrival schedule regardless of how quickly
+earlier ones complete, and latency is measured from each request's scheduled
+send time. A slow server therefore shows up as queueing latency instead of
+silently lowering the offered rate (coordinated omission).
+
+Usage:
+    python -m perf.load --base-url http://localhost:3000 --rate 50 --duration 30 \\
+        --concurrency 20 --mix health=5,tdee=3,whoami=1,profile=1,targets=1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from dataclasses import dataclass, field
+
+from perf.stats import EndpointStats
+from perf.transport import AsyncHttpPool
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    method: str
+    path: str
+    body: dict = None
+    auth: bool = False
+    data: bytes = None
+    content_type: str = None
+
+
+TDEE_PAYLOAD = {
+    "sex": "male",
+    "age": 28,
+    "height_cm": 175,
+    "weight_kg": 70,
+    "activity_level": "moderate",
+}
+
+ENDPOINTS = {
+    "health": Endpoint("health", "GET", "/api/health/app"),
+    "tdee": Endpoint("tdee", "POST", "/api/tools/tdee", body=TDEE_PAYLOAD),
+    "whoami": Endpoint("whoami", "GET", "/api/whoami"),
+    "profile": Endpoint("profile", "GET", "/api/me/profile", auth=True),
+    "targets": Endpoint("targets", "GET", "/api/me/targets", auth=True),
+}
+
+DEFAULT_MIX = "health=1"
+
+
+def parse_mix(spec):
+    """Parse "health=5,tdee=2" into {"health": 5.0, "tdee": 2.0}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for '{name}'")
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Endpoint mix must contain at least one positive weight")
+    return mix
+
+
+@dataclass
+class LoadConfig:
+    base_url: str = "http://localhost:3000"
+    rate: float = 10.0
+    duration: float = 10.0
+    concurrency: int = 10
+    mix: dict = field(default_factory=lambda: parse_mix(DEFAULT_MIX))
+    token: str = None
+    timeout: float = 30.0
+    seed: int = None
+    endpoints: dict = field(default_factory=lambda: dict(ENDPOINTS))
+
+
+@dataclass
+class LoadReport:
+    config: LoadConfig
+    elapsed: float
+    endpoints: dict
+    connections_opened: int = 0
+
+    def summary(self):
+        per_endpoint = {name: s.summary(self.elapsed) for name, s in self.endpoints.items()}
+        total = EndpointStats("total")
+        for stats in self.endpoints.values():
+            total.sent += stats.sent
+            total.latencies.extend(stats.latencies)
+            total.errors.update(stats.errors)
+        return {
+            "base_url": self.config.base_url,
+            "offered_rps": self.config.rate,
+            "duration_s": round(self.elapsed, 2),
+            "concurrency": self.config.concurrency,
+            "connections_opened": self.connections_opened,
+            "total": total.summary(self.elapsed),
+            "endpoints": per_endpoint,
+        }
+
+
+async def _fire(pool, endpoint, stats, scheduled, limiter, config):
+    headers = {}
+    if endpoint.auth and config.token:
+        headers["Authorization"] = f"Bearer {config.token}"
+    if endpoint.content_type:
+        headers["Content-Type"] = endpoint.content_type
+    loop = asyncio.get_running_loop()
+    async with limiter:
+        try:
+            response = await asyncio.wait_for(
+                pool.request(endpoint.method, endpoint.path, json_body=endpoint.body,
+                             body=endpoint.data, headers=headers),
+                timeout=config.timeout,
+            )
+        except asyncio.TimeoutError:
+            stats.record(None, "timeout")
+            return
+        except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+            stats.record(None, type(e).__name__)
+            return
+        except (ValueError, IndexError) as e:
+            # Malformed status line or headers: one bad response, not a dead run
+            stats.record(None, type(e).__name__)
+            return
+    latency = loop.time() - scheduled
+    stats.record(latency, None if response.status < 400 else f"HTTP {response.status}")
+
+
+async def run_load(config):
+    """Drive the configured mix at a fixed arrival rate and collect latencies"""
+    if config.rate <= 0 or config.duration <= 0 or config.concurrency <= 0:
+        raise ValueError("rate, duration and concurrency must be positive")
+
+    rng = random.Random(config.seed)
+    names = list(config.mix)
+    weights = [config.mix[n] for n in names]
+    stats = {name: EndpointStats(name) for name in names}
+
+    pool = AsyncHttpPool(config.base_url, size=config.concurrency)
+    limiter = asyncio.Semaphore(config.concurrency)
+    loop = asyncio.get_running_loop()
+    interval = 1.0 / config.rate
+    total = int(config.rate * config.duration)
+
+    tasks = []
+    started = loop.time()
+    try:
+        for i in range(total):
+            scheduled = started + i * interval
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            name = rng.choices(names, weights)[0]
+            stats[name].sent += 1
+            tasks.append(asyncio.create_task(
+                _fire(pool, config.endpoints[name], stats[name], scheduled, limiter, config)
+            ))
+        await asyncio.gather(*tasks)
+    finally:
+        await pool.close()
+
+    return LoadReport(config, loop.time() - started, stats, pool.opened)
+
+
+def format_report(report):
+    """Render a per-endpoint latency/throughput table"""
+    summary = report.summary()
+    header = f"{'endpoint':<10} {'sent':>6} {'ok':>6} {'fail':>5} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'rps':>7}"
+    lines = [
+        f"Offered {summary['offered_rps']} rps for {summary['duration_s']}s "
+        f"(concurrency {summary['concurrency']}, {summary['connections_opened']} connections)",
+        header,
+        "-" * len(header),
+    ]
+    rows = list(summary["endpoints"].items()) + [("TOTAL", summary["total"])]
+    for name, s in rows:
+        lines.append(
+            f"{name:<10} {s['sent']:>6} {s['ok']:>6} {s['failed']:>5} "
+            f"{s['p50_ms']:>8.1f} {s['p90_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f} "
+            f"{s['throughput_rps']:>7.1f}"
+        )
+    for name, s in summary["endpoints"].items():
+        for error, count in sorted(s["errors"].items()):
+            lines.append(f"  ⚠️ {name}: {error} x{count}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load generator for Fitbear AI")
+    parser.add_argument("--base-url", default=os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000"))
+    parser.add_argument("--rate", type=float, default=10.0, help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=10, help="max in-flight requests")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted endpoint mix, e.g. health=5,tdee=2")
+    parser.add_argument("--token", default=os.getenv("FITBEAR_TOKEN"), help="Supabase access token for /api/me/*")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        base_url=args.base_url, rate=args.rate, duration=args.duration,
+        concurrency=args.concurrency, mix=parse_mix(args.mix), token=args.token,
+        timeout=args.timeout, seed=args.seed,
+    )
+    report = asyncio.run(run_load(config))
+    print(json.dumps(report.summary(), indent=2) if args.json else format_report(report))
+    return report
+
+
+if __name__ == "__main__":
+    main()
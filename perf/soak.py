@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Long-running soak test that watches the Next.js server for resource leaks.
+
+Load is applied in consecutive open-loop windows (see perf.load). After each
+window the server process is sampled from /proc: open file descriptors,
+ESTABLISHED sockets to MongoDB and resident memory. At the end every series
+is checked for sustained monotonic growth, which is what a per-request
+connection or handle leak looks like under steady traffic.
+
+Must run on the same host as the server (it reads /proc/<pid>).
+
+Usage:
+    python -m perf.soak --hours 4 --rate 20 --mix health=4,tdee=1,profile=1,targets=1
+    python -m perf.soak --pid 12345 --minutes 30 --output soak.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+from perf.load import LoadConfig, parse_mix, run_load
+from perf.stats import percentile
+
+TCP_ESTABLISHED = "01"
+TCP_LISTEN = "0A"
+
+
+def parse_proc_net(text):
+    """Parse /proc/net/tcp[6] into (local_port, remote_port, state, inode) tuples"""
+    entries = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10:
+            continue
+        local_port = int(fields[1].rsplit(":", 1)[1], 16)
+        remote_port = int(fields[2].rsplit(":", 1)[1], 16)
+        entries.append((local_port, remote_port, fields[3], fields[9]))
+    return entries
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _socket_inodes(pid):
+    inodes = set()
+    fd_dir = f"/proc/{pid}/fd"
+    for fd in os.listdir(fd_dir):
+        try:
+            target = os.readlink(os.path.join(fd_dir, fd))
+        except OSError:
+            continue
+        if target.startswith("socket:["):
+            inodes.add(target[8:-1])
+    return inodes
+
+
+def find_listening_pid(port):
+    """Return the pid of the process listening on a TCP port, or None"""
+    listening = {
+        inode
+        for name in ("tcp", "tcp6")
+        for local, _, state, inode in parse_proc_net(_read(f"/proc/net/{name}"))
+        if local == port and state == TCP_LISTEN
+    }
+    if not listening:
+        return None
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            if _socket_inodes(pid) & listening:
+                return int(pid)
+        except OSError:
+            continue
+    return None
+
+
+def read_rss_mb(pid):
+    """Resident set size of a process in MB (0 when it cannot be read)"""
+    for line in _read(f"/proc/{pid}/status").splitlines():
+        if line.startswith("VmRSS:"):
+            return round(int(line.split()[1]) / 1024, 1)
+    return 0.0
+
+
+def sample_process(pid, mongo_port=27017):
+    """Snapshot fd count, Mongo socket count and RSS for a process"""
+    inodes = _socket_inodes(pid)
+    fds = len(os.listdir(f"/proc/{pid}/fd"))
+    mongo = sum(
+        1
+        for name in ("tcp", "tcp6")
+        for _, remote, state, inode in parse_proc_net(_read(f"/proc/{pid}/net/{name}"))
+        if remote == mongo_port and state == TCP_ESTABLISHED and inode in inodes
+    )
+    return {"fds": fds, "mongo_sockets": mongo, "rss_mb": read_rss_mb(pid)}
+
+
+def detect_growth(values, segments=5, min_increase=0.0):
+    """Flag sustained monotonic growth in a noisy series.
+
+    The series is split into equal segments and each is reduced to its
+    median; growth is flagged when every segment median is strictly higher
+    than the one before and the total rise exceeds min_increase. A one-off
+    jump or a sawtooth that GC brings back down is not flagged.
+    """
+    if len(values) < segments * 2:
+        return False
+    size = len(values) / segments
+    medians = [percentile(values[int(i * size):int((i + 1) * size)], 50) for i in range(segments)]
+    rising = all(b > a for a, b in zip(medians, medians[1:]))
+    return rising and (medians[-1] - medians[0]) > min_increase
+
+
+LEAK_THRESHOLDS = {"fds": 10, "mongo_sockets": 2, "rss_mb": 50}
+
+
+def analyse(samples, segments=5):
+    """Return {metric: {"start", "end", "max", "leak"}} for every sampled series"""
+    report = {}
+    for metric, threshold in LEAK_THRESHOLDS.items():
+        series = [s[metric] for s in samples]
+        if not series:
+            continue
+        report[metric] = {
+            "start": series[0],
+            "end": series[-1],
+            "max": max(series),
+            "leak": detect_growth(series, segments, threshold),
+        }
+    return report
+
+
+async def soak(config, pid, total_seconds, window, mongo_port=27017, log=print):
+    samples = [{"elapsed_s": 0.0, **sample_process(pid, mongo_port)}]
+    log(f"{'elapsed':>8} {'rps':>7} {'p99ms':>8} {'errors':>7} {'fds':>6} {'mongo':>6} {'rss MB':>8}")
+    started = time.monotonic()
+    while time.monotonic() - started < total_seconds:
+        config.duration = min(window, total_seconds - (time.monotonic() - started))
+        if config.duration <= 0:
+            break
+        report = await run_load(config)
+        total = report.summary()["total"]
+        sample = {
+            "elapsed_s": round(time.monotonic() - started, 1),
+            "throughput_rps": total["throughput_rps"],
+            "p99_ms": total["p99_ms"],
+            "failed": total["failed"],
+            **sample_process(pid, mongo_port),
+        }
+        samples.append(sample)
+        log(f"{sample['elapsed_s']:>8.0f} {sample['throughput_rps']:>7.1f} {sample['p99_ms']:>8.1f} "
+            f"{sample['failed']:>7} {sample['fds']:>6} {sample['mongo_sockets']:>6} {sample['rss_mb']:>8.1f}")
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak test with fd / socket / RSS leak detection")
+    parser.add_argument("--base-url", default=os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000"))
+    parser.add_argument("--pid", type=int, help="server pid (default: whatever listens on the base URL port)")
+    parser.add_argument("--hours", type=float, default=0)
+    parser.add_argument("--minutes", type=float, default=0)
+    parser.add_argument("--window", type=float, default=30.0, help="seconds of load between samples")
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mix", default="health=4,tdee=1,profile=1,targets=1")
+    parser.add_argument("--token", default=os.getenv("FITBEAR_TOKEN"))
+    parser.add_argument("--mongo-port", type=int, default=27017)
+    parser.add_argument("--output", help="write samples and analysis as JSON")
+    args = parser.parse_args(argv)
+
+    total_seconds = args.hours * 3600 + args.minutes * 60 or 3600
+    pid = args.pid
+    if pid is None:
+        port = urlsplit(args.base_url).port or 80
+        pid = find_listening_pid(port)
+        if pid is None:
+            print(f"❌ No local process is listening on port {port}; pass --pid")
+            return 2
+
+    config = LoadConfig(
+        base_url=args.base_url, rate=args.rate, duration=args.window,
+        concurrency=args.concurrency, mix=parse_mix(args.mix), token=args.token,
+    )
+    print(f"🔥 Soaking pid {pid} at {args.rate} rps for {total_seconds / 60:.0f} min ({args.mix})")
+    samples = asyncio.run(soak(config, pid, total_seconds, args.window, args.mongo_port))
+    analysis = analyse(samples)
+
+    print("\n📈 Resource trend")
+    for metric, result in analysis.items():
+        flag = "🚨 MONOTONIC GROWTH" if result["leak"] else "✅ stable"
+        print(f"  {metric:<14} {result['start']:>8} → {result['end']:>8} (max {result['max']})  {flag}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"pid": pid, "samples": samples, "analysis": analysis}, f, indent=2)
+
+    return 1 if any(r["leak"] for r in analysis.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
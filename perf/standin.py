@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the external services the API routes depend on.
+
+Mimics just enough of each upstream for our own code paths to run offline:
+
+    Gemini     POST /v1beta/models/<model>:generateContent
+               POST /v1beta/models/<model>:streamGenerateContent?alt=sse
+    Deepgram   POST /v1/listen, POST /v1/speak
+    Supabase   GET  /auth/v1/user
+
+Every service has a latency distribution, an error rate and an optional
+recurring 429 burst, all seeded so that runs are reproducible. Point the
+Next.js server at it with the variables printed by --print-env:
+
+    python -m perf.standin --port 4010 --latency gemini=lognormal:800:0.4 \\
+        --error-rate gemini=0.02 --burst gemini=60:5 --print-env
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SERVICES = ("gemini", "listen", "speak", "auth")
+
+
+def parse_latency(spec):
+    """Parse a latency distribution spec into a sampler returning milliseconds.
+
+    const:MS | uniform:LOW:HIGH | normal:MEAN:SD | lognormal:MEDIAN:SIGMA | exp:MEAN
+    """
+    kind, _, rest = spec.partition(":")
+    args = [float(a) for a in rest.split(":")] if rest else []
+    arity = {"const": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+    if kind not in arity or len(args) != arity[kind]:
+        raise ValueError(f"Invalid latency spec '{spec}'")
+    if kind == "const":
+        return lambda rng: args[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(args[0]), args[1])
+    return lambda rng: rng.expovariate(1.0 / args[0])
+
+
+@dataclass
+class FaultProfile:
+    """Latency, error rate and 429 burst behaviour for one service"""
+    latency: str = "const:0"
+    error_rate: float = 0.0
+    burst_period: float = 0.0
+    burst_length: float = 0.0
+
+    def __post_init__(self):
+        self.sample = parse_latency(self.latency)
+
+
+@dataclass
+class StandinConfig:
+    profiles: dict = field(default_factory=lambda: {name: FaultProfile() for name in SERVICES})
+    stream_interval_ms: float = 30.0
+    speak_bytes_per_char: int = 400
+    seed: int = 0
+
+
+class _ServiceState:
+    def __init__(self, name, profile, seed):
+        self.profile = profile
+        self.rng = random.Random(f"{seed}:{name}")
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+
+    def decide(self, elapsed):
+        """Return (latency_s, fault) for the next request; fault is None, 429 or 500"""
+        with self.lock:
+            self.requests += 1
+            latency = self.profile.sample(self.rng) / 1000.0
+            p = self.profile
+            if p.burst_period > 0 and (elapsed % p.burst_period) < p.burst_length:
+                self.throttled += 1
+                return latency, 429
+            if p.error_rate > 0 and self.rng.random() < p.error_rate:
+                self.errors += 1
+                return latency, 500
+            return latency, None
+
+    def retry_after(self, elapsed):
+        p = self.profile
+        return max(1, math.ceil(p.burst_length - (elapsed % p.burst_period)))
+
+    def stats(self):
+        return {"requests": self.requests, "errors": self.errors, "throttled": self.throttled}
+
+
+MENU_RESULT = {
+    "ocr_method": "gemini_vision",
+    "text": "Paneer Tikka 280\nDal Makhani 220\nButter Naan 60\nGulab Jamun 120",
+    "recommendations": [
+        {"name": "Paneer Tikka", "price": "₹280", "category": "recommended", "reason": "High protein, grilled"},
+        {"name": "Dal Makhani", "price": "₹220", "category": "alternate", "reason": "Good protein, rich in butter"},
+        {"name": "Butter Naan", "price": "₹60", "category": "alternate", "reason": "Refined flour, keep to one"},
+        {"name": "Gulab Jamun", "price": "₹120", "category": "avoid", "reason": "Deep fried, sugar syrup"},
+    ],
+}
+
+MEAL_RESULT = {
+    "guess": [
+        {"food_id": "dal-tadka", "name": "Dal Tadka", "confidence": 0.86, "portion_hints": "1 katori"},
+        {"food_id": "jeera-rice", "name": "Jeera Rice", "confidence": 0.74, "portion_hints": "1 plate"},
+    ],
+    "nutrition": {"calories": 480, "protein": 16, "carbs": 72, "fat": 12},
+    "processing_time": "< 2s",
+}
+
+COACH_REPLY = (
+    "Great question! For muscle gain on a vegetarian Indian diet, build each meal around a "
+    "protein anchor: paneer, dal, chana, rajma, curd or soya chunks. Aim for roughly 1.6 g of "
+    "protein per kg of body weight, spread across three or four meals.\n\n"
+    "A simple day could be besan chilla with curd for breakfast, rajma chawal with salad for "
+    "lunch, roasted chana as a snack and paneer bhurji with two rotis for dinner. Keep portions "
+    "steady and track how you feel over the next two weeks."
+)
+
+
+def _gemini_text(payload):
+    prompt = " ".join(
+        part.get("text", "")
+        for content in payload.get("contents", [])
+        for part in content.get("parts", [])
+    ).lower()
+    if "restaurant menu" in prompt:
+        return json.dumps(MENU_RESULT)
+    if "meal photo" in prompt:
+        return json.dumps(MEAL_RESULT)
+    return COACH_REPLY
+
+
+def _gemini_chunk(text, final=False):
+    candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if final:
+        candidate["finishReason"] = "STOP"
+    return {"candidates": [candidate], "usageMetadata": {"candidatesTokenCount": len(text.split())}}
+
+
+def _fake_mp3(length):
+    # MPEG-1 Layer III, 32 kbps, 44.1 kHz frames of silence (104 bytes each)
+    frame = b"\xff\xfb\x10\xc4" + b"\x00" * 100
+    return (frame * (length // len(frame) + 1))[:max(length, len(frame))]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FitbearStandin/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    # -- plumbing ----------------------------------------------------------
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            return self.rfile.read(length)
+        if "chunked" in (self.headers.get("Transfer-Encoding") or "").lower():
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        return b""
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _admit(self, service):
+        """Apply the service's latency/fault profile; return False if a fault was sent"""
+        state = self.server.services[service]
+        elapsed = time.monotonic() - self.server.started
+        latency, fault = state.decide(elapsed)
+        time.sleep(latency)
+        if fault == 429:
+            self._send(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED",
+                                       "message": f"{service} stand-in rate limit"}},
+                       headers={"Retry-After": str(state.retry_after(elapsed))})
+            return False
+        if fault == 500:
+            self._send(500, {"error": {"code": 500, "status": "INTERNAL",
+                                       "message": f"{service} stand-in injected failure"}})
+            return False
+        return True
+
+    # -- routing -----------------------------------------------------------
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/__standin/stats":
+            self._send(200, {name: s.stats() for name, s in self.server.services.items()})
+        elif path == "/auth/v1/user":
+            self._auth_user()
+        else:
+            self._send(404, {"error": f"stand-in has no route for GET {path}"})
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        body = self._body()
+        match = re.match(r"^/v1(?:beta)?/models/([^/:]+):(generateContent|streamGenerateContent)$", parts.path)
+        if match:
+            self._gemini(body, stream=match.group(2) == "streamGenerateContent")
+        elif parts.path == "/v1/listen":
+            self._listen(body)
+        elif parts.path == "/v1/speak":
+            self._speak(body, parse_qs(parts.query))
+        elif parts.path == "/__standin/reset":
+            self.server.reset()
+            self._send(200, {"ok": True})
+        else:
+            self._send(404, {"error": f"stand-in has no route for POST {parts.path}"})
+
+    # -- services ----------------------------------------------------------
+
+    def _gemini(self, body, stream):
+        if not self._admit("gemini"):
+            return
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self._send(400, {"error": {"code": 400, "message": "Invalid JSON payload"}})
+            return
+        text = _gemini_text(payload)
+        if not stream:
+            self._send(200, _gemini_chunk(text, final=True))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = text.split(" ")
+        pieces = [" ".join(words[i:i + 8]) + (" " if i + 8 < len(words) else "")
+                  for i in range(0, len(words), 8)]
+        for index, piece in enumerate(pieces):
+            if index:
+                time.sleep(self.server.config.stream_interval_ms / 1000.0)
+            event = f"data: {json.dumps(_gemini_chunk(piece, final=index == len(pieces) - 1))}\r\n\r\n"
+            data = event.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _listen(self, body):
+        if not self._admit("listen"):
+            return
+        transcript = "how much protein is in one katori of dal" if body else ""
+        self._send(200, {
+            "metadata": {"request_id": str(uuid.uuid4()), "duration": round(len(body) / 16000, 3)},
+            "results": {"channels": [{"alternatives": [{"transcript": transcript, "confidence": 0.97}]}]},
+        })
+
+    def _speak(self, body, query):
+        if not self._admit("speak"):
+            return
+        try:
+            text = json.loads(body or b"{}").get("text", "")
+        except ValueError:
+            text = ""
+        if not text:
+            self._send(400, {"err_code": "INVALID_INPUT", "err_msg": "text is required"})
+            return
+        audio = _fake_mp3(len(text) * self.server.config.speak_bytes_per_char)
+        self._send(200, audio, content_type="audio/mpeg",
+                   headers={"dg-model-name": query.get("model", ["aura-asteria-en"])[0]})
+
+    def _auth_user(self):
+        if not self._admit("auth"):
+            return
+        auth = self.headers.get("Authorization") or ""
+        token = auth[7:] if auth.startswith("Bearer ") else ""
+        if not token or token.startswith(("invalid", "expired")):
+            self._send(401, {"code": 401, "error_code": "bad_jwt", "msg": "invalid JWT"})
+            return
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        self._send(200, {
+            "id": str(uuid.UUID(digest[:32])),
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": f"loadtest+{digest[:8]}@fitbear.local",
+        })
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.services = {
+            name: _ServiceState(name, self.config.profiles[name], self.config.seed)
+            for name in SERVICES
+        }
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """Environment overrides that route the Next.js server through this stand-in"""
+        return {
+            "GEMINI_BASE_URL": self.url,
+            "DEEPGRAM_BASE_URL": self.url,
+            "SUPABASE_AUTH_URL": self.url,
+        }
+
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def _service_option(values, convert):
+    result = {}
+    for value in values or []:
+        name, sep, spec = value.partition("=")
+        if not sep or name not in SERVICES:
+            raise ValueError(f"Expected SERVICE=VALUE with SERVICE in {', '.join(SERVICES)}: '{value}'")
+        result[name] = convert(spec)
+    return result
+
+
+def _parse_burst(spec):
+    period, _, length = spec.partition(":")
+    return float(period), float(length or 0)
+
+
+def build_config(args):
+    latencies = _service_option(args.latency, str)
+    error_rates = _service_option(args.error_rate, float)
+    bursts = _service_option(args.burst, _parse_burst)
+    profiles = {}
+    for name in SERVICES:
+        period, length = bursts.get(name, (0.0, 0.0))
+        profiles[name] = FaultProfile(
+            latency=latencies.get(name, args.default_latency),
+            error_rate=error_rates.get(name, 0.0),
+            burst_period=period,
+            burst_length=length,
+        )
+    return StandinConfig(profiles=profiles, stream_interval_ms=args.stream_interval, seed=args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stand-in server for Gemini, Deepgram and Supabase Auth")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4010)
+    parser.add_argument("--latency", action="append", metavar="SERVICE=SPEC",
+                        help="e.g. gemini=lognormal:800:0.4 (const, uniform, normal, lognormal, exp)")
+    parser.add_argument("--default-latency", default="const:0")
+    parser.add_argument("--error-rate", action="append", metavar="SERVICE=RATE", help="e.g. gemini=0.02")
+    parser.add_argument("--burst", action="append", metavar="SERVICE=PERIOD:LENGTH",
+                        help="return 429 for LENGTH seconds every PERIOD seconds, e.g. gemini=60:5")
+    parser.add_argument("--stream-interval", type=float, default=30.0, help="ms between streamed chunks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--print-env", action="store_true", help="print env overrides for the Next.js server")
+    args = parser.parse_args(argv)
+
+    server = StandinServer((args.host, args.port), build_config(args))
+    print(f"🧪 Stand-in upstreams listening on {server.url}")
+    if args.print_env:
+        for key, value in server.env().items():
+            print(f"{key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Latency statistics shared by the load, benchmark and soak runners.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile (0-100) using linear interpolation"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    rank = (len(ordered) - 1) * (pct / 100.0)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class EndpointStats:
+    """Latency samples and error counts collected for one endpoint"""
+    name: str
+    latencies: list = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    sent: int = 0
+
+    @property
+    def ok(self):
+        return len(self.latencies)
+
+    @property
+    def failed(self):
+        return sum(self.errors.values())
+
+    def record(self, latency, error=None):
+        if error:
+            self.errors[error] += 1
+        else:
+            self.latencies.append(latency)
+
+    def summary(self, elapsed):
+        """Summarise samples in milliseconds; throughput counts successes only"""
+        ms = [l * 1000 for l in self.latencies]
+        return {
+            "sent": self.sent,
+            "ok": self.ok,
+            "failed": self.failed,
+            "p50_ms": round(percentile(ms, 50), 2),
+            "p90_ms": round(percentile(ms, 90), 2),
+            "p95_ms": round(percentile(ms, 95), 2),
+            "p99_ms": round(percentile(ms, 99), 2),
+            "max_ms": round(max(ms), 2) if ms else 0.0,
+            "throughput_rps": round(self.ok / elapsed, 2) if elapsed > 0 else 0.0,
+            "errors": dict(self.errors),
+        }
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Payload-size sweep for the image upload routes.
+
+Each image of a perf.images corpus is uploaded to /api/menu/scan and
+/api/food/analyze at a fixed open-loop rate while the server's RSS is polled
+from /proc, giving latency, peak memory and throughput as a function of
+payload size. Both routes buffer the whole upload (formData, arrayBuffer,
+base64), so peak RSS is expected to grow with a multiple of the image size;
+the charts show where that multiple starts to hurt.
+
+Run the app against perf.standin so Gemini latency stays constant across
+sizes and only the server's own handling of the payload varies.
+
+Usage:
+    python -m perf.sweep --corpus perf/corpus
+    python -m perf.sweep --routes menu_scan --formats jpeg --rate 1 --duration 10 --csv sweep.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from perf.images import DEFAULT_SIZES, generate_corpus, load_corpus
+from perf.load import Endpoint, LoadConfig, run_load
+from perf.soak import find_listening_pid, read_rss_mb
+from perf.transport import encode_multipart
+
+ROUTES = {
+    "menu_scan": ("/api/menu/scan", "menu"),
+    "food_analyze": ("/api/food/analyze", "meal"),
+}
+
+
+async def _watch_rss(pid, stop, interval):
+    peak = read_rss_mb(pid)
+    while not stop.is_set():
+        peak = max(peak, read_rss_mb(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+    return max(peak, read_rss_mb(pid))
+
+
+async def run_point(route, image, data, base_url, rate, duration, concurrency, pid=None,
+                    token=None, poll_interval=0.05):
+    """Upload one corpus image at a fixed rate; returns one sweep row"""
+    path, stem = ROUTES[route]
+    body, content_type = encode_multipart("image", f"{stem}{Path(image.path).suffix}", data, image.content_type)
+    config = LoadConfig(
+        base_url=base_url, rate=rate, duration=duration, concurrency=concurrency,
+        mix={route: 1.0}, token=token, timeout=120.0, seed=0,
+        endpoints={route: Endpoint(route, "POST", path, data=body, content_type=content_type)},
+    )
+    rss_before = read_rss_mb(pid) if pid else None
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(_watch_rss(pid, stop, poll_interval)) if pid else None
+    try:
+        report = await run_load(config)
+    finally:
+        stop.set()
+        peak_rss = await watcher if watcher else None
+
+    s = report.summary()["total"]
+    return {
+        "route": route,
+        "image": image.path,
+        "format": image.format,
+        "width": image.width,
+        "height": image.height,
+        "bytes": image.bytes,
+        "sent": s["sent"],
+        "error_rate": round(s["failed"] / s["sent"], 4) if s["sent"] else 0.0,
+        "p50_ms": s["p50_ms"],
+        "p95_ms": s["p95_ms"],
+        "p99_ms": s["p99_ms"],
+        "throughput_rps": s["throughput_rps"],
+        "throughput_mbps": round(s["throughput_rps"] * image.bytes / (1024 * 1024), 2),
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": peak_rss,
+        "errors": s["errors"],
+    }
+
+
+def _size_label(n):
+    return f"{n / (1024 * 1024):.1f}M" if n >= 1024 * 1024 else f"{n / 1024:.0f}K"
+
+
+def bar_chart(title, rows, key, unit, width=40):
+    """Horizontal bar chart of one metric against payload size"""
+    values = [row[key] or 0 for row in rows]
+    top = max(values, default=0) or 1
+    lines = [title]
+    for row, value in zip(rows, values):
+        bar = "█" * max(1 if value else 0, round(value / top * width))
+        lines.append(f"  {_size_label(row['bytes']):>6} {row['format']:<5} {bar:<{width}} {value:,.1f} {unit}")
+    return lines
+
+
+def format_charts(rows):
+    lines = []
+    for route in ROUTES:
+        points = sorted((r for r in rows if r["route"] == route), key=lambda r: (r["bytes"], r["format"]))
+        if not points:
+            continue
+        path = ROUTES[route][0]
+        lines.append(f"\n📊 {path}")
+        lines += bar_chart("  p95 latency", points, "p95_ms", "ms")
+        if any(r["peak_rss_mb"] for r in points):
+            lines += bar_chart("  peak server RSS", points, "peak_rss_mb", "MB")
+        lines += bar_chart("  throughput", points, "throughput_rps", "req/s")
+        for r in points:
+            if r["error_rate"]:
+                lines.append(f"  ⚠️ {_size_label(r['bytes'])} {r['format']}: {r['error_rate']:.0%} errors {r['errors']}")
+    return "\n".join(lines)
+
+
+def write_csv(path, rows):
+    fields = [k for k in rows[0] if k != "errors"]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+async def sweep(images, corpus_dir, routes, base_url, rate, duration, concurrency, pid=None,
+                token=None, settle=2.0, log=print):
+    rows = []
+    for route in routes:
+        for image in sorted(images, key=lambda i: (i.bytes, i.format)):
+            data = (Path(corpus_dir) / image.path).read_bytes()
+            row = await run_point(route, image, data, base_url, rate, duration, concurrency, pid, token)
+            rows.append(row)
+            rss = f"{row['peak_rss_mb']:>8.1f} MB" if row["peak_rss_mb"] is not None else ""
+            log(f"  {route:<13} {_size_label(image.bytes):>6} {image.format:<5} "
+                f"p95 {row['p95_ms']:>9.1f} ms  {row['throughput_rps']:>5.2f} rps  {rss}")
+            await asyncio.sleep(settle)  # let the server release the previous payloads
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency / peak RSS / throughput vs upload size")
+    parser.add_argument("--base-url", default=os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000"))
+    parser.add_argument("--token", default=os.getenv("FITBEAR_TOKEN"))
+    parser.add_argument("--corpus", default="perf/corpus", help="corpus directory (generated if missing)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="sizes to generate when the corpus is missing")
+    parser.add_argument("--formats", help="only sweep these formats, e.g. jpeg,webp")
+    parser.add_argument("--routes", default=",".join(ROUTES))
+    parser.add_argument("--rate", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--settle", type=float, default=2.0, help="pause between points in seconds")
+    parser.add_argument("--pid", type=int, help="server pid for RSS (default: whatever listens on the base URL port)")
+    parser.add_argument("--output", help="write rows as JSON")
+    parser.add_argument("--csv", help="write rows as CSV for plotting")
+    args = parser.parse_args(argv)
+
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    unknown = set(routes) - set(ROUTES)
+    if unknown:
+        parser.error(f"unknown route(s): {', '.join(sorted(unknown))}")
+
+    if not (Path(args.corpus) / "manifest.json").exists():
+        print(f"🖼️  No corpus in {args.corpus}, generating {args.sizes}")
+        generate_corpus(args.corpus, args.sizes)
+    images = load_corpus(args.corpus)
+    if args.formats:
+        wanted = {f.strip() for f in args.formats.split(",")}
+        images = [i for i in images if i.format in wanted]
+
+    pid = args.pid or find_listening_pid(urlsplit(args.base_url).port or 80)
+    if pid is None:
+        print("⚠️ Server process not found locally; peak RSS will not be reported (pass --pid)")
+
+    print(f"📦 Sweeping {len(images)} images x {len(routes)} routes at {args.rate} rps for {args.duration}s each")
+    rows = asyncio.run(sweep(images, args.corpus, routes, args.base_url, args.rate, args.duration,
+                             args.concurrency, pid, args.token, args.settle))
+    print(format_charts(rows))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"pid": pid, "corpus": [asdict(i) for i in images], "rows": rows}, f, indent=2)
+    if args.csv and rows:
+        write_csv(args.csv, rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
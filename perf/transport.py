@@ -0,0 +1,160 @@
+"""
+Minimal asyncio HTTP/1.1 client with keep-alive connection reuse.
+
+Only what the load runners need: GET/POST/PUT with a JSON or raw body, a
+bounded pool of persistent connections per origin, and Content-Length or
+chunked response bodies.
+"""
+
+import asyncio
+import json
+import ssl
+import uuid
+from urllib.parse import urlsplit
+
+
+def encode_multipart(field, filename, content, content_type):
+    """Encode one file field as multipart/form-data; returns (body, content_type header)"""
+    boundary = f"----fitbear{uuid.uuid4().hex}"
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return head + content + tail, f"multipart/form-data; boundary={boundary}"
+
+
+class HttpResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    def close(self):
+        self.reusable = False
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class AsyncHttpPool:
+    """Keep-alive connection pool for a single origin"""
+
+    def __init__(self, base_url, size=10):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.host_header = parts.netloc
+        self.ssl = ssl.create_default_context() if self.scheme == "https" else None
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl,
+            server_hostname=self.host if self.ssl else None,
+        )
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    async def request(self, method, path, json_body=None, body=None, headers=None):
+        """Send a request, reusing an idle connection when one is available"""
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            headers = {"Content-Type": "application/json", **(headers or {})}
+
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = await self._connect()
+            try:
+                response = await self._send(conn, method, path, body, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conn.close()
+                if not reused:
+                    raise
+                # The server may have closed an idle keep-alive socket; retry once fresh
+                conn = await self._connect()
+                response = await self._send(conn, method, path, body, headers)
+            except BaseException:
+                conn.close()
+                raise
+            if conn.reusable:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return response
+
+    async def _send(self, conn, method, path, body, headers):
+        lines = [
+            f"{method.upper()} {self.base_path}{path} HTTP/1.1",
+            f"Host: {self.host_header}",
+            "Connection: keep-alive",
+            "Accept: */*",
+        ]
+        for key, value in (headers or {}).items():
+            lines.append(f"{key}: {value}")
+        lines.append(f"Content-Length: {len(body) if body else 0}")
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before response")
+        status = int(status_line.split(b" ", 2)[1])
+
+        response_headers = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+
+        if "chunked" in response_headers.get("transfer-encoding", "").lower():
+            payload = await self._read_chunked(conn.reader)
+        elif "content-length" in response_headers:
+            payload = await conn.reader.readexactly(int(response_headers["content-length"]))
+        elif status in (204, 304) or method.upper() == "HEAD":
+            payload = b""
+        else:
+            payload = await conn.reader.read()
+            conn.reusable = False
+
+        if response_headers.get("connection", "").lower() == "close":
+            conn.reusable = False
+        return HttpResponse(status, response_headers, payload)
+
+    @staticmethod
+    async def _read_chunked(reader):
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Drain optional trailers up to the terminating blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop().close()
@@ -18,10 +18,15 @@ import sys
 import time
 from datetime import datetime
 
+from fitbear_client import FitbearClient
+
 # Test configuration
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://fitbear-revival.preview.emergentagent.com')
 API_BASE = f"{BASE_URL}/api"
 
+# Pooled keep-alive session shared by every test below
+client = FitbearClient(BASE_URL, timeout=30)
+
 print(f"🎯 PROFILE COMPLETION FIX VERIFICATION")
 print(f"Testing API at: {API_BASE}")
 print("="*80)
@@ -44,7 +49,7 @@ def test_api_routes_verification():
     # Test 1.1: Profile GET without authentication (should return 401)
     print("\n1.1 Testing /api/me/profile GET without authentication...")
     try:
-        response = requests.get(f"{API_BASE}/me/profile", timeout=30)
+        response = client.get_profile()
         print(f"Status Code: {response.status_code}")
         print(f"Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
         
@@ -72,12 +77,7 @@ def test_api_routes_verification():
     print("\n1.2 Testing /api/me/profile PUT without authentication...")
     try:
         test_data = {"name": "Test User", "height_cm": 170}
-        response = requests.put(
-            f"{API_BASE}/me/profile", 
-            json=test_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.put_profile(test_data)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 401:
@@ -103,7 +103,7 @@ def test_api_routes_verification():
     # Test 1.3: Targets GET without authentication (should return 401)
     print("\n1.3 Testing /api/me/targets GET without authentication...")
     try:
-        response = requests.get(f"{API_BASE}/me/targets", timeout=30)
+        response = client.get_targets()
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 401:
@@ -130,12 +130,7 @@ def test_api_routes_verification():
     print("\n1.4 Testing /api/me/targets PUT without authentication...")
     try:
         test_data = {"kcal_budget": 2000, "protein_g": 120}
-        response = requests.put(
-            f"{API_BASE}/me/targets", 
-            json=test_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.put_targets(test_data)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 401:
@@ -165,7 +160,7 @@ def test_api_routes_verification():
             'Authorization': 'Bearer invalid_token_12345',
             'Content-Type': 'application/json'
         }
-        response = requests.get(f"{API_BASE}/me/profile", headers=headers, timeout=30)
+        response = client.get_profile(headers=headers)
         print(f"Status Code: {response.status_code}")
         
         if response.status_code == 401:
@@ -216,7 +211,7 @@ def test_mongodb_integration():
     # Test a simple endpoint that would fail if MongoDB wasn't configured
     try:
         # Test the health check which should connect to MongoDB
-        response = requests.get(f"{API_BASE}", timeout=30)
+        response = client.api_index()
         print(f"Health check status: {response.status_code}")
         
         if response.status_code == 200:
@@ -248,12 +243,7 @@ def test_mongodb_integration():
             "activity_level": "moderate"
         }
         
-        response = requests.put(
-            f"{API_BASE}/me/profile",
-            json=test_profile,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.put_profile(test_profile)
         
         print(f"Profile upsert status: {response.status_code}")
         
@@ -284,7 +274,7 @@ def test_mongodb_integration():
     # Test targets endpoint with date parameter
     try:
         today = datetime.now().strftime('%Y-%m-%d')
-        response = requests.get(f"{API_BASE}/me/targets?date={today}", timeout=30)
+        response = client.get_targets(today)
         print(f"Targets with date parameter status: {response.status_code}")
         
         if response.status_code == 401:
@@ -332,12 +322,7 @@ def test_error_handling():
     print("\n3.1 Testing invalid JSON requests...")
     try:
         # Send malformed JSON
-        response = requests.put(
-            f"{API_BASE}/me/profile",
-            data="invalid json data",
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        response = client.put(f"{API_BASE}/me/profile", data="invalid json data", headers={'Content-Type': 'application/json'})
         
         print(f"Invalid JSON status: {response.status_code}")
         
@@ -373,7 +358,7 @@ def test_error_handling():
     
     for endpoint in endpoints_to_test:
         try:
-            response = requests.get(endpoint, timeout=30)
+            response = client.get(endpoint)
             content_type = response.headers.get('Content-Type', '').lower()
             
             print(f"Endpoint: {endpoint}")
@@ -416,14 +401,9 @@ def test_error_handling():
     for method, endpoint in auth_endpoints:
         try:
             if method == 'GET':
-                response = requests.get(endpoint, timeout=30)
+                response = client.get(endpoint)
             else:  # PUT
-                response = requests.put(
-                    endpoint, 
-                    json={"test": "data"},
-                    headers={'Content-Type': 'application/json'},
-                    timeout=30
-                )
+                response = client.put(endpoint, json={"test": "data"})
             
             print(f"{method} {endpoint}: {response.status_code}")
             
@@ -479,7 +459,7 @@ def test_build_compatibility():
     
     for route in routes_to_test:
         try:
-            response = requests.get(route, timeout=30)
+            response = client.get(route)
             print(f"Route {route}: {response.status_code}")
             
             # Any response (even 401) indicates the route compiled and is accessible
@@ -502,7 +482,7 @@ def test_build_compatibility():
     
     try:
         # Test that the routes handle requests properly (indicating correct runtime config)
-        response = requests.get(f"{API_BASE}/me/profile", timeout=30)
+        response = client.get_profile()
         
         # Check response headers for runtime indicators
         headers = response.headers
@@ -525,13 +505,8 @@ def test_build_compatibility():
     
     try:
         # Test both GET and PUT methods to ensure TypeScript types are working
-        get_response = requests.get(f"{API_BASE}/me/profile", timeout=30)
-        put_response = requests.put(
-            f"{API_BASE}/me/profile",
-            json={"name": "Test"},
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        get_response = client.get_profile()
+        put_response = client.put_profile({"name": "Test"})
         
         print(f"GET response: {get_response.status_code}")
         print(f"PUT response: {put_response.status_code}")
@@ -605,20 +580,10 @@ def test_integration_testing():
         }
         
         # Test profile save (should fail with 401 but workflow should be intact)
-        profile_response = requests.put(
-            f"{API_BASE}/me/profile",
-            json=profile_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        profile_response = client.put_profile(profile_data)
         
         # Test targets save (should fail with 401 but workflow should be intact)
-        targets_response = requests.put(
-            f"{API_BASE}/me/targets",
-            json=targets_data,
-            headers={'Content-Type': 'application/json'},
-            timeout=30
-        )
+        targets_response = client.put_targets(targets_data)
         
         print(f"Profile save status: {profile_response.status_code}")
         print(f"Targets save status: {targets_response.status_code}")
@@ -667,7 +632,7 @@ def test_integration_testing():
                 headers['Authorization'] = auth_header
             headers['Content-Type'] = 'application/json'
             
-            response = requests.get(f"{API_BASE}/me/profile", headers=headers, timeout=30)
+            response = client.get_profile(headers=headers)
             print(f"{description}: {response.status_code}")
             
             # All should return 401 (since tokens are invalid), but should be handled gracefully
@@ -710,12 +675,7 @@ def test_integration_testing():
             if scenario_name == "Missing content-type":
                 headers = {}
             
-            response = requests.put(
-                f"{API_BASE}/me/profile",
-                json=test_data,
-                headers=headers,
-                timeout=30
-            )
+            response = client.put_profile(test_data, headers=headers)
             
             print(f"  Status: {response.status_code}")
             
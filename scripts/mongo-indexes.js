@@ -34,13 +34,29 @@ const INDEXES = [
   // Food logs collection
   {
     collection: 'food_logs',
+    // A prefix of idx_food_logs_user_ts_id, which serves the same queries
+    dropped: ['idx_food_logs_user_ts'],
     indexes: [
-      { key: { user_id: 1, ts: -1 }, name: 'idx_food_logs_user_ts' },
+      { key: { user_id: 1, ts: -1, _id: -1 }, name: 'idx_food_logs_user_ts_id' },
       { key: { user_id: 1 }, name: 'idx_food_logs_user_id' },
       { key: { ts: -1 }, name: 'idx_food_logs_ts' },
       { key: { source_enum: 1 }, name: 'idx_food_logs_source' },
       { key: { food_id: 1 }, name: 'idx_food_logs_food_id' },
-      { key: { created_at: 1 }, name: 'idx_food_logs_created_at' }
+      { key: { created_at: 1 }, name: 'idx_food_logs_created_at' },
+      {
+        key: { user_id: 1, idempotency_key: 1 },
+        unique: true,
+        partialFilterExpression: { idempotency_key: { $type: 'string' } },
+        name: 'idx_food_logs_user_idempotency'
+      }
+    ]
+  },
+  
+  // Per-day nutrition rollups of food_logs (see scripts/rebuild-daily-totals.js)
+  {
+    collection: 'daily_totals',
+    indexes: [
+      { key: { user_id: 1, date: 1 }, unique: true, name: 'idx_daily_totals_user_date' }
     ]
   },
   
@@ -53,7 +69,8 @@ const INDEXES = [
       { key: { region_enum: 1 }, name: 'idx_food_items_region' },
       { key: { source_enum: 1 }, name: 'idx_food_items_source' },
       { key: { kcal_per_unit: 1 }, name: 'idx_food_items_kcal' },
-      { key: { canonical_name: 'text' }, name: 'idx_food_items_text_search' }
+      { key: { canonical_name: 'text' }, name: 'idx_food_items_text_search' },
+      { key: { updated_at: -1 }, name: 'idx_food_items_updated_at' }
     ]
   },
   
@@ -66,7 +83,8 @@ const INDEXES = [
       { key: { ts: -1 }, name: 'idx_ocr_scans_ts' },
       { key: { language_detected: 1 }, name: 'idx_ocr_scans_language' },
       { key: { source_confidence: 1 }, name: 'idx_ocr_scans_confidence' },
-      { key: { created_at: 1 }, name: 'idx_ocr_scans_created_at' }
+      { key: { created_at: 1 }, name: 'idx_ocr_scans_created_at' },
+      { key: { content_hash: 1, prompt_version: 1, ts: -1 }, name: 'idx_ocr_scans_content_hash' }
     ]
   },
   
@@ -91,7 +109,9 @@ const INDEXES = [
       { key: { term: 1 }, name: 'idx_dish_synonyms_term' },
       { key: { lang_enum: 1 }, name: 'idx_dish_synonyms_lang' },
       { key: { weight: -1 }, name: 'idx_dish_synonyms_weight' },
-      { key: { term: 'text' }, name: 'idx_dish_synonyms_text_search' }
+      { key: { term: 'text' }, name: 'idx_dish_synonyms_text_search' },
+      { key: { created_at: -1 }, name: 'idx_dish_synonyms_created_at' },
+      { key: { updated_at: -1 }, name: 'idx_dish_synonyms_updated_at' }
     ]
   }
 ];
@@ -105,16 +125,29 @@ async function createIndexes() {
     
     const db = client.db(DB_NAME);
     
-    for (const { collection, indexes } of INDEXES) {
+    for (const { collection, indexes, dropped = [] } of INDEXES) {
       console.log(`\n📚 Creating indexes for collection: ${collection}`);
       
       const coll = db.collection(collection);
       
+      for (const name of dropped) {
+        try {
+          await coll.dropIndex(name);
+          console.log(`  🗑️  Dropped redundant index: ${name}`);
+        } catch (error) {
+          // 26: no such collection yet, 27: index already gone
+          if (error.code !== 26 && error.code !== 27) {
+            console.error(`  ❌ Failed to drop index ${name}:`, error.message);
+          }
+        }
+      }
+      
       for (const indexSpec of indexes) {
         try {
           const result = await coll.createIndex(indexSpec.key, {
             name: indexSpec.name,
             unique: indexSpec.unique || false,
+            ...(indexSpec.partialFilterExpression && { partialFilterExpression: indexSpec.partialFilterExpression }),
             background: true
           });
           console.log(`  ✅ Created index: ${indexSpec.name} -> ${result}`);
@@ -0,0 +1,127 @@
+/**
+ * Rebuild daily_totals from food_logs
+ * Run with: npm run db:rollups [-- --user <user_id>] [-- --since YYYY-MM-DD]
+ *
+ * daily_totals is normally maintained incrementally by the food logs
+ * repository. Use this to backfill it, or to repair drift left behind by a
+ * failed incremental update. Without arguments every user and day is
+ * recomputed; --user and --since narrow the scope.
+ */
+
+const { MongoClient } = require('mongodb');
+
+const MONGO_URL = process.env.MONGO_URL || 'mongodb://localhost:27017';
+const DB_NAME = process.env.DB_NAME || 'your_database_name';
+// Must match lib/repos/mongo/daily-totals.ts
+const TZ = process.env.DAILY_TOTALS_TZ || 'UTC';
+
+const NUTRIENT_FIELDS = ['kcal', 'protein_g', 'carb_g', 'fat_g', 'fiber_g', 'sodium_mg'];
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+function parseArgs(argv) {
+  const args = {};
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--user') args.user = argv[++i];
+    else if (argv[i] === '--since') args.since = argv[++i];
+  }
+  if (args.since && !/^\d{4}-\d{2}-\d{2}$/.test(args.since)) {
+    throw new Error('--since must be a date in YYYY-MM-DD format');
+  }
+  return args;
+}
+
+async function rebuildDailyTotals({ user, since } = {}) {
+  const client = new MongoClient(MONGO_URL);
+
+  try {
+    await client.connect();
+    console.log('✅ Connected to MongoDB');
+
+    const db = client.db(DB_NAME);
+    const totals = db.collection('daily_totals');
+    const runStarted = new Date();
+
+    // $merge needs a unique index on its `on` fields
+    await totals.createIndex({ user_id: 1, date: 1 }, { unique: true, name: 'idx_daily_totals_user_date' });
+
+    const match = {};
+    if (user) match.user_id = user;
+    // A day in DAILY_TOTALS_TZ can start up to a day before UTC midnight
+    if (since) match.ts = { $gte: new Date(Date.parse(since) - DAY_MS) };
+
+    const sums = { log_count: { $sum: 1 } };
+    const fields = {};
+    NUTRIENT_FIELDS.forEach(field => {
+      sums[field] = { $sum: { $ifNull: [`$${field}`, 0] } };
+      fields[field] = 1;
+    });
+
+    console.log(`\n📊 Rebuilding daily totals (user: ${user || 'all'}, since: ${since || 'beginning'}, tz: ${TZ})`);
+    await db.collection('food_logs').aggregate([
+      { $match: match },
+      {
+        $group: {
+          _id: {
+            user_id: '$user_id',
+            date: { $dateToString: { format: '%Y-%m-%d', date: { $ifNull: ['$ts', '$created_at'] }, timezone: TZ } }
+          },
+          ...sums
+        }
+      },
+      ...(since ? [{ $match: { '_id.date': { $gte: since } } }] : []),
+      {
+        $project: {
+          _id: 0,
+          user_id: '$_id.user_id',
+          date: '$_id.date',
+          ...fields,
+          log_count: 1,
+          updated_at: runStarted,
+          rebuilt_at: runStarted
+        }
+      },
+      {
+        $merge: {
+          into: 'daily_totals',
+          on: ['user_id', 'date'],
+          // A day an incremental $inc touched after the run started already
+          // counts logs this aggregation may have missed; keep it
+          whenMatched: [{
+            $replaceWith: {
+              $cond: [
+                { $gte: ['$updated_at', runStarted] },
+                '$$ROOT',
+                { $mergeObjects: ['$$new', { _id: '$_id' }] }
+              ]
+            }
+          }],
+          whenNotMatched: 'insert'
+        }
+      }
+    ], { allowDiskUse: true }).toArray();
+
+    // Days in scope that no longer have any logs. Rows an incremental update
+    // touched after the run started are left alone.
+    const stale = { rebuilt_at: { $ne: runStarted }, updated_at: { $not: { $gte: runStarted } } };
+    if (user) stale.user_id = user;
+    if (since) stale.date = { $gte: since };
+    const removed = await totals.deleteMany(stale);
+
+    const rebuilt = await totals.countDocuments({ rebuilt_at: runStarted });
+    console.log(`  ✅ Rebuilt ${rebuilt} days, removed ${removed.deletedCount} empty days`);
+    return { rebuilt, removed: removed.deletedCount };
+  } catch (error) {
+    console.error('❌ Error rebuilding daily totals:', error);
+    process.exit(1);
+  } finally {
+    await client.close();
+    console.log('\n✅ MongoDB connection closed');
+  }
+}
+
+// Run if called directly
+if (require.main === module) {
+  rebuildDailyTotals(parseArgs(process.argv.slice(2))).catch(console.error);
+}
+
+module.exports = { rebuildDailyTotals };
@@ -0,0 +1,116 @@
+/**
+ * Local access-token verification (lib/auth.ts)
+ * Mints Supabase-style tokens and checks which ones an authenticated route
+ * accepts. Accepted tokens may still fail further down (no database), so
+ * "accepted" means anything but 401.
+ *
+ * HS256: run the app and the tests with the same SUPABASE_JWT_SECRET.
+ * JWKS:  start the app with SUPABASE_AUTH_URL=http://localhost:$AUTH_TEST_JWKS_PORT
+ *        (default 54329); the tests serve the key set there themselves.
+ */
+
+const crypto = require('crypto');
+const http = require('http');
+
+const BASE_URL = process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
+const SECRET = process.env.SUPABASE_JWT_SECRET;
+const JWKS_PORT = Number(process.env.AUTH_TEST_JWKS_PORT || 54329);
+
+const base64url = (value) => Buffer.from(value).toString('base64url');
+
+function claims(overrides = {}) {
+  const now = Math.floor(Date.now() / 1000);
+  return {
+    sub: crypto.randomUUID(),
+    aud: 'authenticated',
+    role: 'authenticated',
+    iat: now,
+    exp: now + 3600,
+    ...overrides
+  };
+}
+
+function signHs256(payload, secret = SECRET) {
+  const input = `${base64url(JSON.stringify({ alg: 'HS256', typ: 'JWT' }))}.${base64url(JSON.stringify(payload))}`;
+  return `${input}.${crypto.createHmac('sha256', secret).update(input).digest('base64url')}`;
+}
+
+function signEs256(payload, privateKey, kid) {
+  const input = `${base64url(JSON.stringify({ alg: 'ES256', typ: 'JWT', kid }))}.${base64url(JSON.stringify(payload))}`;
+  const signature = crypto.sign('sha256', Buffer.from(input), { key: privateKey, dsaEncoding: 'ieee-p1363' });
+  return `${input}.${signature.toString('base64url')}`;
+}
+
+async function statusFor(token) {
+  const response = await fetch(`${BASE_URL}/api/me/profile`, {
+    headers: { 'Authorization': `Bearer ${token}` }
+  });
+  return response.status;
+}
+
+(SECRET ? describe : describe.skip)('HS256 access tokens', () => {
+
+  test('accepts a signed-in user session', async () => {
+    expect(await statusFor(signHs256(claims()))).not.toBe(401);
+  });
+
+  test('accepts an audience list containing authenticated', async () => {
+    expect(await statusFor(signHs256(claims({ aud: ['authenticated', 'other'] })))).not.toBe(401);
+  });
+
+  test('rejects another audience', async () => {
+    expect(await statusFor(signHs256(claims({ aud: 'other' })))).toBe(401);
+    expect(await statusFor(signHs256(claims({ aud: undefined })))).toBe(401);
+  });
+
+  test('rejects anon and service_role keys', async () => {
+    expect(await statusFor(signHs256(claims({ role: 'anon' })))).toBe(401);
+    expect(await statusFor(signHs256(claims({ role: 'service_role' })))).toBe(401);
+  });
+
+  test('rejects an expired token', async () => {
+    const now = Math.floor(Date.now() / 1000);
+    expect(await statusFor(signHs256(claims({ iat: now - 7200, exp: now - 3600 })))).toBe(401);
+  });
+
+  test('rejects a token signed with another secret', async () => {
+    expect(await statusFor(signHs256(claims(), `${SECRET}-wrong`))).toBe(401);
+  });
+});
+
+(process.env.AUTH_TEST_JWKS_PORT ? describe : describe.skip)('ES256 access tokens (JWKS)', () => {
+  const kid = `test-${crypto.randomUUID()}`;
+  const { privateKey, publicKey } = crypto.generateKeyPairSync('ec', { namedCurve: 'P-256' });
+  let server;
+
+  beforeAll((done) => {
+    const jwks = JSON.stringify({ keys: [{ ...publicKey.export({ format: 'jwk' }), kid, alg: 'ES256', use: 'sig' }] });
+    server = http.createServer((req, res) => {
+      if (req.url === '/auth/v1/.well-known/jwks.json') {
+        res.writeHead(200, { 'Content-Type': 'application/json' });
+        res.end(jwks);
+      } else {
+        res.writeHead(401, { 'Content-Type': 'application/json' });
+        res.end('{"msg":"invalid token"}');
+      }
+    }).listen(JWKS_PORT, done);
+  });
+
+  afterAll((done) => {
+    server.close(done);
+  });
+
+  test('accepts a signed-in user session', async () => {
+    expect(await statusFor(signEs256(claims(), privateKey, kid))).not.toBe(401);
+  });
+
+  test('rejects another audience or role', async () => {
+    expect(await statusFor(signEs256(claims({ aud: 'other' }), privateKey, kid))).toBe(401);
+    expect(await statusFor(signEs256(claims({ role: 'service_role' }), privateKey, kid))).toBe(401);
+  });
+
+  test('rejects a token signed with another key', async () => {
+    const { privateKey: otherKey } = crypto.generateKeyPairSync('ec', { namedCurve: 'P-256' });
+    expect(await statusFor(signEs256(claims(), otherKey, kid))).toBe(401);
+  });
+});
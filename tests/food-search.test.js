@@ -0,0 +1,88 @@
+/**
+ * Food search / autocomplete (/api/food/search)
+ * Checks Hinglish spelling folding and ranking against a live server. The
+ * dishes the assertions need are upserted into the server's Mongo catalog
+ * (MONGO_URL / DB_NAME) first and removed afterwards if this test created
+ * them. The server picks them up on its next catalog refresh; start it with
+ * a short FOOD_CATALOG_REFRESH_MS (e.g. 1000) to keep the wait short.
+ */
+
+const { MongoClient } = require('mongodb');
+
+const BASE_URL = process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
+const MONGO_URL = process.env.MONGO_URL || 'mongodb://localhost:27017';
+const DB_NAME = process.env.DB_NAME || 'your_database_name';
+const CATALOG_WAIT_MS = 90000;
+
+const FIXTURES = [
+  { canonical_name: 'Paneer Tikka', category_enum: 'paneer', kcal_per_unit: 250, protein_g: 15, fiber_g: 2, sodium_mg: 600 },
+  { canonical_name: 'Chole', category_enum: 'dal', kcal_per_unit: 220, protein_g: 12, fiber_g: 10, sodium_mg: 600 },
+  { canonical_name: 'Chicken Biryani', category_enum: 'rice', kcal_per_unit: 500, protein_g: 22, fiber_g: 3, sodium_mg: 1200 }
+];
+
+async function search(q) {
+  const response = await fetch(`${BASE_URL}/api/food/search?q=${encodeURIComponent(q)}`);
+  expect(response.status).toBe(200);
+  const data = await response.json();
+  return data.items.map(item => item.canonical_name);
+}
+
+describe('Food search', () => {
+  let client;
+  const inserted = [];
+
+  beforeAll(async () => {
+    client = await new MongoClient(MONGO_URL).connect();
+    const items = client.db(DB_NAME).collection('food_items');
+    const now = new Date();
+    for (const fixture of FIXTURES) {
+      const result = await items.updateOne(
+        { canonical_name: fixture.canonical_name },
+        { $setOnInsert: { ...fixture, created_at: now, updated_at: now } },
+        { upsert: true }
+      );
+      if (result.upsertedId) inserted.push(result.upsertedId);
+    }
+
+    // Wait for the server's catalog to include every fixture
+    const deadline = Date.now() + CATALOG_WAIT_MS;
+    for (;;) {
+      const found = await Promise.all(FIXTURES.map(({ canonical_name }) => search(canonical_name)));
+      if (found.every((names, i) => names.includes(FIXTURES[i].canonical_name))) break;
+      if (Date.now() > deadline) throw new Error('Food catalog did not refresh in time');
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  }, CATALOG_WAIT_MS + 10000);
+
+  afterAll(async () => {
+    if (inserted.length) {
+      await client.db(DB_NAME).collection('food_items').deleteMany({ _id: { $in: inserted } });
+    }
+    await client?.close();
+  });
+
+  test('folds long vowels: panir finds Paneer Tikka first', async () => {
+    const names = await search('panir');
+    expect(names[0]).toBe('Paneer Tikka');
+  });
+
+  test('folds aspirates: chhole finds Chole', async () => {
+    const names = await search('chhole');
+    expect(names[0]).toBe('Chole');
+  });
+
+  test('autocompletes a partly typed name', async () => {
+    const names = await search('panir tik');
+    expect(names[0]).toBe('Paneer Tikka');
+  });
+
+  test('matches a later word despite a misspelling: biriyani finds Chicken Biryani', async () => {
+    const names = await search('biriyani');
+    expect(names).toContain('Chicken Biryani');
+  });
+
+  test('returns no items for an empty query', async () => {
+    expect(await search('')).toEqual([]);
+    expect(await search('   ')).toEqual([]);
+  });
+});
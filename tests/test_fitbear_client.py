@@ -0,0 +1,92 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from fitbear_client import FitbearClient, parse_server_timing  # noqa: E402
+
+
+class _StubApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    flaky_calls = 0
+
+    def _reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/api/me/targets"):
+            _StubApi.flaky_calls += 1
+            if _StubApi.flaky_calls == 1:
+                self._reply(503, {"error": "busy"}, {"Retry-After": "0"})
+                return
+        if self.path == "/api/me/profile":
+            self._reply(200, {}, {"Server-Timing": "auth;dur=41.5, db;dur=3.2, serialize;dur=0.1, total;dur=45.3"})
+            return
+        self._reply(200, {"path": self.path, "auth": self.headers.get("Authorization")})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(503, {"error": "busy"})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_typed_calls_reuse_one_connection(base_url):
+    with FitbearClient(base_url + "/api", token="abc") as client:
+        first = client.health()
+        second = client.whoami()
+
+    assert first.json() == {"path": "/api/health/app", "auth": "Bearer abc"}
+    assert second.json()["path"] == "/api/whoami"
+    assert first.timings.reused is False
+    assert second.timings.reused is True
+    assert second.timings.connect == 0.0
+    assert second.timings.total >= second.timings.ttfb
+
+
+def test_idempotent_calls_retry_but_posts_do_not(base_url):
+    _StubApi.flaky_calls = 0
+    with FitbearClient(base_url, backoff=0) as client:
+        targets = client.get_targets("2025-01-01")
+        tdee = client.tdee({"sex": "male"})
+
+    assert targets.status_code == 200
+    assert targets.json()["path"] == "/api/me/targets?date=2025-01-01"
+    assert _StubApi.flaky_calls == 2
+    assert tdee.status_code == 503
+
+
+def test_server_timing_phases_are_attached(base_url):
+    with FitbearClient(base_url, token="abc") as client:
+        profile = client.get_profile()
+        health = client.health()
+
+    assert profile.server_timing == {"auth": 41.5, "db": 3.2, "serialize": 0.1, "total": 45.3}
+    assert health.server_timing == {}
+
+
+def test_parse_server_timing_edge_cases():
+    assert parse_server_timing(None) == {}
+    assert parse_server_timing('cache;desc="hit", db;dur=2, db;dur=1.5,upstream-ai;dur="900"') == {
+        "cache": 0.0, "db": 3.5, "upstream-ai": 900.0,
+    }
@@ -0,0 +1,42 @@
+import pytest
+
+from perf.bench import compare, format_diff, load_baseline, save_baseline, select_scenarios
+
+
+def _result(p95, rps, error_rate=0.0):
+    return {"p50_ms": p95 / 2, "p95_ms": p95, "p99_ms": p95 * 1.5, "throughput_rps": rps,
+            "error_rate": error_rate, "sent": 100, "ok": 100, "errors": {}, "rate": 10, "duration_s": 10}
+
+
+def test_compare_flags_latency_throughput_and_errors():
+    previous = {"profile_get": _result(100, 20), "tdee": _result(10, 50), "health": _result(2, 20)}
+    current = {
+        "profile_get": _result(130, 20),       # +30% p95
+        "tdee": _result(10, 40, 0.05),         # -20% throughput, errors up
+        "health": _result(4, 20),              # +100% but under the 5ms noise floor
+        "tts": _result(300, 2),                # new scenario
+    }
+    rows = {r["scenario"]: r for r in compare(previous, current, 0.10, 0.10, min_delta_ms=5)}
+
+    assert rows["profile_get"]["regressions"] == ["p95 +30%"]
+    assert rows["tdee"]["regressions"] == ["throughput -20%", "errors 0.0%→5.0%"]
+    assert rows["health"]["regressions"] == []
+    assert rows["tts"]["old"] is None and rows["tts"]["regressions"] == []
+    table = format_diff(list(rows.values()), baseline_version=3)
+    assert "baseline v3" in table and "❌ p95 +30%" in table and "🆕" in table
+
+
+def test_baselines_are_versioned(tmp_path):
+    assert load_baseline(tmp_path) is None
+    first = save_baseline(tmp_path, {"health": _result(5, 20)}, "http://localhost:3000")
+    second = save_baseline(tmp_path, {"health": _result(6, 20)}, "http://localhost:3000")
+
+    assert (first.name, second.name) == ("0001.json", "0002.json")
+    assert load_baseline(tmp_path)["scenarios"]["health"]["p95_ms"] == 6
+    assert load_baseline(tmp_path, version=1)["version"] == 1
+
+
+def test_select_scenarios():
+    assert [s.name for s in select_scenarios("tdee,tts", skip_upstream=True)] == ["tdee"]
+    with pytest.raises(ValueError):
+        select_scenarios("nope")
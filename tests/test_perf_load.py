@@ -0,0 +1,92 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from perf.load import ENDPOINTS, Endpoint, LoadConfig, format_report, parse_mix, run_load
+from perf.stats import percentile
+
+
+class _StubApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/garbled":
+            self.close_connection = True
+            self.wfile.write(b"HTTP/1.1 OK\r\n\r\n")
+        elif self.path == "/api/health/app":
+            self._reply(200, {"ok": True, "db": "ok"})
+        else:
+            self._reply(401, {"error": "Unauthorized"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply(200, {"tdee_kcal": 2500})
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubApi)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) == 0.0
+    assert percentile([5], 99) == 5.0
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile(list(range(101)), 90) == 90
+
+
+def test_parse_mix_rejects_unknown_endpoint():
+    assert parse_mix("health=3, tdee") == {"health": 3.0, "tdee": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("logs=1")
+
+
+def test_run_load_reports_per_endpoint(stub_api):
+    config = LoadConfig(
+        base_url=stub_api, rate=100, duration=0.5, concurrency=4,
+        mix=parse_mix("health=1,tdee=1,profile=1"), seed=7,
+    )
+    report = asyncio.run(run_load(config))
+    summary = report.summary()
+
+    assert summary["total"]["sent"] == 50
+    assert summary["endpoints"]["health"]["failed"] == 0
+    assert summary["endpoints"]["tdee"]["ok"] == summary["endpoints"]["tdee"]["sent"]
+    assert summary["endpoints"]["profile"]["errors"] == {"HTTP 401": summary["endpoints"]["profile"]["sent"]}
+    # Keep-alive: connections are bounded by concurrency, not request count
+    assert report.connections_opened <= 4
+    assert "TOTAL" in format_report(report)
+
+
+def test_run_load_records_malformed_responses(stub_api):
+    endpoints = dict(ENDPOINTS, garbled=Endpoint("garbled", "GET", "/garbled"))
+    config = LoadConfig(
+        base_url=stub_api, rate=40, duration=0.25, concurrency=2,
+        mix={"health": 1.0, "garbled": 1.0}, seed=3, endpoints=endpoints,
+    )
+    summary = asyncio.run(run_load(config)).summary()
+
+    garbled = summary["endpoints"]["garbled"]
+    assert garbled["sent"] > 0
+    assert garbled["errors"] == {"ValueError": garbled["sent"]}
+    assert summary["endpoints"]["health"]["failed"] == 0
@@ -0,0 +1,46 @@
+import os
+import socket
+import sys
+
+import pytest
+
+from perf.soak import analyse, detect_growth, find_listening_pid, parse_proc_net, sample_process
+
+PROC_NET_TCP = """  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000:0BB8 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 11111 1 0 100 0 0 10 0
+   1: 0100007F:D431 0100007F:6989 01 00000000:00000000 00:00000000 00000000  1000        0 22222 1 0 20 4 30 10 -1
+"""
+
+
+def test_parse_proc_net():
+    assert parse_proc_net(PROC_NET_TCP) == [(3000, 0, "0A", "11111"), (54321, 27017, "01", "22222")]
+
+
+def test_detect_growth_ignores_noise_and_sawtooth():
+    leak = [100 + i + (i % 3) for i in range(50)]
+    sawtooth = [100 + (i % 10) * 5 for i in range(50)]
+    spike = [100] * 25 + [300] + [100] * 24
+    assert detect_growth(leak, min_increase=10)
+    assert not detect_growth(sawtooth, min_increase=10)
+    assert not detect_growth(spike, min_increase=10)
+    assert not detect_growth(leak[:5])
+
+
+def test_analyse_reports_each_metric():
+    samples = [{"fds": 50 + 2 * i, "mongo_sockets": 5, "rss_mb": 200.0} for i in range(20)]
+    result = analyse(samples)
+    assert result["fds"]["leak"] and result["fds"]["end"] == 88
+    assert not result["mongo_sockets"]["leak"] and not result["rss_mb"]["leak"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_sample_and_find_own_process():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    try:
+        assert find_listening_pid(server.getsockname()[1]) == os.getpid()
+        sample = sample_process(os.getpid())
+    finally:
+        server.close()
+    assert sample["fds"] > 0 and sample["rss_mb"] > 0 and sample["mongo_sockets"] == 0
@@ -0,0 +1,82 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from perf.standin import FaultProfile, SERVICES, StandinConfig, StandinServer, parse_latency
+
+
+def _start(**overrides):
+    profiles = {name: FaultProfile() for name in SERVICES}
+    profiles.update(overrides)
+    server = StandinServer(("127.0.0.1", 0), StandinConfig(profiles=profiles, stream_interval_ms=0))
+    server.start_background()
+    return server
+
+
+def _call(url, data=None, headers=None):
+    request = urllib.request.Request(url, data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+@pytest.fixture
+def standin():
+    server = _start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_latency_specs():
+    import random
+    rng = random.Random(1)
+    assert parse_latency("const:40")(rng) == 40
+    assert 10 <= parse_latency("uniform:10:20")(rng) <= 20
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+
+
+def test_auth_user_is_stable_per_token(standin):
+    status, _, body = _call(f"{standin.url}/auth/v1/user", headers={"Authorization": "Bearer abc"})
+    again = json.loads(_call(f"{standin.url}/auth/v1/user", headers={"Authorization": "Bearer abc"})[2])
+    assert status == 200 and json.loads(body)["id"] == again["id"]
+    assert _call(f"{standin.url}/auth/v1/user", headers={"Authorization": "Bearer invalid"})[0] == 401
+
+
+def test_gemini_generate_and_stream(standin):
+    prompt = {"contents": [{"role": "user", "parts": [{"text": "Analyze this restaurant menu image"}]}]}
+    data = json.dumps(prompt).encode()
+    status, _, body = _call(f"{standin.url}/v1beta/models/gemini-1.5-flash:generateContent", data)
+    text = json.loads(body)["candidates"][0]["content"]["parts"][0]["text"]
+    assert status == 200 and json.loads(text)["recommendations"]
+
+    coach = json.dumps({"contents": [{"parts": [{"text": "hi coach"}]}]}).encode()
+    status, headers, body = _call(
+        f"{standin.url}/v1beta/models/gemini-1.5-flash:streamGenerateContent?alt=sse", coach)
+    events = [json.loads(line[6:]) for line in body.decode().split("\r\n") if line.startswith("data: ")]
+    assert headers["Content-Type"] == "text/event-stream" and len(events) > 1
+    assert events[-1]["candidates"][0]["finishReason"] == "STOP"
+
+
+def test_speak_and_listen(standin):
+    status, headers, audio = _call(f"{standin.url}/v1/speak?model=aura-asteria-en", json.dumps({"text": "Namaste"}).encode())
+    assert status == 200 and headers["Content-Type"] == "audio/mpeg" and audio[:2] == b"\xff\xfb"
+    status, _, body = _call(f"{standin.url}/v1/listen", b"\x1a\x45\xdf\xa3")
+    assert json.loads(body)["results"]["channels"][0]["alternatives"][0]["transcript"]
+
+
+def test_burst_returns_429_with_retry_after():
+    server = _start(gemini=FaultProfile(burst_period=60, burst_length=30))
+    try:
+        status, headers, _ = _call(f"{server.url}/v1beta/models/m:generateContent", b"{}")
+        stats = json.loads(_call(f"{server.url}/__standin/stats")[2])
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert status == 429 and int(headers["Retry-After"]) >= 1
+    assert stats["gemini"] == {"requests": 1, "errors": 0, "throttled": 1}
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from perf.images import CorpusImage, generate_corpus, load_corpus, parse_size
+from perf.sweep import format_charts, run_point
+
+
+class _UploadApi(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.received.append((self.path, self.headers.get("Content-Type"), len(body)))
+        reply = b'{"recommendations": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_parse_size():
+    assert parse_size("50k") == 50 * 1024
+    assert parse_size("1.5MB") == 1536 * 1024
+    assert parse_size("2048") == 2048
+
+
+def test_corpus_hits_target_sizes(tmp_path):
+    pytest.importorskip("PIL")
+    images = generate_corpus(tmp_path, "50k,200k", log=lambda *_: None)
+    assert {i.format for i in images} == {"jpeg", "png", "webp"}
+    for image in images:
+        assert abs(image.bytes - image.target_bytes) / image.target_bytes < 0.1
+        assert (tmp_path / image.path).stat().st_size == image.bytes
+    assert load_corpus(tmp_path) == images
+
+
+def test_run_point_uploads_multipart_and_tracks_rss():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UploadApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    image = CorpusImage("jpeg_64k.jpg", "jpeg", "image/jpeg", 320, 240, 65536, 65536)
+    try:
+        row = asyncio.run(run_point(
+            "food_analyze", image, b"\xff\xd8" + b"\0" * 65534, f"http://127.0.0.1:{server.server_address[1]}",
+            rate=20, duration=0.5, concurrency=2, pid=os.getpid(),
+        ))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert row["sent"] == 10 and row["error_rate"] == 0.0
+    assert row["peak_rss_mb"] >= row["rss_before_mb"] > 0
+    path, content_type, length = _UploadApi.received[-1]
+    assert path == "/api/food/analyze" and content_type.startswith("multipart/form-data") and length > 65536
+    assert "/api/food/analyze" in format_charts([row])